@@ -1,8 +1,11 @@
 from core import create_app
-from core.config import ProductionConfig
+from core.config import ServerlessConfig
 
-# Create app instance for Vercel
-app = create_app(config=ProductionConfig)
+# Create app instance for Vercel (no connection pooling between invocations).
+# Spawned password hashing processes run this module again as __mp_main__
+# under `python app.py` and must not build an app of their own.
+if __name__ != "__mp_main__":
+    app = create_app(config=ServerlessConfig)
 
 # For local development
 if __name__ == "__main__":
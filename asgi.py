@@ -0,0 +1,4 @@
+from core import create_asgi_app
+
+# uvicorn asgi:app --workers 4
+app = create_asgi_app()
\ No newline at end of file
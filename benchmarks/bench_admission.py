@@ -0,0 +1,149 @@
+"""Task reads beyond capacity: with and without admission control.
+
+Starts ``uvicorn`` (asgi.py) on a seeded SQLite database whose statements
+are delayed by --db-latency ms, with an asyncio pool of --pool-size
+connections, and drives it with --concurrency connections issuing
+GET /tasks/<id> and GET /tasks/?limit=20, far more than the pool serves at
+once. Without admission control every request queues for a connection,
+so latency grows with the queue and requests give up after
+DATABASE_POOL_TIMEOUT; with it, the excess is answered at once with 503
+and the admitted requests keep their latency; clients wait out the
+Retry-After of a 503 before their next request. Reports the throughput and
+latency percentiles of successful requests, the 503s and the other
+failures.
+
+Requires uvicorn and aiosqlite.
+
+    python benchmarks/bench_admission.py --concurrency 256 --pool-size 4 --db-latency 20
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_asgi import bench_config, free_port, seed
+from core import create_asgi_app
+
+
+def asgi_app():
+    class AdmissionBenchConfig(bench_config()):
+        DATABASE_POOL_TIMEOUT = float(os.environ["BENCH_POOL_TIMEOUT"])
+        ASYNC_DATABASE_POOL_SIZE = int(os.environ["BENCH_POOL_SIZE"])
+        ASYNC_DATABASE_MAX_OVERFLOW = 0
+        ADMISSION_CONTROL_ENABLED = os.environ["BENCH_ADMISSION"] == "on"
+        # Every client holds a connection to the one worker.
+        ADMISSION_MAX_LIMIT = 1000
+
+    return create_asgi_app(AdmissionBenchConfig)
+
+
+def start_server(port, env):
+    command = [
+        "-m", "uvicorn", "--factory", "benchmarks.bench_admission:asgi_app",
+        "--port", str(port), "--log-level", "critical", "--no-access-log",
+    ]
+    process = subprocess.Popen([sys.executable, *command], cwd=ROOT, env=env, stderr=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1)
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("uvicorn did not start")
+
+
+async def client(port, targets, deadline, latencies, statuses):
+    reader = writer = None
+    rng = random.Random()
+    while time.perf_counter() < deadline:
+        token, task_id = rng.choice(targets)
+        path = f"/api/v1/tasks/{task_id}" if rng.random() < 0.5 else "/api/v1/tasks/?limit=20"
+        request = f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nAuthorization: Bearer {token}\r\n\r\n".encode()
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(request)
+            head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").lower()
+            length = int(head.split("content-length:", 1)[1].split("\r\n", 1)[0])
+            await reader.readexactly(length)
+            status = int(head.split(" ", 2)[1])
+        except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+            statuses.append(0)
+            writer = None
+            continue
+        statuses.append(status)
+        if status == 200:
+            latencies.append((time.perf_counter() - started) * 1000)
+        elif status == 503:
+            await asyncio.sleep(int(head.split("retry-after:", 1)[1].split("\r\n", 1)[0]))
+    if writer is not None:
+        writer.close()
+
+
+async def load(port, targets, concurrency, duration):
+    latencies, statuses = [], []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(client(port, targets, deadline, latencies, statuses) for _ in range(concurrency)))
+    return latencies, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=256)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--pool-timeout", type=float, default=2.0, help="DATABASE_POOL_TIMEOUT, in seconds")
+    parser.add_argument("--db-latency", type=float, default=20.0, help="Delay per SQL statement, in ms")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--tasks-per-user", type=int, default=50)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ["BENCH_TMP"] = tmp
+    targets = seed(args.users, args.tasks_per_user)
+
+    print(
+        f"{args.concurrency} connections, pool of {args.pool_size}, {args.db_latency} ms per statement, "
+        f"{args.pool_timeout} s pool timeout"
+    )
+    print(f"{'admission':<10} {'ok/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'503':>7} {'failed':>7}")
+    for admission in ("off", "on"):
+        env = dict(
+            os.environ,
+            BENCH_DB_LATENCY=str(args.db_latency),
+            BENCH_POOL_SIZE=str(args.pool_size),
+            BENCH_POOL_TIMEOUT=str(args.pool_timeout),
+            BENCH_ADMISSION=admission,
+        )
+        port = free_port()
+        server = start_server(port, env)
+        try:
+            # The warm-up also lets the adaptive limit settle.
+            asyncio.run(load(port, targets, args.concurrency, 3.0))
+            latencies, statuses = asyncio.run(load(port, targets, args.concurrency, args.duration))
+        finally:
+            server.terminate()
+            server.wait()
+        shed = statuses.count(503)
+        failed = len(statuses) - len(latencies) - shed
+        if len(latencies) >= 2:
+            p50 = statistics.median(latencies)
+            p99 = statistics.quantiles(latencies, n=100)[98]
+        else:
+            p50 = p99 = float("nan")
+        print(f"{admission:<10} {len(latencies) / args.duration:>8.0f} {p50:>8.1f} {p99:>8.1f} {shed:>7} {failed:>7}")
+
+
+if __name__ == "__main__":
+    main()
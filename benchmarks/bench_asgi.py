@@ -0,0 +1,192 @@
+"""Task reads under concurrent load: gunicorn sync workers vs the ASGI app.
+
+Starts ``gunicorn -w N`` (wsgi.py) and then ``uvicorn --workers N``
+(asgi.py), both with the full application, on the same seeded SQLite
+database. Every SQL statement is delayed by --db-latency ms to stand in for
+the round trip to a networked database; the delay runs on the connection's
+thread, so it blocks a sync worker but not the event loop. Each server is
+driven with --concurrency connections issuing GET /tasks/<id> and
+GET /tasks/?limit=20 for different users, and the throughput and latency
+percentiles are reported.
+
+Requires gunicorn, uvicorn and aiosqlite.
+
+    python benchmarks/bench_asgi.py --workers 4 --concurrency 64 --db-latency 5
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sqlalchemy import insert
+
+from core import create_app, create_asgi_app
+from core.config import BaseConfig
+
+
+class SlowCursor(sqlite3.Cursor):
+    def execute(self, *args):
+        time.sleep(float(os.environ.get("BENCH_DB_LATENCY", 0)) / 1000)
+        return super().execute(*args)
+
+
+class SlowConnection(sqlite3.Connection):
+    def cursor(self, factory=SlowCursor):
+        return super().cursor(factory)
+
+
+def bench_config():
+    tmp = os.environ["BENCH_TMP"]
+
+    class BenchConfig(BaseConfig):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(tmp, "bench.db")
+        SQLALCHEMY_ENGINE_OPTIONS = {"connect_args": {"factory": SlowConnection, "check_same_thread": False}}
+        JWT_SECRET_KEY = "bench-secret-key-bench-secret-key"
+        TASK_SEARCH_INDEX_ENABLED = False
+        PASSWORD_HASH_WORKERS = 0
+        LOGIN_THROTTLE_PATH = os.path.join(tmp, "login-throttle")
+        RATELIMIT_STORAGE_URI = "shm://" + os.path.join(tmp, "ratelimit")
+        RATELIMIT_NAMESPACE_LIMITS = {name: "1000000 per minute" for name in ("tasks", "auth", "dashboard")}
+
+    return BenchConfig
+
+
+def wsgi_app():
+    return create_app(bench_config())
+
+
+def asgi_app():
+    return create_asgi_app(bench_config())
+
+
+def seed(users, tasks_per_user):
+    from flask_jwt_extended import create_access_token
+    from core.config.extension import db
+    from core.domain.task import Task
+    from core.domain.user import User
+
+    app = wsgi_app()
+    with app.app_context():
+        db.create_all()
+        db.session.execute(insert(User), [
+            {"id": i, "username": f"user{i}", "email": f"user{i}@example.com", "password_hash": "x"}
+            for i in range(1, users + 1)
+        ])
+        db.session.execute(insert(Task), [
+            {"title": f"Task {n} of user {i}", "description": "Benchmark task", "is_completed": n % 2 == 0, "user_id": i}
+            for i in range(1, users + 1)
+            for n in range(tasks_per_user)
+        ])
+        db.session.commit()
+        tokens = {i: create_access_token(identity=f"user{i}", additional_claims={"uid": i}) for i in range(1, users + 1)}
+    # Task ids were assigned in user order.
+    return [(tokens[i], (i - 1) * tasks_per_user + 1 + n) for i in tokens for n in range(tasks_per_user)]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind, workers, port, env):
+    if kind == "gunicorn":
+        command = ["-m", "gunicorn", "-w", str(workers), "-b", f"127.0.0.1:{port}", "benchmarks.bench_asgi:wsgi_app()"]
+    else:
+        command = [
+            "-m", "uvicorn", "--factory", "benchmarks.bench_asgi:asgi_app", "--workers", str(workers),
+            "--port", str(port), "--log-level", "warning", "--no-access-log",
+        ]
+    process = subprocess.Popen([sys.executable, *command], cwd=ROOT, env=env, stderr=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1)
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{kind} did not start")
+
+
+async def client(port, targets, deadline, latencies, errors):
+    reader = writer = None
+    rng = random.Random()
+    while time.perf_counter() < deadline:
+        token, task_id = rng.choice(targets)
+        path = f"/api/v1/tasks/{task_id}" if rng.random() < 0.5 else "/api/v1/tasks/?limit=20"
+        request = f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nAuthorization: Bearer {token}\r\n\r\n".encode()
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(request)
+            head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").lower()
+            length = int(head.split("content-length:", 1)[1].split("\r\n", 1)[0])
+            await reader.readexactly(length)
+            status = int(head.split(" ", 2)[1])
+        except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+            errors.append(1)
+            writer = None
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+        if status != 200:
+            errors.append(status)
+        # gunicorn's sync workers close the connection after each response.
+        if "connection: close" in head:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def load(port, targets, concurrency, duration):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(client(port, targets, deadline, latencies, errors) for _ in range(concurrency)))
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--db-latency", type=float, default=5.0, help="Delay per SQL statement, in ms")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--tasks-per-user", type=int, default=50)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ["BENCH_TMP"] = tmp
+    targets = seed(args.users, args.tasks_per_user)
+    env = dict(os.environ, BENCH_DB_LATENCY=str(args.db_latency))
+
+    print(f"{args.workers} workers, {args.concurrency} connections, {args.db_latency} ms per statement")
+    print(f"{'server':<10} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for kind in ("gunicorn", "uvicorn"):
+        port = free_port()
+        server = start_server(kind, args.workers, port, env)
+        try:
+            asyncio.run(load(port, targets, args.concurrency, 1.0))
+            latencies, errors = asyncio.run(load(port, targets, args.concurrency, args.duration))
+        finally:
+            server.terminate()
+            server.wait()
+        p50 = statistics.median(latencies)
+        p99 = statistics.quantiles(latencies, n=100)[98]
+        print(f"{kind:<10} {len(latencies) / args.duration:>8.0f} {p50:>8.1f} {p99:>8.1f} {len(errors):>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Cost of the revocation check for tokens that have not been revoked.
+
+Compares a database lookup per request with the Bloom filter fast path of
+``TokenBlocklist`` on a blocklist holding ``--revoked`` entries (SQLite).
+
+    python benchmarks/bench_blocklist.py --revoked 50000 --iterations 20000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from core.config.extension import db
+from core.domain.revoked_token import RevokedToken
+from core.infrastructure.security.token_blocklist import TokenBlocklist
+from core.infrastructure.token.token_blocklist_repository import TokenBlocklistRepository
+
+
+def measure(check, jtis):
+    started = time.perf_counter()
+    for jti in jtis:
+        check(jti)
+    return (time.perf_counter() - started) / len(jtis) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--revoked", type=int, default=50000)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "blocklist.db")
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + path
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"connect_args": {}}
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        expires_at = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=1)
+        db.session.bulk_save_objects(
+            [RevokedToken(str(uuid.uuid4()), expires_at) for _ in range(args.revoked)]
+        )
+        db.session.commit()
+
+        repository = TokenBlocklistRepository()
+        blocklist = TokenBlocklist(repository, capacity=max(100000, args.revoked))
+        blocklist.rebuild()
+        jtis = [str(uuid.uuid4()) for _ in range(args.iterations)]
+
+        database = measure(repository.is_revoked, jtis)
+        bloom = measure(blocklist.is_revoked, jtis)
+        stats = blocklist.stats()
+
+    print(f"database lookup: {database:.2f} us per request")
+    print(f"bloom filter:    {bloom:.2f} us per request ({database / bloom:.0f}x faster)")
+    print(f"filter: {stats['size']} entries, {stats['memory_bytes'] / 1024:.0f} KiB, "
+          f"{stats['database_checks']} false positives sent to the database")
+
+
+if __name__ == "__main__":
+    main()
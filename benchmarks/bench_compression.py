@@ -0,0 +1,82 @@
+"""Task list response size and latency: pretty vs compact JSON, with and
+without compression.
+
+Serves ``task_list_model`` pages of several sizes from a minimal app with
+the same flask-restx marshalling and ``ResponseCompression`` as the API.
+
+    python benchmarks/bench_compression.py --sizes 10 50 200 1000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask_restx import Api, Resource
+
+from core.config.compression import ResponseCompression, brotli
+from core.routes.task import task_list_model
+
+MODES = {
+    "pretty": {"indent": 2, "sort_keys": False},
+    "compact": {"separators": (",", ":"), "sort_keys": False},
+}
+
+
+def build_app(json_settings, size):
+    app = Flask(__name__)
+    app.config["RESTX_JSON"] = json_settings
+    ResponseCompression(app)
+    api = Api(app)
+    tasks = [
+        {
+            "id": i,
+            "title": f"Prepare quarterly report section {i}",
+            "description": "Collect the numbers from finance, draft the summary and send it for review",
+            "is_completed": i % 3 == 0,
+        }
+        for i in range(1, size + 1)
+    ]
+
+    @api.route("/tasks")
+    class Tasks(Resource):
+        @api.marshal_with(task_list_model)
+        def get(self):
+            return {"tasks": tasks, "next_cursor": "NTA"}
+
+    return app
+
+
+def measure(app, encoding, repeats):
+    client = app.test_client()
+    headers = {"Accept-Encoding": encoding} if encoding else {}
+    size = len(client.get("/tasks", headers=headers).data)
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        client.get("/tasks", headers=headers)
+        samples.append((time.perf_counter() - started) * 1000)
+    return size, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200, 1000])
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    encodings = [None, "gzip"] + (["br"] if brotli else [])
+    print(f"{'tasks':>6} {'mode':<8} {'encoding':<9} {'bytes':>9} {'ms':>8}")
+    for size in args.sizes:
+        for mode, settings in MODES.items():
+            app = build_app(settings, size)
+            for encoding in encodings:
+                body, latency = measure(app, encoding, args.repeats)
+                print(f"{size:>6} {mode:<8} {encoding or 'identity':<9} {body:>9} {latency:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
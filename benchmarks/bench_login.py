@@ -0,0 +1,83 @@
+"""Password verification throughput under concurrent logins.
+
+Runs ``--concurrency`` threads that each verify passwords for ``--seconds``,
+once with hashing inline on the request threads and once through the
+process pool, and reports completed logins per second, rejections (503) and
+latency percentiles.
+
+    python benchmarks/bench_login.py --concurrency 32 --seconds 5
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.security import generate_password_hash
+
+from core.exceptions.service_unavailable_error import ServiceUnavailableError
+from core.infrastructure.security.password_hasher import PasswordHasher
+
+
+def run(name, hasher, password_hash, concurrency, seconds):
+    latencies = []
+    rejected = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker():
+        local, local_rejected = [], 0
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                hasher.verify(password_hash, "correct horse battery staple")
+                local.append(time.perf_counter() - started)
+            except ServiceUnavailableError:
+                local_rejected += 1
+                time.sleep(0.01)
+        with lock:
+            latencies.extend(local)
+            rejected[0] += local_rejected
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    count = len(latencies)
+    print(name)
+    print(f"  logins/s:  {count / seconds:.1f}")
+    print(f"  rejected:  {rejected[0]}")
+    if count:
+        print(f"  p50:       {latencies[count // 2] * 1000:.1f} ms")
+        print(f"  p99:       {latencies[min(count - 1, int(count * 0.99))] * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--method", default="scrypt:32768:8:1")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--queue-size", type=int, default=16)
+    args = parser.parse_args()
+
+    password_hash = generate_password_hash("correct horse battery staple", args.method)
+    print(f"{args.concurrency} concurrent clients, {args.method}, {os.cpu_count()} CPUs\n")
+
+    run("inline (request thread)", PasswordHasher(args.method), password_hash,
+        args.concurrency, args.seconds)
+
+    pooled = PasswordHasher(args.method, workers=args.workers, queue_size=args.queue_size)
+    pooled.verify(password_hash, "warm up the pool")
+    run(f"process pool ({args.workers} workers, queue {args.queue_size})", pooled, password_hash,
+        args.concurrency, args.seconds)
+    pooled.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Cost of request metrics on the hot path.
+
+Times the metrics work of one request on its own: the before_request and
+after_request hooks plus the counting of two SQL statements. Then serves
+GET /tasks/<id> and GET /health through the test client of two apps on the
+same seeded SQLite database, one with METRICS_ENABLED off and one with it
+on, alternating between them so that both see the same machine noise, and
+reports the best time per request of each. Finally it times a /metrics
+scrape.
+
+    python benchmarks/bench_metrics.py --requests 5000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_asgi import bench_config, seed
+from core import create_app
+from core.config.metrics import _count_query
+
+
+def per_call_us(func, calls):
+    started = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def make_app(enabled):
+    class MetricsBenchConfig(bench_config()):
+        METRICS_ENABLED = enabled
+        METRICS_DIR = os.path.join(os.environ["BENCH_TMP"], "metrics")
+
+    return create_app(MetricsBenchConfig)
+
+
+def hooks_us(app, calls):
+    before = next(f for f in app.before_request_funcs[None] if f.__name__ == "start_timer")
+    after = next(f for f in app.after_request_funcs[None] if f.__name__ == "record")
+    response = app.response_class("{}", mimetype="application/json")
+
+    def one_request():
+        before()
+        _count_query(None, None, None, None, None, False)
+        _count_query(None, None, None, None, None, False)
+        after(response)
+
+    with app.test_request_context("/api/v1/tasks/1"):
+        one_request()
+        return min(per_call_us(one_request, calls) for _ in range(5))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    os.environ["BENCH_TMP"] = tempfile.mkdtemp()
+    token, _ = seed(1, 1)[0]
+    headers = {"Authorization": f"Bearer {token}"}
+    apps = {"off": make_app(False), "on": make_app(True)}
+
+    print(f"metrics hooks per request: {hooks_us(apps['on'], args.requests * 10):.2f} us")
+
+    clients = {mode: app.test_client() for mode, app in apps.items()}
+    paths = {"task": "/api/v1/tasks/1", "health": "/health"}
+    calls = max(args.requests // args.rounds, 1)
+    best = {}
+    for round_ in range(args.rounds + 1):
+        for name, path in paths.items():
+            # Alternate which app goes first.
+            for mode in ("off", "on")[::1 if round_ % 2 else -1]:
+                client = clients[mode]
+                took = per_call_us(lambda: client.get(path, headers=headers), calls)
+                # The first round warms up both apps.
+                if round_:
+                    best[name, mode] = min(best.get((name, mode), took), took)
+
+    print(f"{'route':<8} {'off us':>8} {'on us':>8} {'overhead':>9}")
+    for name in paths:
+        off, on = best[name, "off"], best[name, "on"]
+        print(f"{name:<8} {off:>8.1f} {on:>8.1f} {on - off:>+8.1f}us ({(on - off) / off:+.1%})")
+    scrape = min(per_call_us(lambda: clients["on"].get("/metrics"), 20) for _ in range(5))
+    print(f"/metrics scrape: {scrape / 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Memory footprint and per-check latency of the rate limiter storages.
+
+Compares the GCRA strategy on the fixed-size shared-memory table against the
+fixed-window strategy on the in-process ``memory://`` storage, for a given
+number of distinct keys (default: 1M) and the app's default limits.
+
+    python benchmarks/bench_ratelimit.py --keys 1000000
+"""
+import argparse
+import gc
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from limits import parse_many
+from limits.storage import MemoryStorage
+from limits.strategies import FixedWindowRateLimiter
+
+from core.infrastructure.ratelimit.gcra import GCRARateLimiter
+from core.infrastructure.ratelimit.shared_memory_storage import SharedMemoryStorage, SLOT, HEADER
+
+DEFAULT_LIMITS = "5000 per day; 1000 per hour; 100 per minute"
+
+
+def max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(name, limiter, limits, keys, sample_every=100):
+    gc.collect()
+    rss_before = max_rss_mb()
+    samples = []
+    started = time.perf_counter()
+
+    for n in range(keys):
+        key = f"user:{n}"
+        if n % sample_every == 0:
+            t0 = time.perf_counter()
+            for item in limits:
+                limiter.hit(item, key)
+            samples.append(time.perf_counter() - t0)
+        else:
+            for item in limits:
+                limiter.hit(item, key)
+
+    elapsed = time.perf_counter() - started
+    samples.sort()
+    checks = keys * len(limits)
+    print(f"{name}")
+    print(f"  checks:          {checks:,}")
+    print(f"  mean per check:  {elapsed / checks * 1e6:.2f} us")
+    print(f"  p50 per request: {samples[len(samples) // 2] * 1e6:.2f} us ({len(limits)} limits)")
+    print(f"  p99 per request: {samples[int(len(samples) * 0.99)] * 1e6:.2f} us")
+    print(f"  peak RSS growth: {max_rss_mb() - rss_before:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=1_000_000)
+    parser.add_argument("--slots", type=int, default=None,
+                        help="shared table size (default: keys x limits at a 0.75 load factor)")
+    args = parser.parse_args()
+
+    limits = list(parse_many(DEFAULT_LIMITS))
+    slots = args.slots or args.keys * len(limits) * 4 // 3 + 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "ratelimit")
+        storage = SharedMemoryStorage(f"shm://{path}", slots=slots)
+        run("gcra + shm:// (fixed-size table)", GCRARateLimiter(storage), limits, args.keys)
+        print(f"  table size:      {(HEADER.size + slots * SLOT.size) / 2**20:.1f} MB "
+              f"({slots:,} slots x {SLOT.size} bytes, constant)")
+
+    run("fixed-window + memory://", FixedWindowRateLimiter(MemoryStorage()), limits, args.keys)
+
+
+if __name__ == "__main__":
+    main()
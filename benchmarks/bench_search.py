@@ -0,0 +1,104 @@
+"""Task search latency: inverted index vs a LIKE scan.
+
+Seeds a SQLite database with ``--tasks`` synthetic tasks spread over
+``--users`` owners (word frequencies follow a Zipf-like distribution), then
+times multi-term queries through ``TaskService.search_tasks`` with the
+index and through the repository's ``LIKE`` fallback.
+
+    python benchmarks/bench_search.py --tasks 100000
+    python benchmarks/bench_search.py --tasks 1000000 --users 1000
+"""
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import insert
+
+from core.config.extension import db
+from core.domain.task import Task
+from core.domain.user import User
+from core.application.task.task_service import TaskService
+from core.infrastructure.search.inverted_index import tokenize
+from core.infrastructure.search.task_search_index import TaskSearchIndex
+from core.infrastructure.task.task_repository import TaskRepository
+
+VOCABULARY = [f"w{i}" for i in range(20000)]
+CUMULATIVE_WEIGHTS = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY))))
+
+
+def seed(tasks, users, rng, batch=50000):
+    db.session.execute(insert(User), [
+        {"username": f"user{i}", "email": f"user{i}@example.com", "password_hash": "x"} for i in range(users)
+    ])
+    for start in range(0, tasks, batch):
+        rows = []
+        for _ in range(min(batch, tasks - start)):
+            title = " ".join(rng.choices(VOCABULARY, cum_weights=CUMULATIVE_WEIGHTS, k=rng.randint(3, 6)))
+            description = " ".join(rng.choices(VOCABULARY, cum_weights=CUMULATIVE_WEIGHTS, k=rng.randint(10, 20)))
+            rows.append({"title": title, "description": description, "is_completed": False,
+                         "user_id": rng.randrange(users) + 1})
+        db.session.execute(insert(Task), rows)
+    db.session.commit()
+
+
+def timed(function, queries):
+    samples = []
+    for user_id, query in queries:
+        started = time.perf_counter()
+        function(user_id, query)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(17)
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "search.db")
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"connect_args": {}}
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        seed(args.tasks, args.users, rng)
+        repository = TaskRepository()
+
+        search_index = TaskSearchIndex(repository)
+        started = time.perf_counter()
+        search_index.start(app)
+        while search_index.index is None:
+            time.sleep(0.05)
+        build_seconds = time.perf_counter() - started
+        service = TaskService(repository, search_index)
+
+        # Mix of frequent and rare words, one to three per query.
+        queries = [
+            (rng.randrange(args.users) + 1, " ".join(rng.choices(VOCABULARY[:5000], k=rng.randint(1, 3))))
+            for _ in range(args.queries)
+        ]
+        indexed = timed(lambda user_id, query: service.search_tasks(user_id, query, 20), queries)
+        scanned = timed(lambda user_id, query: repository.search_tasks(user_id, tokenize(query), 20), queries)
+        stats = search_index.stats()
+
+    print(f"{args.tasks} tasks, {args.users} owner(s); index built in {build_seconds:.1f}s, "
+          f"{stats['postings']} postings ({stats['posting_bytes'] / 2 ** 20:.1f} MiB of posting arrays)")
+    print(f"LIKE scan:      median {scanned[0]:8.2f} ms, max {scanned[1]:8.2f} ms")
+    print(f"inverted index: median {indexed[0]:8.2f} ms, max {indexed[1]:8.2f} ms "
+          f"({scanned[0] / indexed[0]:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
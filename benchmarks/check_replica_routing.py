@@ -0,0 +1,175 @@
+"""Read-replica routing check with a primary and two replica SQLite files.
+
+Seeds a primary database, copies it to two replica files and records which
+engine runs every statement while the app serves requests: task reads and
+logins must be spread over the replicas, writes and reads that follow a
+write in the same request must stay on the primary, for both ``db`` and the
+asyncio engine of the ASGI app. Exits with status 1 on any mismatch and
+prints how --reads task reads were spread over the replicas.
+
+    python benchmarks/check_replica_routing.py --strategy round_robin
+    python benchmarks/check_replica_routing.py --strategy least_loaded
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from core import create_asgi_app
+from core.config import BaseConfig
+from core.config.extension import async_db, db
+
+failures = []
+
+
+def make_config(tmp, strategy):
+    class CheckConfig(BaseConfig):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(tmp, "primary.db")
+        SQLALCHEMY_REPLICA_URIS = ["sqlite:///" + os.path.join(tmp, f"replica{n}.db") for n in (1, 2)]
+        SQLALCHEMY_REPLICA_STRATEGY = strategy
+        SQLALCHEMY_ENGINE_OPTIONS = {"connect_args": {}}
+        JWT_SECRET_KEY = "check-secret-key-check-secret-key"
+        TASK_SEARCH_INDEX_ENABLED = False
+        PASSWORD_HASH_METHOD = "pbkdf2:sha256:1000"
+        PASSWORD_HASH_WORKERS = 0
+        LOGIN_THROTTLE_PATH = os.path.join(tmp, "login-throttle")
+        RATELIMIT_STORAGE_URI = "shm://" + os.path.join(tmp, "ratelimit")
+        RATELIMIT_NAMESPACE_LIMITS = {name: "1000000 per minute" for name in ("tasks", "auth", "dashboard")}
+
+    return CheckConfig
+
+
+class StatementLog:
+    """(engine name, first SQL keyword, table) of every statement run."""
+
+    def __init__(self, engines):
+        self.entries = []
+        for name, engine in engines.items():
+            event.listen(engine, "before_cursor_execute", self._recorder(name))
+
+    def _recorder(self, name):
+        def record(conn, cursor, statement, parameters, context, executemany):
+            words = statement.split()
+            keyword = words[0].upper()
+            marker = {"SELECT": "FROM", "INSERT": "INTO", "UPDATE": "UPDATE", "DELETE": "FROM"}.get(keyword)
+            table = words[words.index(marker) + 1].strip('"') if marker in words else None
+            self.entries.append((name, keyword, table))
+        return record
+
+    def take(self):
+        entries, self.entries = self.entries, []
+        return entries
+
+
+def check(case, entries, table, keyword, expected):
+    engines = [name for name, kw, tbl in entries if tbl == table and kw == keyword]
+    ok = bool(engines) and all(expected(name) for name in engines)
+    if not ok:
+        failures.append(case)
+    print(f"{'ok' if ok else 'FAIL':<5} {case:<48} {keyword} {table}: {', '.join(engines) or '-'}")
+    return engines
+
+
+def is_primary(name):
+    return name == "primary"
+
+
+def is_replica(name):
+    return name.startswith("replica_")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--strategy", choices=("round_robin", "least_loaded"), default="round_robin")
+    parser.add_argument("--reads", type=int, default=100)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    asgi = create_asgi_app(make_config(tmp, args.strategy))
+    app = asgi.app
+    client = app.test_client()
+
+    with app.app_context():
+        db.create_all()
+    with app.app_context():
+        app.user_service.register_user("alice", "correct horse battery", "alice@example.com")
+    with app.app_context():
+        task_id = app.task_service.create_task(1, "Write report").id
+    with app.app_context():
+        token = create_access_token(identity="alice", additional_claims={"uid": 1})
+        headers = {"Authorization": f"Bearer {token}"}
+        engines = dict(db.engines)
+        for engine in engines.values():
+            engine.dispose()
+
+    # "Replication": the replicas start as copies of the primary.
+    for n in (1, 2):
+        shutil.copy(os.path.join(tmp, "primary.db"), os.path.join(tmp, f"replica{n}.db"))
+
+    names = {engine: "primary" if key is None else key for key, engine in engines.items()}
+    log = StatementLog({name: engine for engine, name in names.items()})
+    async_log = StatementLog({
+        "primary": async_db.engine.sync_engine,
+        **{key: engine.sync_engine for key, engine in async_db.replica_engines.items()},
+    })
+
+    client.get(f"/api/v1/tasks/{task_id}", headers=headers)
+    check("GET /tasks/<id>", log.take(), "tasks", "SELECT", is_replica)
+    client.get("/api/v1/tasks/", headers=headers)
+    check("GET /tasks/", log.take(), "tasks", "SELECT", is_replica)
+
+    client.post("/api/v1/auth/login", json={"username": "alice", "password": "correct horse battery"})
+    entries = log.take()
+    # After the refresh token commit the user row is reloaded, from the primary.
+    first_write = next(index for index, (_, keyword, _) in enumerate(entries) if keyword == "INSERT")
+    check("POST /auth/login: user lookup", entries[:first_write], "users", "SELECT", is_replica)
+    check("POST /auth/login: reads after the write", entries[first_write:], "users", "SELECT", is_primary)
+    check("POST /auth/login: refresh token", entries, "refresh_tokens", "INSERT", is_primary)
+
+    client.put(f"/api/v1/tasks/{task_id}/update", json={"is_completed": True}, headers=headers)
+    check("PUT /tasks/<id>/update", log.take(), "tasks", "UPDATE", is_primary)
+
+    with app.test_request_context():
+        task = app.task_service.create_task(1, "Call the bank")
+        app.task_service.get_one_task(1, task.id)
+        app.task_service.list_task_page(1, 10)
+    entries = log.take()
+    check("create then read in one request: INSERT", entries, "tasks", "INSERT", is_primary)
+    check("create then read in one request: SELECT", entries, "tasks", "SELECT", is_primary)
+
+    async def async_cases():
+        service = app.async_task_service
+        with app.test_request_context():
+            await service.get_one_task(1, task_id)
+            await service.list_task_page(1, 10)
+        check("async get_one_task / list_task_page", async_log.take(), "tasks", "SELECT", is_replica)
+        with app.test_request_context():
+            await app.async_user_service.get_user_by_id(1)
+        check("async get_user_by_id", async_log.take(), "users", "SELECT", is_replica)
+        with app.test_request_context():
+            task = await service.create_task(1, "Book flights")
+            await service.get_one_task(1, task.id)
+        check("async create then read in one request", async_log.take(), "tasks", "SELECT", is_primary)
+        await async_db.dispose()
+
+    asyncio.run(async_cases())
+
+    for _ in range(args.reads):
+        client.get(f"/api/v1/tasks/{task_id}", headers=headers)
+    spread = Counter(name for name, keyword, table in log.take() if table == "tasks" and keyword == "SELECT")
+    print(f"\n{args.reads} task reads ({args.strategy}): " + ", ".join(f"{name} {count}" for name, count in sorted(spread.items())))
+
+    if failures:
+        sys.exit(f"{len(failures)} routing check(s) failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Query-plan regression check for the task list filters and sorts.
+
+Runs each common list query through ``TaskRepository.list_task_page`` on a
+seeded SQLite database, captures the SQL it emits and inspects
+``EXPLAIN QUERY PLAN``. Exits with status 1 if a query scans the tasks table
+or sorts in a temporary B-tree instead of reading an index in order, or if a
+title prefix filter returns a title without that prefix.
+
+    python benchmarks/check_task_query_plans.py --tasks 20000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import event, text
+
+from core.config.extension import db
+from core.domain.task import Task
+from core.domain.user import User
+from core.infrastructure.task.task_repository import TaskRepository
+
+# (description, list_task_page keyword arguments, whether ORDER BY must be
+# served by the index as well)
+CASES = [
+    ("first page", {}, True),
+    ("next page", {"after": (500,)}, True),
+    ("descending", {"descending": True, "after": (500,)}, True),
+    ("open tasks", {"filters": {"is_completed": False}}, True),
+    ("completed tasks, next page", {"filters": {"is_completed": True}, "after": (500,)}, True),
+    ("title prefix", {"filters": {"title": "Gro"}, "order_by": ("title", "id")}, True),
+    ("title prefix ending in z", {"filters": {"title": "Quiz"}, "order_by": ("title", "id")}, True),
+    ("title prefix ending in a digit", {"filters": {"title": "Gym 9"}, "order_by": ("title", "id")}, True),
+    ("title prefix ending in U+10FFFF", {"filters": {"title": "Gym\U0010ffff"}, "order_by": ("title", "id")}, True),
+    ("sorted by title, next page", {"order_by": ("title", "id"), "after": ("M", 10)}, True),
+    ("id range", {"filters": {"min_id": 100, "max_id": 900}}, True),
+    ("open tasks sorted by title", {"filters": {"is_completed": False}, "order_by": ("title", "id")}, False),
+]
+
+WORDS = ["Groceries", "Gym", "Invoice", "Meeting", "Quiz", "Report", "Review", "Taxes", "Travel"]
+
+
+def seed(tasks, users=10):
+    db.session.add_all(User(f"user{i}", f"user{i}@example.com", "x") for i in range(users))
+    db.session.flush()
+    rng = random.Random(7)
+    db.session.add_all(
+        Task(f"{rng.choice(WORDS)} {i}", is_completed=rng.random() < 0.3, user_id=rng.randrange(users) + 1)
+        for i in range(tasks)
+    )
+    db.session.commit()
+    db.session.execute(text("ANALYZE"))
+
+
+def capture_plan(repository, kwargs):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        tasks = repository.list_task_page(1, 50, **kwargs)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+    statement, parameters = statements[-1]
+    with db.engine.connect() as connection:
+        rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+    return [row[-1] for row in rows], tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=20000)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "plans.db")
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"connect_args": {}}
+    db.init_app(app)
+
+    failures = 0
+    with app.app_context():
+        db.create_all()
+        seed(args.tasks)
+        repository = TaskRepository()
+
+        for description, kwargs, ordered in CASES:
+            plan, tasks = capture_plan(repository, kwargs)
+            prefix = kwargs.get("filters", {}).get("title", "")
+            full_scan = any(step.startswith("SCAN tasks") and "INDEX" not in step for step in plan)
+            unindexed = not any("USING INDEX" in step or "USING COVERING INDEX" in step for step in plan)
+            temp_sort = any("TEMP B-TREE" in step for step in plan)
+            wrong_rows = any(not task.title.startswith(prefix) for task in tasks)
+            ok = not (full_scan or unindexed or (ordered and temp_sort) or wrong_rows)
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {description}: {' | '.join(plan)}")
+
+    if failures:
+        print(f"{failures} query plan(s) regressed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,33 @@
 from flask import Flask, request
 
-from .config.extension import db, migrate, limiter, jwt
+from .config.extension import (
+    db, async_db, replicas, pool_metrics, request_metrics, migrate, limiter, jwt, compression, admission
+)
+from .config.asgi import AsgiApplication
 from .config import ProductionConfig, DevelopmentConfig
+from .config.pool import pool_options
+from .config.rate_limit import rate_limit_strategy
 from .routes.dashboard import dashboard_ns
+from .routes.admin import admin_ns
 from .routes.auth import auth_ns
 from .routes.task import task_ns
-from .infrastructure.di_binder import bind_task_repository, bind_user_repository
+from .infrastructure.di_binder import (
+    bind_task_repository,
+    bind_task_stats_repository,
+    bind_task_search_index,
+    bind_user_repository,
+    bind_refresh_token_repository,
+    bind_async_task_repository,
+    bind_async_user_repository,
+    bind_async_refresh_token_repository,
+    bind_token_blocklist,
+    bind_password_hasher,
+    bind_login_throttle,
+)
 from .application.task.task_service import TaskService
 from .application.user.user_service import UserService
+from .application.task.async_task_service import AsyncTaskService
+from .application.user.async_user_service import AsyncUserService
 from flask_restx import Api
 
 authorizations = {
@@ -66,32 +86,66 @@ def create_app(config=ProductionConfig):
     app = Flask(__name__, instance_relative_config=True)
     app.config.from_object(config or DevelopmentConfig)
 
-    # Initialize extensions
+    # Pool class and sizes of the environment; explicit engine options win.
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        **pool_options(app.config),
+        **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}),
+    }
+    app.config['RATELIMIT_STRATEGY'] = rate_limit_strategy(app.config)
+
+    # Initialize extensions (replicas registers its binds before db reads them)
+    replicas.init_app(app)
     db.init_app(app)
+    pool_metrics.init_app(app, db)
+    # Before the extensions with request hooks, so their time is measured.
+    request_metrics.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
     api.init_app(app)
     limiter.init_app(app)
+    compression.init_app(app)
     # Dependency Injection
-    task_repo = bind_task_repository()
+    task_stats_repo = bind_task_stats_repository()
+    task_repo = bind_task_repository(app.config, task_stats_repo)
+    task_search_index = bind_task_search_index(app.config, task_repo)
     user_repo = bind_user_repository()
+    token_blocklist = bind_token_blocklist(app.config)
 
     # Create service instances
-    task_service = TaskService(task_repo)
-    user_service = UserService(user_repo)
+    task_service = TaskService(task_repo, task_search_index, task_stats_repo)
+    user_service = UserService(
+        user_repo,
+        bind_password_hasher(app.config),
+        bind_login_throttle(app.config),
+        bind_refresh_token_repository(),
+        token_blocklist,
+    )
 
     # Attach services to app for global access
     app.task_service = task_service
     app.user_service = user_service
+    app.token_blocklist = token_blocklist
 
     # Import models to register with SQLAlchemy
     from .domain.task import Task
     from .domain.user import User
+    from .domain.refresh_token import RefreshToken
+    from .domain.revoked_token import RevokedToken
+    from .domain.task_stats import TaskStats
+    from .domain.task_daily_stats import TaskDailyStats
+    from .domain.task_change import TaskChange
+
+    if task_search_index:
+        task_search_index.start(app)
 
     # Register namespaces
     api.add_namespace(dashboard_ns, path="/dashboard")
     api.add_namespace(auth_ns, path="/auth")
     api.add_namespace(task_ns, path="/tasks")
+    api.add_namespace(admin_ns, path="/admin")
+
+    # Shed load on the database-bound namespaces before it queues up.
+    admission.init_app(app, {'tasks': task_ns, 'auth': auth_ns})
 
     # JWT error handlers
     @jwt.expired_token_loader
@@ -117,6 +171,10 @@ def create_app(config=ProductionConfig):
             "hint": "Use 'Authorization: Bearer <your_token>' in the request header"
         }, 401
 
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(jwt_header, jwt_payload):
+        return app.token_blocklist.is_revoked(jwt_payload["jti"])
+
     @jwt.revoked_token_loader
     def revoked_token_callback(jwt_header, jwt_payload):
         return {
@@ -124,6 +182,11 @@ def create_app(config=ProductionConfig):
             "error": "token_revoked"
         }, 401
 
+    # flask-restx handles the exceptions of its resources itself, so the
+    # loaders above must also be registered as API error handlers; the app
+    # handlers only cover the plain Flask routes.
+    jwt._set_error_handler_callbacks(api)
+
     # Health check endpoint for monitoring
     @app.route('/health')
     def health_check():
@@ -133,7 +196,9 @@ def create_app(config=ProductionConfig):
             'version': '1.0.0'
         }, 200
 
-    @app.route('/')
+    # flask-restx already registers an endpoint named "root" for the API
+    # index, so this view needs its own name.
+    @app.route('/', endpoint='index')
     def root():
         return {
             'message': 'Task Management API',
@@ -147,3 +212,26 @@ def create_app(config=ProductionConfig):
         }, 200
 
     return app
+
+def create_asgi_app(config=ProductionConfig):
+    """ASGI entry point: the Flask app plus asyncio services for the task
+    and login routes listed in ``core.routes.native.NATIVE_ROUTES``."""
+    from .routes.native import NATIVE_ROUTES
+
+    app = create_app(config)
+    async_db.init_app(app)
+    pool_metrics.instrument(app, 'async', async_db.engine)
+    for key, engine in async_db.replica_engines.items():
+        pool_metrics.instrument(app, f'async_{key}', engine)
+
+    # Same search index, password hasher and login throttle as the sync
+    # services, so both paths see the same state.
+    app.async_task_service = AsyncTaskService(bind_async_task_repository(async_db, app.config), app.task_service.search_index)
+    app.async_user_service = AsyncUserService(
+        bind_async_user_repository(async_db),
+        bind_async_refresh_token_repository(async_db),
+        app.user_service.password_hasher,
+        app.user_service.login_throttle,
+    )
+
+    return AsgiApplication(app, api, NATIVE_ROUTES, async_db, app.config['ASGI_WSGI_THREADS'])
@@ -0,0 +1,95 @@
+from ...infrastructure.task.async_task_interface import AsyncTaskRepositoryInterface
+from ...application.task.async_task_service_interface import AsyncTaskServiceInterface
+from ...application.task.task_service import TaskService, LIST_SORTS, UPDATABLE_FIELDS
+from ...domain.task import Task
+from ...exceptions.validation_error import ValidationError
+
+class AsyncTaskService(AsyncTaskServiceInterface):
+    # asyncio version of TaskService for the ASGI app. Validation, cursors
+    # and search index updates are shared with TaskService; only the
+    # repository calls are awaited. The search index is the in-memory one of
+    # the process's TaskService, so updating it does not block.
+
+    _validate_new_task = staticmethod(TaskService._validate_new_task)
+    _list_filters = staticmethod(TaskService._list_filters)
+    _bulk_selection = staticmethod(TaskService._bulk_selection)
+    _encode_cursor = staticmethod(TaskService._encode_cursor)
+    _decode_cursor = staticmethod(TaskService._decode_cursor)
+    _index = TaskService._index
+    _unindex = TaskService._unindex
+
+    def __init__(self, task_repository: AsyncTaskRepositoryInterface, search_index=None):
+        self.task_repository = task_repository
+        self.search_index = search_index
+
+    async def create_task(self, user_id, title, description=None):
+        task = Task(title, description, user_id=user_id)
+        await self.task_repository.create_task(task)
+        self._index(task)
+        return task
+
+    async def create_tasks(self, user_id, items):
+        tasks = []
+        texts = []
+        errors = []
+        for index, item in enumerate(items):
+            error = self._validate_new_task(item)
+            if error:
+                errors.append({"index": index, "message": error})
+                continue
+            tasks.append(Task(item["title"], item.get("description"), user_id=user_id))
+            texts.append((item["title"], item.get("description")))
+
+        created_ids = await self.task_repository.create_tasks(tasks) if tasks else []
+        if self.search_index:
+            # The tasks are inserted as plain rows and carry no ids.
+            for task_id, (title, description) in zip(created_ids, texts):
+                self.search_index.index_task(task_id, user_id, title, description)
+        return {"created": created_ids, "errors": errors}
+
+    async def get_one_task(self, user_id, task_id):
+        return await self.task_repository.get_one_task(user_id, task_id)
+
+    async def list_task(self, user_id):
+        return await self.task_repository.list_task(user_id)
+
+    async def list_task_page(self, user_id, limit, cursor=None, filters=None, sort="id"):
+        order_by = LIST_SORTS.get(sort.lstrip("-"))
+        if order_by is None:
+            raise ValidationError(f"Unsupported sort: {sort}. Use one of: {', '.join(sorted(LIST_SORTS))}")
+        filters = self._list_filters(filters or {})
+        after = self._decode_cursor(cursor, sort, order_by) if cursor else None
+
+        tasks = await self.task_repository.list_task_page(
+            user_id, limit + 1, after, filters, order_by, descending=sort.startswith("-")
+        )
+        if len(tasks) <= limit:
+            return tasks, None
+
+        tasks = tasks[:limit]
+        return tasks, self._encode_cursor(sort, [getattr(tasks[-1], column) for column in order_by])
+
+    async def patch_task(self, user_id, task_id, changes):
+        changes = {field: changes[field] for field in UPDATABLE_FIELDS if field in changes}
+        task = await self.task_repository.patch_task(user_id, task_id, changes)
+        if "title" in changes or "description" in changes:
+            self._index(task)
+        return task
+
+    async def update_tasks(self, user_id, is_completed, task_ids=None, filters=None):
+        if not isinstance(is_completed, bool):
+            raise ValidationError("is_completed must be a boolean")
+        selection = self._bulk_selection(task_ids, filters)
+        return await self.task_repository.update_tasks(user_id, {"is_completed": is_completed}, **selection)
+
+    async def delete_task_by_id(self, user_id, task_id):
+        deleted = await self.task_repository.delete_task_by_id(user_id, task_id)
+        if deleted:
+            self._unindex(user_id, [task_id])
+        return deleted
+
+    async def delete_tasks(self, user_id, task_ids=None, filters=None):
+        selection = self._bulk_selection(task_ids, filters)
+        deleted_ids = await self.task_repository.delete_tasks(user_id, **selection)
+        self._unindex(user_id, deleted_ids)
+        return len(deleted_ids)
\ No newline at end of file
@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+
+class AsyncTaskServiceInterface(ABC):
+    @abstractmethod
+    async def create_task(self, user_id, title, description):
+        pass
+
+    @abstractmethod
+    async def create_tasks(self, user_id, items):
+        pass
+
+    @abstractmethod
+    async def get_one_task(self, user_id, task_id):
+        pass
+
+    @abstractmethod
+    async def list_task(self, user_id):
+        pass
+
+    @abstractmethod
+    async def list_task_page(self, user_id, limit, cursor=None, filters=None, sort="id"):
+        pass
+
+    @abstractmethod
+    async def patch_task(self, user_id, task_id, changes):
+        pass
+
+    @abstractmethod
+    async def update_tasks(self, user_id, is_completed, task_ids=None, filters=None):
+        pass
+
+    @abstractmethod
+    async def delete_task_by_id(self, user_id, task_id):
+        pass
+
+    @abstractmethod
+    async def delete_tasks(self, user_id, task_ids=None, filters=None):
+        pass
\ No newline at end of file
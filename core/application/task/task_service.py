@@ -1,24 +1,250 @@
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta, timezone
+
 from ...infrastructure.task.task_interface import TaskRepositoryInterface
+from ...infrastructure.search.inverted_index import tokenize
 from ...application.task.task_service_interface import TaskServiceInterface
 from ...domain.task import Task
+from ...exceptions.validation_error import ValidationError
+
+TITLE_MAX_LENGTH = 200
+BULK_FILTERS = {"is_completed"}
+# Filters accepted by the list endpoint and the type of their value.
+LIST_FILTERS = {"is_completed": bool, "title": str, "min_id": int, "max_id": int}
+# Sort keys accepted by the list endpoint ("-key" sorts descending). Each maps
+# to the columns of an index that starts with user_id and ends with id.
+LIST_SORTS = {"id": ("id",), "title": ("title", "id")}
+UPDATABLE_FIELDS = ("title", "description", "is_completed")
+# Times search_tasks re-reads from the database before returning a short page.
+SEARCH_TOP_UP_ROUNDS = 4
 
 class TaskService(TaskServiceInterface):
-    def __init__(self, task_repository: TaskRepositoryInterface):
+    def __init__(self, task_repository: TaskRepositoryInterface, search_index=None, stats_repository=None):
         self.task_repository = task_repository
+        self.search_index = search_index
+        self.stats_repository = stats_repository
     
-    def create_task(self, title, description=None):
-        task = Task(title, description)
+    def create_task(self, user_id, title, description=None):
+        task = Task(title, description, user_id=user_id)
         self.task_repository.create_task(task)
+        self._index(task)
         return task
+
+    def create_tasks(self, user_id, items):
+        tasks = []
+        texts = []
+        errors = []
+        for index, item in enumerate(items):
+            error = self._validate_new_task(item)
+            if error:
+                errors.append({"index": index, "message": error})
+                continue
+            tasks.append(Task(item["title"], item.get("description"), user_id=user_id))
+            texts.append((item["title"], item.get("description")))
+
+        created_ids = self.task_repository.create_tasks(tasks) if tasks else []
+        if self.search_index:
+            # Index from the request data: the tasks are inserted as plain
+            # rows and carry no ids.
+            for task_id, (title, description) in zip(created_ids, texts):
+                self.search_index.index_task(task_id, user_id, title, description)
+        return {"created": created_ids, "errors": errors}
     
-    def get_one_task(self, task_id):
-        return self.task_repository.get_one_task(task_id)
+    def get_one_task(self, user_id, task_id):
+        return self.task_repository.get_one_task(user_id, task_id)
     
-    def list_task(self):
-        return self.task_repository.list_task()
+    def list_task(self, user_id):
+        return self.task_repository.list_task(user_id)
+
+    def list_task_page(self, user_id, limit, cursor=None, filters=None, sort="id"):
+        order_by = LIST_SORTS.get(sort.lstrip("-"))
+        if order_by is None:
+            raise ValidationError(f"Unsupported sort: {sort}. Use one of: {', '.join(sorted(LIST_SORTS))}")
+        filters = self._list_filters(filters or {})
+        after = self._decode_cursor(cursor, sort, order_by) if cursor else None
+
+        # Fetch one extra row to learn whether another page exists without
+        # issuing a separate COUNT query.
+        tasks = self.task_repository.list_task_page(
+            user_id, limit + 1, after, filters, order_by, descending=sort.startswith("-")
+        )
+        if len(tasks) <= limit:
+            return tasks, None
+
+        tasks = tasks[:limit]
+        return tasks, self._encode_cursor(sort, [getattr(tasks[-1], column) for column in order_by])
+
+    def search_tasks(self, user_id, query, limit=20):
+        terms = tokenize(query)
+        if not terms:
+            raise ValidationError("Search query must contain at least one word")
+
+        hits = self.search_index.search(user_id, query, limit) if self.search_index else None
+        if hits is None:
+            return self.task_repository.search_tasks(user_id, terms, limit)
+
+        # The index only ranks ids; the rows come from the database so that
+        # results always reflect the stored tasks. Hits that were deleted
+        # since the index last synced drop out there, so the index is asked
+        # for twice as many until the page is full or it has no more.
+        results = []
+        read = 0
+        wanted = limit
+        for _ in range(SEARCH_TOP_UP_ROUNDS):
+            ids = [task_id for task_id, _ in hits[read:]]
+            tasks = {task.id: task for task in self.task_repository.get_tasks_by_ids(user_id, ids)}
+            results.extend(tasks[task_id] for task_id in ids if task_id in tasks)
+            read = len(hits)
+            if len(results) >= limit or len(hits) < wanted:
+                break
+            wanted *= 2
+            hits = self.search_index.search(user_id, query, wanted) or []
+        return results[:limit]
+
+    def get_task_stats(self, user_id, days=7):
+        today = datetime.now(timezone.utc).date()
+        since = today - timedelta(days=days - 1)
+        stats = self.stats_repository.get_stats(user_id, since)
+        created = stats["created_per_day"]
+        return {
+            "total": stats["total"],
+            "completed": stats["completed"],
+            "open": stats["total"] - stats["completed"],
+            "created_per_day": [
+                {"date": day.isoformat(), "count": created.get(day, 0)}
+                for day in (since + timedelta(days=offset) for offset in range(days))
+            ],
+        }
+
+    def export_tasks(self, user_id, batch_size=1000):
+        for task in self.task_repository.iter_tasks(user_id, batch_size):
+            yield task.to_dict()
+    
+    def update_task(self, user_id, task_id, title=None, description=None, is_completed=None):
+        task = self.task_repository.update_task(user_id, task_id, title, description, is_completed)
+        self._index(task)
+        return task
     
-    def update_task(self, task_id, title=None, description=None, is_completed=None):
-        return self.task_repository.update_task(task_id, title, description, is_completed)
+    def patch_task(self, user_id, task_id, changes):
+        changes = {field: changes[field] for field in UPDATABLE_FIELDS if field in changes}
+        task = self.task_repository.patch_task(user_id, task_id, changes)
+        if "title" in changes or "description" in changes:
+            self._index(task)
+        return task
+
+    def update_tasks(self, user_id, is_completed, task_ids=None, filters=None):
+        if not isinstance(is_completed, bool):
+            raise ValidationError("is_completed must be a boolean")
+        selection = self._bulk_selection(task_ids, filters)
+        return self.task_repository.update_tasks(user_id, {"is_completed": is_completed}, **selection)
     
     def delete_task(self, task):
-        return self.task_repository.delete_task(task)
\ No newline at end of file
+        result = self.task_repository.delete_task(task)
+        self._unindex(task.user_id, [task.id])
+        return result
+
+    def delete_task_by_id(self, user_id, task_id):
+        deleted = self.task_repository.delete_task_by_id(user_id, task_id)
+        if deleted:
+            self._unindex(user_id, [task_id])
+        return deleted
+
+    def delete_tasks(self, user_id, task_ids=None, filters=None):
+        selection = self._bulk_selection(task_ids, filters)
+        deleted_ids = self.task_repository.delete_tasks(user_id, **selection)
+        self._unindex(user_id, deleted_ids)
+        return len(deleted_ids)
+
+    def _index(self, task):
+        if self.search_index and task is not None:
+            self.search_index.index_task(task.id, task.user_id, task.title, task.description)
+
+    def _unindex(self, user_id, task_ids):
+        if self.search_index:
+            for task_id in task_ids:
+                self.search_index.remove_task(user_id, task_id)
+
+    @staticmethod
+    def _validate_new_task(item):
+        if not isinstance(item, dict):
+            return "Task must be an object"
+
+        title = item.get("title")
+        if not isinstance(title, str) or not title.strip():
+            return "Title is required and cannot be empty"
+        if len(title) > TITLE_MAX_LENGTH:
+            return f"Title cannot be longer than {TITLE_MAX_LENGTH} characters"
+
+        description = item.get("description")
+        if description is not None and not isinstance(description, str):
+            return "Description must be a string"
+        return None
+
+    @staticmethod
+    def _list_filters(filters):
+        unknown = set(filters) - set(LIST_FILTERS)
+        if unknown:
+            raise ValidationError(f"Unsupported filter: {', '.join(sorted(unknown))}")
+
+        for name, value in filters.items():
+            expected = LIST_FILTERS[name]
+            if value is None:
+                continue
+            if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+                raise ValidationError(f"{name} must be a {expected.__name__}")
+
+        title = filters.get("title")
+        if title is not None and not 0 < len(title) <= TITLE_MAX_LENGTH:
+            raise ValidationError(f"title must be between 1 and {TITLE_MAX_LENGTH} characters")
+        return filters
+
+    @staticmethod
+    def _bulk_selection(task_ids=None, filters=None):
+        selection = {}
+
+        if task_ids is not None:
+            if not isinstance(task_ids, list) or not task_ids:
+                raise ValidationError("ids must be a non-empty list of task identifiers")
+            if not all(isinstance(task_id, int) and not isinstance(task_id, bool) for task_id in task_ids):
+                raise ValidationError("ids must only contain integers")
+            selection["task_ids"] = task_ids
+
+        if filters:
+            unknown = set(filters) - BULK_FILTERS
+            if unknown:
+                raise ValidationError(f"Unsupported filter: {', '.join(sorted(unknown))}")
+            if "is_completed" in filters:
+                if not isinstance(filters["is_completed"], bool):
+                    raise ValidationError("filter.is_completed must be a boolean")
+                selection["is_completed"] = filters["is_completed"]
+
+        if not selection:
+            raise ValidationError("Provide ids or a filter to select tasks")
+        return selection
+
+    @staticmethod
+    def _encode_cursor(sort, values):
+        # The cursor carries the sort it was issued for and the sort key of
+        # the last row, e.g. ["title", "Groceries", 42].
+        payload = json.dumps([sort, *values], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor, sort, order_by):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        except (ValueError, binascii.Error, UnicodeError):
+            raise ValidationError("Invalid pagination cursor")
+
+        if not isinstance(payload, list) or len(payload) != len(order_by) + 1 or payload[0] != sort:
+            raise ValidationError("Invalid pagination cursor for this sort order")
+
+        values = payload[1:]
+        for column, value in zip(order_by, values):
+            expected = int if column == "id" else str
+            if not isinstance(value, expected) or isinstance(value, bool):
+                raise ValidationError("Invalid pagination cursor")
+        return tuple(values)
\ No newline at end of file
@@ -2,21 +2,57 @@ from abc import ABC, abstractmethod
 
 class TaskServiceInterface(ABC):
     @abstractmethod
-    def create_task(self, title, description):
+    def create_task(self, user_id, title, description):
         pass
 
     @abstractmethod
-    def get_one_task(self, task_id):
+    def create_tasks(self, user_id, items):
         pass
 
     @abstractmethod
-    def list_task(self):
+    def get_one_task(self, user_id, task_id):
         pass
 
     @abstractmethod
-    def update_task(self, task_id, title=None, description=None, is_completed=None):
+    def list_task(self, user_id):
+        pass
+
+    @abstractmethod
+    def list_task_page(self, user_id, limit, cursor=None, filters=None, sort="id"):
+        pass
+
+    @abstractmethod
+    def search_tasks(self, user_id, query, limit=20):
+        pass
+
+    @abstractmethod
+    def get_task_stats(self, user_id, days=7):
+        pass
+
+    @abstractmethod
+    def export_tasks(self, user_id, batch_size=1000):
+        pass
+
+    @abstractmethod
+    def update_task(self, user_id, task_id, title=None, description=None, is_completed=None):
+        pass
+
+    @abstractmethod
+    def patch_task(self, user_id, task_id, changes):
+        pass
+
+    @abstractmethod
+    def update_tasks(self, user_id, is_completed, task_ids=None, filters=None):
         pass
 
     @abstractmethod
     def delete_task(self, task_id):
+        pass
+
+    @abstractmethod
+    def delete_task_by_id(self, user_id, task_id):
+        pass
+
+    @abstractmethod
+    def delete_tasks(self, user_id, task_ids=None, filters=None):
         pass
\ No newline at end of file
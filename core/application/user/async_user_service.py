@@ -0,0 +1,133 @@
+import asyncio
+from uuid import uuid4
+
+from .async_user_service_interface import AsyncUserServiceInterface
+from .user_service import UserService
+
+from ...infrastructure.security.password_hasher import PasswordHasher
+from ...exceptions.not_found_error import NotFoundError
+from ...exceptions.database_error import DatabaseError
+from ...exceptions.duplicate_error import DuplicateError
+from ...exceptions.service_unavailable_error import ServiceUnavailableError
+
+
+class AsyncUserService(AsyncUserServiceInterface):
+    # asyncio version of UserService's login, registration and lookup for
+    # the ASGI app; results have the same shape. Password hashing is CPU
+    # bound, so it is awaited in a thread (which itself waits on the
+    # PasswordHasher process pool) instead of running on the event loop.
+
+    _create_tokens = UserService._create_tokens
+    _refresh_expires_at = UserService._refresh_expires_at
+
+    def __init__(self, user_repository, refresh_token_repository, password_hasher=None, login_throttle=None):
+        self.user_repository = user_repository
+        self.refresh_token_repository = refresh_token_repository
+        self.password_hasher = password_hasher or PasswordHasher()
+        self.login_throttle = login_throttle
+
+    async def get_user_by_id(self, user_id: int):
+        try:
+            user = await self.user_repository.get_user_by_id(user_id)
+            user_data = {
+                "id": user.id,
+                "username": user.username,
+                "email": user.email
+            }
+            return {"success": True, "data": user_data}
+
+        except NotFoundError as e:
+            return {"success": False, "error": "not_found", "message": e.message}
+
+        except DatabaseError as e:
+            return {"success": False, "error": "database_error", "message": e.message}
+
+        except Exception:
+            return {"success": False, "error": "unknown_error", "message": "Unknown error occurred."}
+
+
+    async def login_user(self, username: str, password: str, client_ip: str = None):
+        throttle_keys = (f"user:{username.lower()}", f"ip:{client_ip}" if client_ip else None)
+
+        if self.login_throttle:
+            retry_after = self.login_throttle.retry_after(*throttle_keys)
+            if retry_after:
+                return {
+                    "success": False,
+                    "error": "throttled",
+                    "message": "Too many failed login attempts. Try again later.",
+                    "retry_after": retry_after
+                }
+
+        invalid = {
+            "success": False,
+            "error": "invalid_credentials",
+            "message": "Invalid username or password"
+        }
+
+        try:
+            user = await self.user_repository.login_user(username)
+
+            if user and await asyncio.to_thread(self.password_hasher.verify, user.password_hash, password):
+                await self._rehash_if_needed(user, password)
+                if self.login_throttle:
+                    self.login_throttle.record_success(throttle_keys[0])
+                family_id, jti = str(uuid4()), str(uuid4())
+                await self.refresh_token_repository.create_token(jti, family_id, user.id, self._refresh_expires_at())
+                return {"success": True, **self._create_tokens(user.id, user.username, family_id, jti)}
+
+            self._record_login_failure(throttle_keys)
+            return invalid
+
+        except NotFoundError:
+            self._record_login_failure(throttle_keys)
+            return invalid
+
+        except ServiceUnavailableError as e:
+            return {"success": False, "error": "service_unavailable", "message": e.message, "retry_after": e.retry_after}
+
+        except DatabaseError as e:
+            return {"success": False, "error": "database_error", "message": e.message}
+
+        except Exception:
+            return {"success": False, "error": "unknown_error", "message": "Unknown error occurred."}
+
+
+    async def register_user(self, username: str, password: str, email: str):
+        try:
+            password_hash = await asyncio.to_thread(self.password_hasher.hash, password)
+            user = await self.user_repository.register_user(username, password_hash, email)
+            user_data = {
+                "id": user.id,
+                "username": user.username,
+                "email": user.email
+            }
+            return {"success": True, "data": user_data}
+
+        except DuplicateError as e:
+            return {"success": False, "error": "duplicate", "message": e.message}
+
+        except ServiceUnavailableError as e:
+            return {"success": False, "error": "service_unavailable", "message": e.message, "retry_after": e.retry_after}
+
+        except DatabaseError as e:
+            return {"success": False, "error": "database_error", "message": e.message}
+
+        except Exception:
+            return {"success": False, "error": "unknown_error", "message": "Unknown error occurred."}
+
+
+    async def _rehash_if_needed(self, user, password: str):
+        if not self.password_hasher.needs_rehash(user.password_hash):
+            return
+
+        try:
+            password_hash = await asyncio.to_thread(self.password_hasher.hash, password)
+            await self.user_repository.update_password_hash(user.id, password_hash)
+        except (ServiceUnavailableError, DatabaseError):
+            pass
+
+
+    def _record_login_failure(self, throttle_keys):
+        if self.login_throttle:
+            self.login_throttle.record_failure(*throttle_keys)
\ No newline at end of file
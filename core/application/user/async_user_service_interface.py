@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+
+class AsyncUserServiceInterface(ABC):
+    @abstractmethod
+    async def get_user_by_id(self, user_id: int):
+        pass
+    
+    @abstractmethod
+    async def login_user(self, username: str, password: str, client_ip: str = None):
+        pass
+
+    @abstractmethod
+    async def register_user(self, username: str, password: str, email: str):
+        pass
\ No newline at end of file
@@ -1,16 +1,27 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
 from .user_service_interface import UserServiceInterface
-from flask_jwt_extended import create_access_token, unset_jwt_cookies
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import current_app
+from flask_jwt_extended import create_access_token, create_refresh_token, unset_jwt_cookies
 from werkzeug.exceptions import BadRequest as BadRequestError
 
+from ...infrastructure.security.password_hasher import PasswordHasher
+from ...infrastructure.token.refresh_token_repository import RefreshTokenRepository
 from ...exceptions.not_found_error import NotFoundError
 from ...exceptions.database_error import DatabaseError
 from ...exceptions.duplicate_error import DuplicateError
+from ...exceptions.service_unavailable_error import ServiceUnavailableError
 
 
 class UserService(UserServiceInterface):
-    def __init__(self, user_repository):
+    def __init__(self, user_repository, password_hasher=None, login_throttle=None,
+                 refresh_token_repository=None, token_blocklist=None):
         self.user_repository = user_repository
+        self.password_hasher = password_hasher or PasswordHasher()
+        self.login_throttle = login_throttle
+        self.refresh_token_repository = refresh_token_repository or RefreshTokenRepository()
+        self.token_blocklist = token_blocklist
 
     def get_user_by_id(self, user_id: int):
         try:
@@ -32,14 +43,35 @@ class UserService(UserServiceInterface):
             return {"success": False, "error": "unknown_error", "message": "Unknown error occurred."}
 
 
-    def login_user(self, username: str, password: str):
+    def login_user(self, username: str, password: str, client_ip: str = None):
+        throttle_keys = (f"user:{username.lower()}", f"ip:{client_ip}" if client_ip else None)
+
+        # Checked before any database or hashing work so that credential
+        # stuffing bursts are rejected without burning CPU.
+        if self.login_throttle:
+            retry_after = self.login_throttle.retry_after(*throttle_keys)
+            if retry_after:
+                return {
+                    "success": False,
+                    "error": "throttled",
+                    "message": "Too many failed login attempts. Try again later.",
+                    "retry_after": retry_after
+                }
+
         try:
             user = self.user_repository.login_user(username)
 
-            if user and check_password_hash(user.password_hash, password):
-                token = create_access_token(identity=user.username)
-                return {"success": True, "access_token": token}
-
+            if user and self.password_hasher.verify(user.password_hash, password):
+                self._rehash_if_needed(user, password)
+                if self.login_throttle:
+                    self.login_throttle.record_success(throttle_keys[0])
+                # Each login starts a new refresh token family; rotations
+                # stay in it so that a replayed token can revoke them all.
+                family_id, jti = str(uuid4()), str(uuid4())
+                self.refresh_token_repository.create_token(jti, family_id, user.id, self._refresh_expires_at())
+                return {"success": True, **self._create_tokens(user.id, user.username, family_id, jti)}
+
+            self._record_login_failure(throttle_keys)
             return {
                 "success": False,
                 "error": "invalid_credentials",
@@ -47,12 +79,16 @@ class UserService(UserServiceInterface):
             }
 
         except NotFoundError:
+            self._record_login_failure(throttle_keys)
             return {
                 "success": False,
                 "error": "invalid_credentials",
                 "message": "Invalid username or password"
             }
 
+        except ServiceUnavailableError as e:
+            return {"success": False, "error": "service_unavailable", "message": e.message, "retry_after": e.retry_after}
+
         except DatabaseError as e:
             return {"success": False, "error": "database_error", "message": e.message}
 
@@ -62,7 +98,7 @@ class UserService(UserServiceInterface):
 
     def register_user(self, username: str, password: str, email: str):
         try:
-            password_hash = generate_password_hash(password)
+            password_hash = self.password_hasher.hash(password)
             user = self.user_repository.register_user(username, password_hash, email)
             user_data = {
                 "id": user.id,
@@ -74,6 +110,9 @@ class UserService(UserServiceInterface):
         except DuplicateError as e:
             return {"success": False, "error": "duplicate", "message": e.message}
 
+        except ServiceUnavailableError as e:
+            return {"success": False, "error": "service_unavailable", "message": e.message, "retry_after": e.retry_after}
+
         except DatabaseError as e:
             return {"success": False, "error": "database_error", "message": e.message}
 
@@ -81,12 +120,85 @@ class UserService(UserServiceInterface):
             return {"success": False, "error": "unknown_error", "message": "Unknown error occurred."}
 
 
-    def logout_user(self):
+    def refresh_access_token(self, claims: dict):
+        invalid = {
+            "success": False,
+            "error": "invalid_refresh_token",
+            "message": "Refresh token is no longer valid. Please login again."
+        }
+
         try:
+            family_id = claims.get("fam")
+            user_id = claims.get("uid")
+            if not family_id or user_id is None:
+                return invalid
+
+            new_jti = str(uuid4())
+            if self.refresh_token_repository.rotate_token(claims["jti"], new_jti, self._refresh_expires_at()):
+                return {"success": True, **self._create_tokens(user_id, claims["sub"], family_id, new_jti)}
+
+            # The token was already rotated (or revoked): somebody is replaying
+            # it, so every token descended from the same login is revoked.
+            self.refresh_token_repository.revoke_family(family_id)
+            return invalid
+
+        except DatabaseError as e:
+            return {"success": False, "error": "database_error", "message": e.message}
+
+        except Exception:
+            return {"success": False, "error": "unknown_error", "message": "Unknown error occurred."}
+
+
+    def logout_user(self, claims: dict = None):
+        try:
+            if claims and self.token_blocklist:
+                expires_at = datetime.fromtimestamp(claims["exp"], timezone.utc).replace(tzinfo=None)
+                self.token_blocklist.revoke(claims["jti"], expires_at)
+                # Also end the refresh token family so the session cannot
+                # be renewed with the refresh token.
+                if claims.get("fam"):
+                    self.refresh_token_repository.revoke_family(claims["fam"])
             return {"success": True, "message": "Logout successful"}
 
         except BadRequestError as e:
             return {"success": False, "error": "bad_request", "message": str(e)}
 
+        except DatabaseError as e:
+            return {"success": False, "error": "database_error", "message": e.message}
+
         except Exception:
             return {"success": False, "error": "unknown_error", "message": "Unknown error occurred."}
+
+
+    def _rehash_if_needed(self, user, password: str):
+        # Upgrade hashes made with older cost parameters while the plaintext
+        # is at hand. Best effort: a failure here must not fail the login.
+        if not self.password_hasher.needs_rehash(user.password_hash):
+            return
+
+        try:
+            password_hash = self.password_hasher.hash(password)
+            self.user_repository.update_password_hash(user.id, password_hash)
+        except (ServiceUnavailableError, DatabaseError):
+            pass
+
+
+    def _record_login_failure(self, throttle_keys):
+        if self.login_throttle:
+            self.login_throttle.record_failure(*throttle_keys)
+
+
+    def _create_tokens(self, user_id: int, username: str, family_id: str, refresh_jti: str):
+        claims = {"uid": user_id, "fam": family_id}
+        return {
+            "access_token": create_access_token(identity=username, additional_claims=claims),
+            "refresh_token": create_refresh_token(
+                identity=username,
+                additional_claims={**claims, "jti": refresh_jti}
+            )
+        }
+
+
+    def _refresh_expires_at(self):
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return now + current_app.config["JWT_REFRESH_TOKEN_EXPIRES"]
\ No newline at end of file
@@ -6,7 +6,7 @@ class UserServiceInterface(ABC):
         pass
     
     @abstractmethod
-    def login_user(self, username: str, password: str):
+    def login_user(self, username: str, password: str, client_ip: str = None):
         pass
 
     @abstractmethod
@@ -14,5 +14,9 @@ class UserServiceInterface(ABC):
         pass
 
     @abstractmethod
-    def logout_user(self):
+    def refresh_access_token(self, claims: dict):
+        pass
+
+    @abstractmethod
+    def logout_user(self, claims: dict = None):
         pass
\ No newline at end of file
@@ -1,4 +1,6 @@
+import hashlib
 import os
+import tempfile
 from datetime import timedelta
 
 # Only load .env file in local development (Vercel provides env vars directly)
@@ -10,14 +12,164 @@ except:
 
 class BaseConfig:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Database connection pool of each process and engine (see
+    # core/config/pool.py). 'queue' keeps up to POOL_SIZE + MAX_OVERFLOW
+    # connections; 'null' opens one per checkout (serverless). Checkout
+    # waits, usage and timeouts are shown at /api/v1/admin/pools.
+    DATABASE_POOL = 'queue'
+    DATABASE_POOL_SIZE = 5
+    DATABASE_MAX_OVERFLOW = 2
+    DATABASE_POOL_TIMEOUT = 30
+    DATABASE_POOL_RECYCLE = 3600
+
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
     JWT_TOKEN_LOCATION = ["headers"]
     JWT_COOKIE_SECURE = False
     JWT_HEADER_NAME = "Authorization"              
     JWT_HEADER_TYPE = "Bearer"    
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
+    # Refresh tokens are single use: /auth/refresh swaps one for a new pair.
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+    # Revoked token ids live in the database; each worker mirrors them in a
+    # Bloom filter so unrevoked tokens are accepted without a query.
+    # Revocations made by other workers are picked up every SYNC_INTERVAL s.
+    TOKEN_BLOCKLIST_CAPACITY = int(os.getenv('TOKEN_BLOCKLIST_CAPACITY', 100000))
+    TOKEN_BLOCKLIST_ERROR_RATE = 0.001
+    TOKEN_BLOCKLIST_SYNC_INTERVAL = 5
+    # Verified claims are cached per token digest until the token expires.
+    JWT_CLAIMS_CACHE_ENABLED = os.getenv('JWT_CLAIMS_CACHE_ENABLED', 'True').lower() == 'true'
+    JWT_CLAIMS_CACHE_MAX_ENTRIES = int(os.getenv('JWT_CLAIMS_CACHE_MAX_ENTRIES', 10000))
+    JWT_CLAIMS_CACHE_MAX_TTL = 3600
     APP_NAME = os.getenv('APP_NAME', 'Task Management System')
+
+    # Task list pagination
+    TASK_PAGE_SIZE_DEFAULT = 50
+    TASK_PAGE_SIZE_MAX = 200
+    TASK_EXPORT_BATCH_SIZE = 1000
+    TASK_BULK_MAX_ITEMS = 1000
+    # Largest request body accepted (413 beyond), under WSGI and ASGI alike;
+    # room for a full bulk create with long descriptions.
+    MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 4 * 1024 * 1024))
+    TASK_BULK_MAX_IDS = 1000
+
+    # Read-through task cache (per worker process)
+    TASK_CACHE_ENABLED = os.getenv('TASK_CACHE_ENABLED', 'False').lower() == 'true'
+    TASK_CACHE_MAX_ENTRIES = int(os.getenv('TASK_CACHE_MAX_ENTRIES', 10000))
+    TASK_CACHE_TTL = int(os.getenv('TASK_CACHE_TTL', 30))
+
+    # In-memory full-text index over task titles and descriptions (per
+    # worker, built from the database at startup). Task writes are logged in
+    # task_changes; before a search each worker applies the changes logged
+    # since its last sync, at most every SYNC_INTERVAL seconds. Changes are
+    # kept for CHANGE_RETENTION seconds; a worker that has not synced for
+    # half that long builds its index again. Search falls back to a LIKE
+    # scan while the index is not built.
+    TASK_SEARCH_INDEX_ENABLED = os.getenv('TASK_SEARCH_INDEX_ENABLED', 'True').lower() == 'true'
+    TASK_SEARCH_SYNC_INTERVAL = float(os.getenv('TASK_SEARCH_SYNC_INTERVAL', 1))
+    TASK_SEARCH_CHANGE_RETENTION = int(os.getenv('TASK_SEARCH_CHANGE_RETENTION', 86400))
+    TASK_SEARCH_LIMIT_DEFAULT = 20
+    TASK_SEARCH_LIMIT_MAX = 100
+
+    # Read replicas (set per environment below). get_one_task, list_task(_page),
+    # get_user_by_id and login_user read from one of them, picked
+    # 'round_robin' or 'least_loaded'; every other query, and any read after
+    # a write in the same request, uses the primary.
+    SQLALCHEMY_REPLICA_URIS = []
+    SQLALCHEMY_REPLICA_STRATEGY = os.getenv('SQLALCHEMY_REPLICA_STRATEGY', 'round_robin')
+
+    # ASGI deployment (asgi.py): task and login requests run on asyncio
+    # repositories; other routes run the Flask app in WSGI_THREADS threads.
+    # ASYNC_DATABASE_URI defaults to the database URI with an asyncio driver.
+    ASYNC_DATABASE_URI = os.getenv('ASYNC_DATABASE_URI')
+    ASYNC_DATABASE_POOL_SIZE = int(os.getenv('ASYNC_DATABASE_POOL_SIZE', 20))
+    ASYNC_DATABASE_MAX_OVERFLOW = int(os.getenv('ASYNC_DATABASE_MAX_OVERFLOW', 10))
+    ASGI_WSGI_THREADS = int(os.getenv('ASGI_WSGI_THREADS', 8))
+
+    # Number of days of "created per day" counts shown on the dashboard.
+    DASHBOARD_STATS_DAYS = 7
     
+    # Password hashing runs in a process pool of up to WORKERS processes in
+    # each server worker, started as needed. The bound is per host: when
+    # WORKERS + QUEUE_SIZE hashes are already pending across all server
+    # workers (one lock file per slot in SLOTS_DIR), logins get a 503, so
+    # adding server workers does not multiply the hashing load. Changing
+    # METHOD upgrades stored hashes on the users' next login.
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    PASSWORD_HASH_QUEUE_SIZE = int(os.getenv('PASSWORD_HASH_QUEUE_SIZE', 16))
+    PASSWORD_HASH_SLOTS_DIR = os.getenv(
+        'PASSWORD_HASH_SLOTS_DIR',
+        os.path.join(tempfile.gettempdir(), 'task-api-password-hash'),
+    )
+    PASSWORD_HASH_TIMEOUT = 10
+
+    # Failed logins per username and per IP back off exponentially. The
+    # tracker is a fixed-size table shared by all workers on the host.
+    LOGIN_THROTTLE_PATH = os.getenv(
+        'LOGIN_THROTTLE_PATH',
+        os.path.join(tempfile.gettempdir(), 'task-api-login-throttle'),
+    )
+    LOGIN_THROTTLE_SLOTS = int(os.getenv('LOGIN_THROTTLE_SLOTS', 65536))
+    LOGIN_THROTTLE_THRESHOLD = 5
+    LOGIN_THROTTLE_HALF_LIFE = 300
+    LOGIN_THROTTLE_MAX_DELAY = 900
+
+    # Rate limiting: counters are kept in a memory-mapped file so that every
+    # worker on the host enforces the same limits (use a tmpfs path such as
+    # /dev/shm in production).
+    RATELIMIT_STORAGE_URI = os.getenv(
+        'RATELIMIT_STORAGE_URI',
+        'shm://' + os.path.join(tempfile.gettempdir(), 'task-api-ratelimit'),
+    )
+    RATELIMIT_STORAGE_OPTIONS = {'slots': int(os.getenv('RATELIMIT_SLOTS', 65536))}
+    # GCRA keeps one fixed-size record per key and limit; idle keys expire
+    # on their own and the table evicts the oldest entries when full. Unset,
+    # it is used when the storage supports it (shm://) and fixed-window
+    # otherwise (memory://, redis://, ...).
+    RATELIMIT_STRATEGY = os.getenv('RATELIMIT_STRATEGY')
+    # Token budgets per API namespace. Routes consume the cost declared with
+    # @rate_cost (1 by default), so expensive calls drain budgets faster.
+    RATELIMIT_NAMESPACE_LIMITS = {
+        'tasks': '300 per minute; 5000 per hour',
+        'auth': '30 per minute; 300 per hour',
+        'dashboard': '60 per minute',
+        'admin': '60 per minute',
+    }
+
+    # Admission control for the task and auth namespaces: each worker runs at
+    # most LIMIT of their requests at once and answers the rest right away
+    # with 503 + Retry-After instead of letting them queue for a database
+    # connection. LIMIT adapts within MIN..MAX: x BACKOFF when a request is
+    # slower than its namespace's latency target (seconds), growing again
+    # while requests are fast.
+    ADMISSION_CONTROL_ENABLED = os.getenv('ADMISSION_CONTROL_ENABLED', 'True').lower() == 'true'
+    ADMISSION_INITIAL_LIMIT = int(os.getenv('ADMISSION_INITIAL_LIMIT', 20))
+    ADMISSION_MIN_LIMIT = 1
+    ADMISSION_MAX_LIMIT = int(os.getenv('ADMISSION_MAX_LIMIT', 200))
+    ADMISSION_BACKOFF = 0.9
+    ADMISSION_LATENCY_TARGETS = {
+        'tasks': 0.25,
+        'auth': 1.0,
+    }
+    ADMISSION_RETRY_AFTER = 1
+
+    # Prometheus metrics at /metrics. Every worker records into its own
+    # memory-mapped file under METRICS_DIR and a scrape sums the files, so
+    # the numbers cover all workers on the host (use a tmpfs path such as
+    # /dev/shm). Files of exited workers are folded into one archive file.
+    # The default directory is named after the install path, so that two
+    # deployments on one host do not add up each other's series.
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+    METRICS_DIR = os.getenv('METRICS_DIR', os.path.join(
+        tempfile.gettempdir(),
+        'task-api-metrics-' + hashlib.sha1(os.path.abspath(__file__).encode()).hexdigest()[:12],
+    ))
+    METRICS_FILE_SIZE = int(os.getenv('METRICS_FILE_SIZE', 1024 * 1024))
+
+    # Usernames allowed to call the /api/v1/admin endpoints.
+    ADMIN_USERNAMES = [name for name in os.getenv('ADMIN_USERNAMES', '').split(',') if name]
+
     # Swagger UI Configuration
     RESTX_MASK_SWAGGER = False
     SWAGGER_UI_DOC_EXPANSION = 'list'  # 'none', 'list', or 'full'
@@ -29,15 +181,51 @@ class BaseConfig:
         'indent': 2,
         'sort_keys': False,
     }
+    # Task responses are serialized by a serializer compiled from the restx
+    # model instead of marshal_with; output and Swagger docs are the same.
+    COMPILED_SERIALIZER_ENABLED = os.getenv('COMPILED_SERIALIZER_ENABLED', 'True').lower() == 'true'
+
+    # Response compression (gzip, or brotli when the optional brotli package
+    # is installed), negotiated through Accept-Encoding.
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'True').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 500))
+    COMPRESS_LEVEL = 6
+    COMPRESS_BROTLI_QUALITY = 4
+    COMPRESS_STREAM_FLUSH_SIZE = 16 * 1024
 
 class DevelopmentConfig(BaseConfig):
     SQLALCHEMY_DATABASE_URI = os.getenv('DEV_DB')
+    SQLALCHEMY_REPLICA_URIS = [uri for uri in os.getenv('DEV_REPLICA_DBS', '').split(',') if uri]
+    # A single development server rarely needs more than a couple.
+    DATABASE_POOL_SIZE = 2
     DEBUG=os.getenv('DEBUG')
 
 class TestingConfig(BaseConfig):
     SQLALCHEMY_DATABASE_URI = os.getenv('TESTING_DB')
+    SQLALCHEMY_REPLICA_URIS = [uri for uri in os.getenv('TESTING_REPLICA_DBS', '').split(',') if uri]
+    # No connections kept open between tests.
+    DATABASE_POOL = 'null'
     DEBUG=os.getenv('DEBUG')
 
 class ProductionConfig(BaseConfig):
     SQLALCHEMY_DATABASE_URI = os.getenv('PROD_DB')
-    DEBUG=os.getenv('DEBUG')
\ No newline at end of file
+    SQLALCHEMY_REPLICA_URIS = [uri for uri in os.getenv('PROD_REPLICA_DBS', '').split(',') if uri]
+    DATABASE_POOL = os.getenv('DATABASE_POOL', 'queue')
+    DATABASE_POOL_SIZE = int(os.getenv('DATABASE_POOL_SIZE', 5))
+    DATABASE_MAX_OVERFLOW = int(os.getenv('DATABASE_MAX_OVERFLOW', 2))
+    # Short, so that a request that cannot get a connection fails (and
+    # counts as overload for admission control) instead of queueing.
+    DATABASE_POOL_TIMEOUT = int(os.getenv('DATABASE_POOL_TIMEOUT', 5))
+    # Parsed so that DEBUG=False really disables debug mode (flask-restx
+    # pretty-prints every response in debug mode).
+    DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
+    # Compact JSON: no indentation or spaces after separators.
+    RESTX_JSON = {
+        'separators': (',', ':'),
+        'sort_keys': False,
+    }
+
+class ServerlessConfig(ProductionConfig):
+    # Vercel functions (app.py): an instance can be frozen or dropped at any
+    # time, so connections are not pooled.
+    DATABASE_POOL = 'null'
\ No newline at end of file
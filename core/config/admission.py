@@ -0,0 +1,117 @@
+import os
+
+from flask import g, request
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from ..infrastructure.ratelimit.adaptive_concurrency import AdaptiveConcurrencyLimit
+
+
+class AdmissionControl:
+    """Fast-fail load shedding in front of database-bound API namespaces.
+
+    ``init_app(app, namespaces)`` gives each ``{scope: Namespace}`` pair an
+    :class:`AdaptiveConcurrencyLimit` in every worker process. A request to
+    one of the namespace's resources is admitted in ``before_request`` or
+    answered at once with 503 and ``Retry-After``. Its latency is fed back
+    when it ends: in ``after_request``, or when the server closes the body
+    of a streamed response, which may still be running queries. A request
+    that fails with a pool checkout timeout counts as overload.
+
+    Pool checkout timeouts get the same 503 and ``Retry-After`` answer as
+    rejected requests in every route, also with admission control disabled.
+
+    The limit counts concurrent requests of one process, so it sheds load
+    in the ASGI app and threaded workers. A gunicorn sync worker only ever
+    runs one request and the excess waits in the listen backlog, out of the
+    app's reach; there only the pool timeout bounds the wait.
+    """
+
+    def __init__(self, app=None, namespaces=None):
+        if app is not None:
+            self.init_app(app, namespaces)
+
+    def init_app(self, app, namespaces):
+        config = app.config
+
+        def busy():
+            return (
+                {'message': "The server is busy. Please retry shortly."},
+                503,
+                {'Retry-After': str(config['ADMISSION_RETRY_AFTER'])},
+            )
+
+        def pool_timeout(error):
+            # Handled, the request skips teardown's exception, so report the
+            # overload here.
+            admission = g.pop('admission', None)
+            if admission:
+                limit, started = admission
+                limit.release(started, dropped=True)
+            return busy()
+
+        # flask-restx handles the exceptions of its resources itself.
+        app.register_error_handler(PoolTimeoutError, pool_timeout)
+        for api in {api for namespace in namespaces.values() for api in namespace.apis}:
+            api.errorhandler(PoolTimeoutError)(pool_timeout)
+
+        if not config['ADMISSION_CONTROL_ENABLED']:
+            return
+
+        limits = {}
+        scopes = {}
+        for scope, namespace in namespaces.items():
+            limits[scope] = AdaptiveConcurrencyLimit(
+                initial=config['ADMISSION_INITIAL_LIMIT'],
+                minimum=config['ADMISSION_MIN_LIMIT'],
+                maximum=config['ADMISSION_MAX_LIMIT'],
+                latency_target=config['ADMISSION_LATENCY_TARGETS'][scope],
+                backoff=config['ADMISSION_BACKOFF'],
+            )
+            for route in namespace.resources:
+                scopes[route.resource] = scope
+        app.extensions['admission'] = limits
+
+        @app.before_request
+        def admit():
+            view = app.view_functions.get(request.endpoint)
+            scope = scopes.get(getattr(view, 'view_class', None))
+            if scope is None:
+                return None
+
+            started = limits[scope].try_acquire()
+            if started is None:
+                # Answered here rather than raised: the API logs a traceback
+                # for every 5xx exception, too costly for load shedding.
+                return busy()
+            g.admission = (limits[scope], started)
+            return None
+
+        @app.after_request
+        def release(response):
+            admission = g.pop('admission', None)
+            if admission:
+                limit, started = admission
+                if response.is_streamed:
+                    response.call_on_close(lambda: limit.release(started))
+                else:
+                    limit.release(started)
+            return response
+
+        @app.teardown_request
+        def release_on_error(exc):
+            # Only requests that ended in an unhandled exception get here
+            # still admitted; pool timeouts were released by pool_timeout.
+            admission = g.pop('admission', None)
+            if admission:
+                limit, started = admission
+                limit.release(started)
+
+    @staticmethod
+    def snapshot(app):
+        return {
+            'pid': os.getpid(),
+            'scopes': [
+                {'scope': scope, **limit.snapshot()}
+                for scope, limit in app.extensions.get('admission', {}).items()
+            ],
+        }
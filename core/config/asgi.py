@@ -0,0 +1,222 @@
+import asyncio
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import request
+from flask_restx.utils import unpack
+from werkzeug.exceptions import HTTPException
+from werkzeug.wrappers import Response
+
+
+class AsgiApplication:
+    """Serve the Flask app over ASGI, with some routes handled natively.
+
+    ``routes`` maps ``(resource class, HTTP method)`` to a coroutine
+    function (see ``core.routes.native``). A request for one of them runs
+    the Flask request lifecycle on the event loop (request context, before
+    and after request hooks, error handlers, flask-restx response
+    representation) around the awaited handler, so while it waits for the
+    database the loop keeps serving other requests.
+
+    Every other request is handed to the regular WSGI app in a pool of
+    ``wsgi_threads`` threads, so those endpoints behave exactly like under
+    gunicorn. Streamed responses are sent chunk by chunk.
+
+    The JWT blocklist check still runs synchronously; it only reaches the
+    database when the Bloom filter reports a possible match or needs to
+    sync.
+    """
+
+    def __init__(self, app, api, routes, database, wsgi_threads=8):
+        self.app = app
+        self.api = api
+        self.routes = routes
+        self.database = database
+        self._executor = ThreadPoolExecutor(max_workers=wsgi_threads, thread_name_prefix='wsgi')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+        body = await self._read_body(scope, receive, self.app.config['MAX_CONTENT_LENGTH'])
+        if body is None:
+            await self._send_too_large(send)
+            return
+        environ = self._environ(scope, body)
+        handler = self._native_handler(environ)
+        if handler is None:
+            await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._run_wsgi, environ, send, asyncio.get_running_loop()
+            )
+        else:
+            await self._send_response(await self._run_native(handler, environ), environ, send)
+
+    def _native_handler(self, environ):
+        try:
+            rule, _ = self.app.url_map.bind_to_environ(environ).match(return_rule=True)
+        except HTTPException:
+            # Not found, wrong method or a redirect: let Flask answer.
+            return None
+        view = self.app.view_functions.get(rule.endpoint)
+        resource = getattr(view, 'view_class', None)
+        return self.routes.get((resource, environ['REQUEST_METHOD']))
+
+    async def _run_native(self, handler, environ):
+        # Mirrors Flask.wsgi_app and full_dispatch_request with an awaited
+        # view: exceptions go through the API's error handlers, and those it
+        # cannot handle become a 500 from Flask.handle_exception.
+        ctx = self.app.request_context(environ)
+        error = None
+        ctx.push()
+        try:
+            try:
+                rv = self.app.preprocess_request()
+                if rv is None:
+                    rv = await handler(**request.view_args)
+                    if not isinstance(rv, Response):
+                        data, code, headers = unpack(rv)
+                        rv = self.api.make_response(data, code, headers=headers)
+            except Exception as e:
+                rv = self.app.handle_user_exception(e)
+            return self.app.finalize_request(rv)
+        except Exception as e:
+            error = e
+            return self.app.handle_exception(e)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            ctx.pop(error)
+
+    @staticmethod
+    async def _send_response(response, environ, send):
+        # get_wsgi_response drops the body of HEAD, 204 and 304 responses
+        # and fixes up the headers, as the WSGI server path does.
+        app_iter, status, headers = response.get_wsgi_response(environ)
+        try:
+            body = b''.join(app_iter)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+        await send({
+            'type': 'http.response.start',
+            'status': int(status.split(' ', 1)[0]),
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    def _run_wsgi(self, environ, send, loop):
+        # Runs in a pool thread; each message is sent on the event loop and
+        # waited for, so a slow client applies backpressure to the stream.
+        def send_message(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and started.get('sent'):
+                raise exc_info[1].with_traceback(exc_info[2])
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+
+        def send_start():
+            if not started.get('sent'):
+                send_message({'type': 'http.response.start', 'status': started['status'], 'headers': started['headers']})
+                started['sent'] = True
+
+        result = self.app(environ, start_response)
+        try:
+            for chunk in result:
+                if chunk:
+                    send_start()
+                    send_message({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            send_start()
+            send_message({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.database.dispose()
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    async def _read_body(scope, receive, max_length=None):
+        # None when the body is longer than max_length (MAX_CONTENT_LENGTH),
+        # known from Content-Length or once that much has been received.
+        if max_length is not None:
+            for name, value in scope['headers']:
+                if name == b'content-length' and value.isdigit() and int(value) > max_length:
+                    return None
+        chunks = []
+        received = 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                break
+            chunk = message.get('body', b'')
+            received += len(chunk)
+            if max_length is not None and received > max_length:
+                return None
+            chunks.append(chunk)
+            if not message.get('more_body'):
+                break
+        return b''.join(chunks)
+
+    @staticmethod
+    async def _send_too_large(send):
+        # Answered without Flask: the rest of the body is never read.
+        body = b'{"message": "The request body is too large."}\n'
+        await send({
+            'type': 'http.response.start',
+            'status': 413,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode('latin-1')),
+                (b'connection', b'close'),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    @staticmethod
+    def _environ(scope, body):
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+            'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope['query_string'].decode('latin-1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'REMOTE_ADDR': client[0],
+            'REMOTE_PORT': str(client[1]),
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+        }
+        for name, value in scope['headers']:
+            name = name.decode('latin-1')
+            value = value.decode('latin-1')
+            if name == 'content-length':
+                continue
+            key = 'CONTENT_TYPE' if name == 'content-type' else 'HTTP_' + name.upper().replace('-', '_')
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+        return environ
@@ -0,0 +1,88 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from .pool import pool_options
+from .replica import REPLICA_BIND_PREFIX, AsyncRoutingSession, ReplicaPool
+
+# asyncio driver used for each backend when ASYNC_DATABASE_URI is not set.
+ASYNC_DRIVERS = {
+    "mysql": "aiomysql",
+    "mariadb": "aiomysql",
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+class AsyncDatabase:
+    """SQLAlchemy asyncio engine and session factory for the ASGI app.
+
+    It uses the same database as ``db``. The URL is ``ASYNC_DATABASE_URI``,
+    or else ``SQLALCHEMY_DATABASE_URI`` with its driver swapped for the
+    asyncio driver in :data:`ASYNC_DRIVERS`. Engine options are the same as
+    the sync engine's, with a queue pool sized by ``ASYNC_DATABASE_POOL_SIZE``
+    and ``ASYNC_DATABASE_MAX_OVERFLOW``: a single event loop serves many
+    more concurrent requests than a sync worker.
+
+    ``SQLALCHEMY_REPLICA_URIS`` get an engine each, with the asyncio driver,
+    and reads are routed to them as for ``db`` (see ``ReplicaPool``).
+    """
+
+    def __init__(self, engine_options=None):
+        self.engine_options = engine_options or {}
+        self.engine = None
+        self.replica_engines = {}
+        self.session_factory = None
+
+    def init_app(self, app):
+        config = app.config
+        options = {
+            **self.engine_options,
+            **config.get('SQLALCHEMY_ENGINE_OPTIONS', {}),
+            **pool_options(
+                config, config['ASYNC_DATABASE_POOL_SIZE'], config['ASYNC_DATABASE_MAX_OVERFLOW'], asyncio=True
+            ),
+        }
+        self.engine = create_async_engine(self.async_url(config), **options)
+        self.replica_engines = {
+            f"{REPLICA_BIND_PREFIX}{index}": create_async_engine(self.with_async_driver(uri), **options)
+            for index, uri in enumerate(config.get('SQLALCHEMY_REPLICA_URIS') or [])
+        }
+        info = {}
+        if self.replica_engines:
+            info = {
+                'replicas': ReplicaPool(self.replica_engines, config['SQLALCHEMY_REPLICA_STRATEGY']),
+                'replica_engines': {key: engine.sync_engine for key, engine in self.replica_engines.items()},
+            }
+        # Objects stay readable after commit; they are serialized after the
+        # session is closed.
+        self.session_factory = async_sessionmaker(
+            self.engine,
+            class_=AsyncSession,
+            sync_session_class=AsyncRoutingSession,
+            expire_on_commit=False,
+            info=info,
+        )
+        app.extensions['async_database'] = self
+
+    def session(self):
+        return self.session_factory()
+
+    async def dispose(self):
+        if self.engine is not None:
+            await self.engine.dispose()
+        for engine in self.replica_engines.values():
+            await engine.dispose()
+
+    @classmethod
+    def async_url(cls, config):
+        if config.get('ASYNC_DATABASE_URI'):
+            return config['ASYNC_DATABASE_URI']
+        return cls.with_async_driver(config['SQLALCHEMY_DATABASE_URI'])
+
+    @staticmethod
+    def with_async_driver(uri):
+        url = make_url(uri)
+        backend = url.get_backend_name()
+        if backend not in ASYNC_DRIVERS:
+            raise ValueError(f"No asyncio driver known for {backend}; set ASYNC_DATABASE_URI")
+        return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
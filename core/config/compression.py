@@ -0,0 +1,108 @@
+import gzip
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class ResponseCompression:
+    """Compress responses according to the client's ``Accept-Encoding``.
+
+    Brotli is used when the optional ``brotli`` package is installed and the
+    client prefers it, gzip otherwise. Buffered responses smaller than
+    ``COMPRESS_MIN_SIZE`` bytes are sent as is. Streamed responses (such as
+    the NDJSON export) are compressed chunk by chunk and flushed every
+    ``COMPRESS_STREAM_FLUSH_SIZE`` input bytes, so clients keep receiving
+    data progressively.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('COMPRESS_ENABLED', True)
+        app.config.setdefault('COMPRESS_MIN_SIZE', 500)
+        app.config.setdefault('COMPRESS_LEVEL', 6)
+        app.config.setdefault('COMPRESS_BROTLI_QUALITY', 4)
+        app.config.setdefault('COMPRESS_STREAM_FLUSH_SIZE', 16 * 1024)
+        app.config.setdefault('COMPRESS_MIMETYPES', [
+            'application/json',
+            'application/x-ndjson',
+            'text/html',
+            'text/plain',
+            'text/css',
+            'application/javascript',
+        ])
+        if app.config['COMPRESS_ENABLED']:
+            app.after_request(lambda response: self.compress(response, app.config))
+
+    def compress(self, response, config):
+        if (
+            response.mimetype not in config['COMPRESS_MIMETYPES']
+            or response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+        ):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self._negotiate()
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = self._compress_stream(response.response, encoding, config)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < config['COMPRESS_MIN_SIZE']:
+                return response
+            response.set_data(self._compress_bytes(data, encoding, config))
+
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    @staticmethod
+    def _negotiate():
+        accepted = request.accept_encodings
+        candidates = ['br', 'gzip'] if brotli else ['gzip']
+        # Highest client quality wins; ties go to the better compressor.
+        best = max(candidates, key=lambda encoding: accepted.quality(encoding))
+        return best if accepted.quality(best) > 0 else None
+
+    @staticmethod
+    def _compress_bytes(data, encoding, config):
+        if encoding == 'br':
+            return brotli.compress(data, quality=config['COMPRESS_BROTLI_QUALITY'])
+        return gzip.compress(data, compresslevel=config['COMPRESS_LEVEL'], mtime=0)
+
+    @staticmethod
+    def _compress_stream(chunks, encoding, config):
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=config['COMPRESS_BROTLI_QUALITY'])
+            compress, flush, finish = compressor.process, compressor.flush, compressor.finish
+        else:
+            # wbits=31 writes a gzip header and trailer around the deflate data.
+            compressor = zlib.compressobj(config['COMPRESS_LEVEL'], zlib.DEFLATED, 31)
+            compress, finish = compressor.compress, compressor.flush
+            flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+
+        flush_size = config['COMPRESS_STREAM_FLUSH_SIZE']
+        pending = 0
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            output = compress(chunk)
+            pending += len(chunk)
+            if pending >= flush_size:
+                output += flush()
+                pending = 0
+            if output:
+                yield output
+        yield finish()
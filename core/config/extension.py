@@ -1,27 +1,66 @@
+from flask import current_app
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 from flask_limiter import Limiter
-from flask_jwt_extended import JWTManager
+
+from .rate_limit import rate_limit_key, request_cost
+from .compression import ResponseCompression
+from .async_database import AsyncDatabase
+from .replica import ReplicaRouter, RoutingSession
+from .pool import PoolMetrics
+from .admission import AdmissionControl
+from .metrics import RequestMetrics
+# Imported for their side effects: register the shm:// limiter storage
+# scheme and the "gcra" rate limiting strategy.
+from ..infrastructure.ratelimit import shared_memory_storage, gcra  # noqa: F401
+from ..infrastructure.security.jwt_claims_cache import CachingJWTManager
 
 migrate = Migrate()
 
-db = SQLAlchemy(
-    engine_options={
-        'pool_size': 5,              # Number of connections to maintain
-        'pool_pre_ping': True,       # Verify connections before using
-        'pool_recycle': 3600,        # Recycle connections after 1 hour
-        'max_overflow': 2,           # Max connections beyond pool_size
-        'pool_timeout': 30,          # Timeout for getting connection
-        'connect_args': {
-            'connect_timeout': 10    # Database connection timeout
-        }
+# Pool class and sizes are per environment (DATABASE_POOL* in the config
+# classes); create_app adds them to SQLALCHEMY_ENGINE_OPTIONS.
+engine_options = {
+    'pool_pre_ping': True,       # Verify connections before using
+    'connect_args': {
+        'connect_timeout': 10    # Database connection timeout
     }
-)
+}
+
+# Reads marked execution_options(replica=True) may go to a read replica
+# (SQLALCHEMY_REPLICA_URIS); see core/config/replica.py.
+replicas = ReplicaRouter()
+db = SQLAlchemy(engine_options=engine_options, session_options={'class_': RoutingSession})
+
+# asyncio engine for the ASGI entry point (asgi.py); initialised by
+# create_asgi_app only.
+async_db = AsyncDatabase(engine_options)
+
+pool_metrics = PoolMetrics()
+
+request_metrics = RequestMetrics()
 
-jwt = JWTManager()
+jwt = CachingJWTManager()
 
+compression = ResponseCompression()
+
+admission = AdmissionControl()
+
+# Storage is chosen per environment through RATELIMIT_STORAGE_URI.
 limiter = Limiter(
-    key_func=lambda: "global",
+    key_func=rate_limit_key,
     default_limits=["5000 per day", "1000 per hour", "100 per minute"],
-    storage_uri="memory://",
-)
\ No newline at end of file
+    default_limits_cost=request_cost,
+)
+
+def namespace_limit(scope):
+    """Shared, cost-weighted limit for every resource of a namespace.
+
+    The limit string is read from ``RATELIMIT_NAMESPACE_LIMITS[scope]`` and
+    replaces the default limits for the namespace's routes. Pass the result
+    in the namespace's ``decorators``.
+    """
+    return limiter.shared_limit(
+        lambda: current_app.config['RATELIMIT_NAMESPACE_LIMITS'][scope],
+        scope=scope,
+        cost=request_cost,
+    )
\ No newline at end of file
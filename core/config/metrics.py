@@ -0,0 +1,168 @@
+import os
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from flask import Response, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..infrastructure.metrics.shared_metrics import MetricsFile, collect
+
+# Upper bounds of the histogram buckets; one more bucket counts the rest.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# name, type, help, histogram buckets
+FAMILIES = (
+    ('http_requests_total', 'counter', 'Requests answered, by endpoint, method and status.', None),
+    ('http_request_duration_seconds', 'histogram',
+     'Time from the start of a request to its response (to the first byte of a streamed one).', LATENCY_BUCKETS),
+    ('db_queries_per_request', 'histogram', 'SQL statements executed while serving a request.', QUERY_BUCKETS),
+)
+
+# Start time and SQL statement count of the request being served. A context
+# variable rather than flask.g: it is updated for every statement, and each
+# access to g goes through a proxy lookup.
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Prometheus metrics of the requests served by every worker on the host.
+
+    ``init_app`` times each request from the first ``before_request`` hook to
+    the response and counts the SQL statements it runs, then adds the
+    outcome to the worker's series in ``METRICS_DIR`` (see
+    :class:`MetricsFile`). ``GET /metrics`` sums the series of all workers
+    and renders them in the Prometheus text format. Requests are labelled
+    with the Flask endpoint, not the path, so the number of series stays
+    bounded.
+
+    Initialise it before the other extensions so that its timer also covers
+    their hooks.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        config = app.config
+        if not config['METRICS_ENABLED']:
+            return
+
+        recorder = _Recorder(MetricsFile(config['METRICS_DIR'], config['METRICS_FILE_SIZE']))
+        app.extensions['metrics'] = recorder
+        if not event.contains(Engine, 'before_cursor_execute', _count_query):
+            event.listen(Engine, 'before_cursor_execute', _count_query)
+
+        @app.before_request
+        def start_timer():
+            _current.set([time.perf_counter(), 0])
+
+        @app.after_request
+        def record(response):
+            state = _current.get()
+            if state is not None:
+                _current.set(None)
+                recorder.record(
+                    request.endpoint, request.method, response.status_code,
+                    time.perf_counter() - state[0], state[1],
+                )
+            return response
+
+        @app.teardown_request
+        def record_error(exc):
+            # Only requests that ended in an unhandled exception get here
+            # unrecorded.
+            state = _current.get()
+            if state is not None:
+                _current.set(None)
+                recorder.record(request.endpoint, request.method, 500, time.perf_counter() - state[0], state[1])
+
+        app.add_url_rule('/metrics', 'metrics', lambda: self.response(app))
+
+    @staticmethod
+    def response(app):
+        body = render(collect(app.config['METRICS_DIR']))
+        return Response(body, content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class _Recorder:
+    """Adds request outcomes to the series of this process."""
+
+    def __init__(self, file):
+        self.file = file
+        self._pid = None
+        self._slots = {}
+
+    def record(self, endpoint, method, status, seconds, queries):
+        # Value indexes belong to this process's file; a forked child starts
+        # its own.
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._slots = {}
+        key = (endpoint, method, status)
+        slots = self._slots.get(key)
+        if slots is None:
+            slots = self._slots[key] = self._allocate(endpoint or 'none', method, status)
+        if not slots:
+            return  # the file is full
+
+        counter, latency, db_queries = slots
+        self.file.add((
+            (counter, 1),
+            (latency + bisect_left(LATENCY_BUCKETS, seconds), 1),
+            (latency + len(LATENCY_BUCKETS) + 1, seconds),
+            (db_queries + bisect_left(QUERY_BUCKETS, queries), 1),
+            (db_queries + len(QUERY_BUCKETS) + 1, queries),
+        ))
+
+    def _allocate(self, endpoint, method, status):
+        labels = f'endpoint="{_escape(endpoint)}",method="{method}"'
+        slots = (
+            self.file.series(f'http_requests_total{{{labels},status="{status}"}}'),
+            self.file.series(f'http_request_duration_seconds{{{labels}}}', len(LATENCY_BUCKETS) + 2),
+            self.file.series(f'db_queries_per_request{{{labels}}}', len(QUERY_BUCKETS) + 2),
+        )
+        return slots if None not in slots else False
+
+
+def render(totals):
+    """Prometheus text format of the ``{key: [values]}`` from :func:`collect`.
+
+    A histogram's values are its bucket counts, the last one unbounded,
+    followed by the sum of the observations.
+    """
+    lines = []
+    for name, kind, description, buckets in FAMILIES:
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        prefix = name + '{'
+        for key in sorted(key for key in totals if key.startswith(prefix)):
+            values = totals[key]
+            if buckets is None:
+                lines.append(f'{key} {_number(values[0])}')
+                continue
+            labels = key[len(prefix):-1]
+            cumulative = 0
+            for bound, count in zip((*buckets, '+Inf'), values):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {_number(cumulative)}')
+            lines.append(f'{name}_sum{{{labels}}} {_number(values[-1])}')
+            lines.append(f'{name}_count{{{labels}}} {_number(cumulative)}')
+    return '\n'.join(lines) + '\n'
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    state = _current.get()
+    if state is not None:
+        state[1] += 1
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
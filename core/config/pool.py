@@ -0,0 +1,189 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+# Upper bounds (ms) of the checkout wait histogram buckets; one more bucket
+# counts everything slower.
+WAIT_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 30000)
+
+
+class _TimedCheckout:
+    # QueuePool blocks in _do_get while every connection is in use, and
+    # raises TimeoutError after pool_timeout; neither has a pool event. The
+    # time includes opening a new connection when the pool has room.
+    stats = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            if self.stats is not None:
+                self.stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        if self.stats is not None:
+            self.stats.record_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() replaces the pool; keep reporting to the same stats.
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(config, pool_size=None, max_overflow=None, asyncio=False):
+    """Engine options for the pool configured by the ``DATABASE_POOL*`` keys.
+
+    ``'queue'`` keeps up to ``pool_size + max_overflow`` connections open
+    per process and engine; ``'null'`` opens a connection for every
+    checkout and closes it on checkin, for serverless deployments where a
+    frozen instance must not hold connections.
+    """
+    strategy = config['DATABASE_POOL']
+    if strategy == 'null':
+        # A brand-new connection needs no liveness ping.
+        return {'poolclass': NullPool, 'pool_pre_ping': False}
+    if strategy != 'queue':
+        raise ValueError(f"Unknown DATABASE_POOL {strategy!r}; use 'queue' or 'null'")
+    return {
+        'poolclass': TimedAsyncQueuePool if asyncio else TimedQueuePool,
+        'pool_size': config['DATABASE_POOL_SIZE'] if pool_size is None else pool_size,
+        'max_overflow': config['DATABASE_MAX_OVERFLOW'] if max_overflow is None else max_overflow,
+        'pool_timeout': config['DATABASE_POOL_TIMEOUT'],
+        'pool_recycle': config['DATABASE_POOL_RECYCLE'],
+    }
+
+
+class PoolStats:
+    """Counters of one engine's pool in this process, fed by pool events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.wait_sum_ms = 0.0
+        self.wait_max_ms = 0.0
+
+    def listen(self, engine):
+        pool = engine.pool
+        pool.stats = self  # read by _TimedCheckout pools only
+
+        def on_connect(dbapi_connection, connection_record):
+            with self._lock:
+                self.connects += 1
+
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            overflow = _overflow(engine.pool)
+            with self._lock:
+                self.checkouts += 1
+                self.checked_out += 1
+                self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+                self.peak_overflow = max(self.peak_overflow, overflow)
+
+        def on_checkin(dbapi_connection, connection_record):
+            with self._lock:
+                self.checked_out -= 1
+
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.invalidations += 1
+
+        event.listen(pool, 'connect', on_connect)
+        event.listen(pool, 'checkout', on_checkout)
+        event.listen(pool, 'checkin', on_checkin)
+        event.listen(pool, 'invalidate', on_invalidate)
+
+    def record_wait(self, seconds, timed_out=False):
+        ms = seconds * 1000
+        with self._lock:
+            self.wait_counts[bisect_left(WAIT_BUCKETS_MS, ms)] += 1
+            self.wait_sum_ms += ms
+            self.wait_max_ms = max(self.wait_max_ms, ms)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self, engine):
+        pool = engine.pool
+        with self._lock:
+            cumulative = 0
+            buckets = []
+            for bound, count in zip((*WAIT_BUCKETS_MS, None), self.wait_counts):
+                cumulative += count
+                buckets.append({'le': '+Inf' if bound is None else str(bound), 'count': cumulative})
+            return {
+                'pool': type(pool).__name__,
+                'size': pool.size() if isinstance(pool, QueuePool) else 0,
+                'max_overflow': getattr(pool, '_max_overflow', 0),
+                'checked_out': self.checked_out,
+                'overflow': _overflow(pool),
+                'peak_checked_out': self.peak_checked_out,
+                'peak_overflow': self.peak_overflow,
+                'checkouts': self.checkouts,
+                'connects': self.connects,
+                'invalidations': self.invalidations,
+                'timeouts': self.timeouts,
+                'wait_ms': {
+                    'count': cumulative,
+                    'sum': round(self.wait_sum_ms, 3),
+                    'max': round(self.wait_max_ms, 3),
+                    'buckets': buckets,
+                },
+            }
+
+
+class PoolMetrics:
+    """Pool telemetry for every engine of the app.
+
+    ``init_app(app, db)`` (after ``db.init_app``) instruments ``db``'s
+    engines, the primary and any replicas; ``instrument`` adds others, such
+    as the asyncio engines of the ASGI app. The numbers are per process:
+    each worker has its own pools.
+    """
+
+    def init_app(self, app, db):
+        app.extensions['pool_metrics'] = {}
+        with app.app_context():
+            for key, engine in db.engines.items():
+                self.instrument(app, key or 'primary', engine)
+
+    @staticmethod
+    def instrument(app, name, engine):
+        engine = getattr(engine, 'sync_engine', engine)
+        stats = PoolStats()
+        stats.listen(engine)
+        app.extensions['pool_metrics'][name] = (engine, stats)
+
+    @staticmethod
+    def snapshot(app):
+        return {
+            'pid': os.getpid(),
+            'engines': [
+                {'engine': name, **stats.snapshot(engine)}
+                for name, (engine, stats) in app.extensions['pool_metrics'].items()
+            ],
+        }
+
+
+def _overflow(pool):
+    # QueuePool.overflow() counts up from -pool_size.
+    return max(pool.overflow(), 0) if isinstance(pool, QueuePool) else 0
@@ -0,0 +1,56 @@
+from flask import current_app, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_jwt_extended.exceptions import JWTExtendedException
+from flask_limiter.util import get_remote_address
+from jwt.exceptions import PyJWTError
+from limits.storage import SCHEMES
+
+
+def rate_limit_key():
+    """Bucket requests per authenticated user, falling back to the client IP.
+
+    Only verified tokens are trusted; an invalid or expired token is treated
+    like an anonymous request so it cannot be used to drain someone else's
+    bucket.
+    """
+    if request.headers.get("Authorization"):
+        try:
+            verify_jwt_in_request(optional=True)
+            identity = get_jwt_identity()
+        except (JWTExtendedException, PyJWTError):
+            identity = None
+
+        if identity is not None:
+            return f"user:{identity}"
+
+    return f"ip:{get_remote_address()}"
+
+
+def rate_cost(cost):
+    """Declare how many rate limit tokens a resource method consumes.
+
+    Put it next to the route decorators of expensive operations, e.g.
+    ``@rate_cost(5)`` on a list endpoint. Methods without it cost 1.
+    """
+    def decorator(func):
+        func.rate_limit_cost = cost
+        return func
+    return decorator
+
+
+def rate_limit_strategy(config):
+    """``RATELIMIT_STRATEGY``, or when it is unset the best strategy that
+    the ``RATELIMIT_STORAGE_URI`` storage implements: ``gcra`` for storages
+    with ``acquire_gcra`` (shm://), ``fixed-window`` for the others."""
+    if config.get('RATELIMIT_STRATEGY'):
+        return config['RATELIMIT_STRATEGY']
+    storage = SCHEMES.get(config['RATELIMIT_STORAGE_URI'].split('://', 1)[0])
+    return 'gcra' if hasattr(storage, 'acquire_gcra') else 'fixed-window'
+
+
+def request_cost():
+    """Cost of the current request, as declared with :func:`rate_cost`."""
+    view = current_app.view_functions.get(request.endpoint)
+    resource = getattr(view, "view_class", None)
+    method = getattr(resource, request.method.lower(), None)
+    return getattr(method, "rate_limit_cost", 1)
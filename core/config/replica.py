@@ -0,0 +1,115 @@
+import itertools
+
+from flask import current_app, g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.dml import UpdateBase
+
+# Bind keys under which the replica engines are added to SQLALCHEMY_BINDS.
+REPLICA_BIND_PREFIX = 'replica_'
+
+
+class ReplicaPool:
+    """Sends reads marked ``execution_options(replica=True)`` to a replica.
+
+    Every other statement goes to the primary, and so does every read once
+    the request has written (a flush or an INSERT/UPDATE/DELETE), so that a
+    request reads its own writes. Outside a request the same applies per
+    session. Replicas are taken in turn ('round_robin') or by the fewest
+    connections this process has checked out of their pools
+    ('least_loaded', ties taken in turn).
+    """
+
+    STRATEGIES = ('round_robin', 'least_loaded')
+
+    def __init__(self, keys, strategy='round_robin'):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown replica strategy {strategy!r}; use one of {', '.join(self.STRATEGIES)}")
+        self.keys = list(keys)
+        self.strategy = strategy
+        self._turn = itertools.count()
+
+    def route(self, session, clause, engines):
+        """Return the replica engine for ``clause``, or None for the primary."""
+        if session._flushing or isinstance(clause, UpdateBase):
+            _mark_written(session)
+            return None
+        if not isinstance(clause, Executable) or not clause.get_execution_options().get('replica'):
+            return None
+        if _written(session):
+            return None
+        return self.choose([engines[key] for key in self.keys])
+
+    def choose(self, replicas):
+        start = next(self._turn) % len(replicas)
+        replicas = replicas[start:] + replicas[:start]
+        if self.strategy == 'least_loaded':
+            return min(replicas, key=_checked_out)
+        return replicas[0]
+
+
+class ReplicaRouter:
+    """Adds ``SQLALCHEMY_REPLICA_URIS`` to ``db`` as read replicas.
+
+    ``init_app`` must run before ``db.init_app``: it registers each URI as a
+    ``replica_<n>`` bind with the primary's ``SQLALCHEMY_ENGINE_OPTIONS``,
+    which Flask-SQLAlchemy then creates an engine for, and stores the app's
+    :class:`ReplicaPool` for :class:`RoutingSession`. No replicas
+    configured, no routing.
+    """
+
+    def init_app(self, app):
+        uris = app.config.get('SQLALCHEMY_REPLICA_URIS') or []
+        if not uris:
+            return
+
+        options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+        binds = {f"{REPLICA_BIND_PREFIX}{index}": {**options, 'url': uri} for index, uri in enumerate(uris)}
+        app.config['SQLALCHEMY_BINDS'] = {**app.config.get('SQLALCHEMY_BINDS', {}), **binds}
+        app.extensions['replicas'] = ReplicaPool(binds, app.config['SQLALCHEMY_REPLICA_STRATEGY'])
+
+
+class RoutingSession(Session):
+    # db.session class; see ReplicaPool for the routing rules.
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        pool = current_app.extensions.get('replicas') if bind is None else None
+        if pool is not None:
+            engine = pool.route(self, clause, self._db.engines)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class AsyncRoutingSession(OrmSession):
+    # Sync session behind AsyncDatabase sessions. The pool and its engines
+    # are passed in ``info`` by AsyncDatabase.init_app.
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        pool = self.info.get('replicas') if bind is None else None
+        if pool is not None:
+            engine = pool.route(self, clause, self.info['replica_engines'])
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _written(session):
+    if has_app_context():
+        return g.get('db_written', False)
+    return session.info.get('db_written', False)
+
+
+def _mark_written(session):
+    # Kept on the request (app context) when there is one, so the separate
+    # sessions of the async repositories see it too.
+    if has_app_context():
+        g.db_written = True
+    else:
+        session.info['db_written'] = True
+
+
+def _checked_out(engine):
+    pool = engine.pool
+    return pool.checkedout() if hasattr(pool, 'checkedout') else 0
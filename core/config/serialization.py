@@ -0,0 +1,168 @@
+from functools import wraps
+
+from flask import current_app, request
+from flask_restx import fields, marshal_with
+from flask_restx.utils import unpack
+
+
+# Formatting applied by flask-restx to each supported field type; the
+# generated code inlines the same conversion.
+_FORMATS = (
+    (fields.Boolean, "bool({})"),
+    (fields.Integer, "int({})"),
+    (fields.Float, "float({})"),
+    (fields.String, "str({})"),
+    (fields.Raw, "{}"),
+)
+
+
+class ModelSerializer:
+    """Serialize objects to the shape of a flask-restx model.
+
+    The model is compiled once into a plain Python function that reads every
+    field with a direct attribute (or key) lookup and applies the field's
+    formatting inline, so serializing a response does not walk the field
+    objects, resolve attributes or build ``OrderedDict`` instances. The
+    output is the same as ``flask_restx.marshal(obj, model)`` for the field
+    types the task models use (``Raw``, ``String``, ``Integer``, ``Float``,
+    ``Boolean``, ``Nested`` and ``List``); other field types are rejected
+    when the serializer is built.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._counter = 0
+        self._namespace = {}
+        self._serialize = self._namespace[self._compile(model)]
+
+    def __call__(self, obj):
+        return self._serialize(obj)
+
+    def _compile(self, model):
+        """Generate the object and the mapping variant of ``model`` plus a
+        function picking the right one for its argument; return its name."""
+        name = self._name("model")
+        by_attribute = self._define(name + "_attrs", model, "getattr(obj, {!r}, None)")
+        by_key = self._define(name + "_keys", model, "obj.get({!r})")
+        self._emit(
+            f"def {name}(obj):\n"
+            f"    if obj is None:\n"
+            f"        return None\n"
+            f"    if isinstance(obj, dict):\n"
+            f"        return {by_key}(obj)\n"
+            f"    return {by_attribute}(obj)\n"
+        )
+        return name
+
+    def _define(self, name, model, lookup):
+        lines = [f"def {name}(obj):"]
+        items = []
+        for key, field in model.items():
+            source = lookup.format(field.attribute if isinstance(field.attribute, str) else key)
+            value = self._name("v")
+            lines.append(f"    {value} = {source}")
+            items.append(f"{key!r}: {self._expression(field, value)}")
+        lines.append("    return {" + ", ".join(items) + "}")
+        self._emit("\n".join(lines) + "\n")
+        return name
+
+    def _expression(self, field, value):
+        if isinstance(field, type):
+            field = field()
+        if field.attribute is not None and not isinstance(field.attribute, str):
+            raise TypeError(f"Callable attributes are not supported: {field!r}")
+
+        if isinstance(field, fields.Nested):
+            if field.as_list:
+                raise TypeError(f"Nested(as_list=True) is not supported: {field!r}")
+            nested = self._compile(field.nested)
+            if field.allow_null:
+                return f"{nested}({value})"
+            if field.default is not None:
+                return f"({self._constant(field.default)} if {value} is None else {nested}({value}))"
+            # marshal() renders a missing nested object with every field set
+            # to its default.
+            empty = self._name("empty")
+            self._namespace[empty] = {}
+            return f"{nested}({empty} if {value} is None else {value})"
+
+        default = field.default
+        if callable(default):
+            raise TypeError(f"Callable defaults are not supported: {field!r}")
+
+        if isinstance(field, fields.List):
+            item = self._name("item")
+            inner = self._expression(field.container, item)
+            return f"({self._constant(default)} if {value} is None else [{inner} for {item} in {value}])"
+
+        formatted = self._format(field, value)
+        if default:
+            # A truthy default is formatted like a value; a falsy one is
+            # returned unchanged, as flask-restx does.
+            fallback = self._format(field, self._constant(default))
+        else:
+            fallback = self._constant(default)
+        return f"({fallback} if {value} is None else {formatted})"
+
+    def _format(self, field, value):
+        for field_type, template in _FORMATS:
+            if type(field) is field_type:
+                return template.format(value)
+        raise TypeError(f"Unsupported field type for a compiled serializer: {type(field).__name__}")
+
+    def _constant(self, value):
+        name = self._name("const")
+        self._namespace[name] = value
+        return name
+
+    def _name(self, prefix):
+        self._counter += 1
+        return f"_{prefix}_{self._counter}"
+
+    def _emit(self, source):
+        exec(compile(source, f"<serializer {self.model.name}>", "exec"), self._namespace)
+
+
+def model_renderer(namespace, model):
+    """Return ``render(data)`` serializing ``data`` to ``model`` for the
+    current request.
+
+    It uses a :class:`ModelSerializer`, or flask-restx's own marshalling
+    when ``COMPILED_SERIALIZER_ENABLED`` is off or the request carries a
+    field mask header, which the compiled serializer does not apply.
+    """
+    serializer = ModelSerializer(model)
+    marshal_data = marshal_with(model, ordered=namespace.ordered)(lambda data: data)
+
+    def render(data):
+        config = current_app.config
+        if not config['COMPILED_SERIALIZER_ENABLED'] or request.headers.get(config['RESTX_MASK_HEADER']):
+            return marshal_data(data)
+        return serializer(data)
+
+    return render
+
+
+def marshal_compiled(namespace, model, code=200, description=None):
+    """Drop-in replacement for ``namespace.marshal_with(model, code=...)``
+    that serializes with :func:`model_renderer`.
+
+    The Swagger documentation is produced by ``marshal_with`` itself, so it
+    is identical either way.
+    """
+    render = model_renderer(namespace, model)
+
+    def decorator(func):
+        documented = namespace.marshal_with(model, code=code, description=description)(func)
+
+        @wraps(documented)
+        def wrapper(*args, **kwargs):
+            resp = func(*args, **kwargs)
+            if isinstance(resp, tuple):
+                data, status, headers = unpack(resp)
+                return render(data), status, headers
+            return render(resp)
+
+        return wrapper
+
+    return decorator
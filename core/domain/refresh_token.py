@@ -0,0 +1,22 @@
+from ..config.extension import db
+
+class RefreshToken(db.Model):
+    __tablename__ = 'refresh_tokens'
+
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(36), unique=True, nullable=False)
+    family_id = db.Column(db.String(36), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    used_at = db.Column(db.DateTime, nullable=True)
+    revoked = db.Column(db.Boolean, nullable=False, default=False)
+
+    def __init__(self, jti, family_id, user_id, expires_at):
+        self.jti = jti
+        self.family_id = family_id
+        self.user_id = user_id
+        self.expires_at = expires_at
+        self.revoked = False
+
+    def __repr__(self):
+        return f'<RefreshToken {self.jti}>'
\ No newline at end of file
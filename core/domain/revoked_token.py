@@ -0,0 +1,15 @@
+from ..config.extension import db
+
+class RevokedToken(db.Model):
+    __tablename__ = 'token_blocklist'
+
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(36), unique=True, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __init__(self, jti, expires_at):
+        self.jti = jti
+        self.expires_at = expires_at
+
+    def __repr__(self):
+        return f'<RevokedToken {self.jti}>'
\ No newline at end of file
@@ -3,16 +3,27 @@ from collections import OrderedDict
 
 class Task(db.Model):
     __tablename__ = 'tasks'
+    __table_args__ = (
+        # Every task query is scoped to one owner; (user_id, id) turns list,
+        # pagination and detail lookups into index range scans.
+        db.Index('ix_tasks_user_id_id', 'user_id', 'id'),
+        # Back the list endpoint's is_completed filter and title prefix
+        # filter / sort; both end with id for keyset pagination.
+        db.Index('ix_tasks_user_id_is_completed_id', 'user_id', 'is_completed', 'id'),
+        db.Index('ix_tasks_user_id_title_id', 'user_id', 'title', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text, nullable=True)
     is_completed = db.Column(db.Boolean, default=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', name='fk_tasks_user_id_users', ondelete='CASCADE'), nullable=True)
 
-    def __init__(self, title, description=None, is_completed=False):
+    def __init__(self, title, description=None, is_completed=False, user_id=None):
         self.title = title
         self.description = description
         self.is_completed = is_completed
+        self.user_id = user_id
 
     def mark_complete(self):
         self.is_completed = True
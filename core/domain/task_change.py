@@ -0,0 +1,18 @@
+from ..config.extension import db
+
+class TaskChange(db.Model):
+    # One row per task whose title, description or owner changed, or that was
+    # created or deleted; the search index of each worker replays them (see
+    # TaskSearchIndex). No foreign key: the rows outlive deleted tasks.
+    __tablename__ = 'task_changes'
+
+    id = db.Column(db.Integer, primary_key=True)
+    task_id = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __init__(self, task_id, created_at):
+        self.task_id = task_id
+        self.created_at = created_at
+
+    def __repr__(self):
+        return f'<TaskChange {self.id} task={self.task_id}>'
\ No newline at end of file
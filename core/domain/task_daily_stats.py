@@ -0,0 +1,16 @@
+from ..config.extension import db
+
+class TaskDailyStats(db.Model):
+    __tablename__ = 'task_daily_stats'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True, autoincrement=False)
+    day = db.Column(db.Date, primary_key=True)
+    created = db.Column(db.Integer, nullable=False, default=0)
+
+    def __init__(self, user_id, day, created=0):
+        self.user_id = user_id
+        self.day = day
+        self.created = created
+
+    def __repr__(self):
+        return f'<TaskDailyStats user={self.user_id} day={self.day}>'
\ No newline at end of file
@@ -0,0 +1,20 @@
+from ..config.extension import db
+
+class TaskStats(db.Model):
+    __tablename__ = 'task_stats'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True, autoincrement=False)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    completed = db.Column(db.Integer, nullable=False, default=0)
+
+    def __init__(self, user_id, total=0, completed=0):
+        self.user_id = user_id
+        self.total = total
+        self.completed = completed
+
+    @property
+    def open(self):
+        return self.total - self.completed
+
+    def __repr__(self):
+        return f'<TaskStats user={self.user_id} total={self.total}>'
\ No newline at end of file
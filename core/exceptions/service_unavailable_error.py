@@ -0,0 +1,8 @@
+from .base_exception import ApplicationError
+class ServiceUnavailableError(ApplicationError):
+    error_code = "service_unavailable"
+    status_code = 503
+
+    def __init__(self, message: str = None, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
\ No newline at end of file
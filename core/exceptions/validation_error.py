@@ -0,0 +1,4 @@
+from .base_exception import ApplicationError
+class ValidationError(ApplicationError):
+    error_code = "validation_error"
+    status_code = 400
\ No newline at end of file
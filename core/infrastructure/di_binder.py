@@ -1,8 +1,78 @@
+from .cache.ttl_cache import TTLCache
+from .search.task_search_index import TaskSearchIndex
+from .security.password_hasher import PasswordHasher
+from .security.login_throttle import LoginThrottle
+from .security.token_blocklist import TokenBlocklist
 from .task.task_repository import TaskRepository
+from .task.cached_task_repository import CachedTaskRepository
+from .task.task_stats_repository import TaskStatsRepository
+from .task.async_task_repository import AsyncTaskRepository
+from .task.async_task_stats_repository import AsyncTaskStatsRepository
 from .user.user_repository import UserRepository
+from .user.async_user_repository import AsyncUserRepository
+from .token.refresh_token_repository import RefreshTokenRepository
+from .token.async_refresh_token_repository import AsyncRefreshTokenRepository
+from .token.token_blocklist_repository import TokenBlocklistRepository
 
-def bind_task_repository():
-    return TaskRepository()
+def bind_task_stats_repository():
+    return TaskStatsRepository()
+
+def bind_task_repository(config=None, stats_repository=None):
+    # The change log only has readers when the search index is enabled.
+    repository = TaskRepository(stats_repository, log_changes=bool(config and config.get('TASK_SEARCH_INDEX_ENABLED')))
+    if config and config.get('TASK_CACHE_ENABLED'):
+        cache = TTLCache(config['TASK_CACHE_MAX_ENTRIES'], config['TASK_CACHE_TTL'])
+        return CachedTaskRepository(repository, cache)
+    return repository
+
+def bind_async_task_repository(database, config=None):
+    return AsyncTaskRepository(
+        database, AsyncTaskStatsRepository(), log_changes=bool(config and config.get('TASK_SEARCH_INDEX_ENABLED'))
+    )
+
+def bind_task_search_index(config, task_repository):
+    if not config.get('TASK_SEARCH_INDEX_ENABLED'):
+        return None
+    return TaskSearchIndex(
+        task_repository,
+        sync_interval=config['TASK_SEARCH_SYNC_INTERVAL'],
+        change_retention=config['TASK_SEARCH_CHANGE_RETENTION'],
+    )
 
 def bind_user_repository():
-    return UserRepository()
\ No newline at end of file
+    return UserRepository()
+
+def bind_async_user_repository(database):
+    return AsyncUserRepository(database)
+
+def bind_refresh_token_repository():
+    return RefreshTokenRepository()
+
+def bind_async_refresh_token_repository(database):
+    return AsyncRefreshTokenRepository(database)
+
+def bind_token_blocklist(config):
+    return TokenBlocklist(
+        TokenBlocklistRepository(),
+        capacity=config['TOKEN_BLOCKLIST_CAPACITY'],
+        error_rate=config['TOKEN_BLOCKLIST_ERROR_RATE'],
+        sync_interval=config['TOKEN_BLOCKLIST_SYNC_INTERVAL'],
+    )
+
+def bind_password_hasher(config):
+    return PasswordHasher(
+        method=config['PASSWORD_HASH_METHOD'],
+        workers=config['PASSWORD_HASH_WORKERS'],
+        queue_size=config['PASSWORD_HASH_QUEUE_SIZE'],
+        timeout=config['PASSWORD_HASH_TIMEOUT'],
+        slots_dir=config['PASSWORD_HASH_SLOTS_DIR'],
+    )
+
+def bind_login_throttle(config):
+    return LoginThrottle(
+        config['LOGIN_THROTTLE_PATH'],
+        slots=config['LOGIN_THROTTLE_SLOTS'],
+        threshold=config['LOGIN_THROTTLE_THRESHOLD'],
+        half_life=config['LOGIN_THROTTLE_HALF_LIFE'],
+        max_delay=config['LOGIN_THROTTLE_MAX_DELAY'],
+    )
\ No newline at end of file
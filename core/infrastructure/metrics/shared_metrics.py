@@ -0,0 +1,217 @@
+import fcntl
+import glob
+import mmap
+import os
+import struct
+import threading
+
+# Every process writes its own file, ``<pid>.metrics`` in the metrics
+# directory: a header with the number of bytes in use, then one record per
+# series (key length, number of values, the key padded to 8 bytes and the
+# values as float64). Records are only ever appended and the header is
+# updated after the record is complete, so readers in other processes never
+# see a partial one. A file has a fixed size, allocated lazily by the OS.
+# The files of exited processes are folded into ``archive.metrics``, in the
+# same format, when a process opens its own.
+HEADER = struct.Struct("<8sQ")
+RECORD = struct.Struct("<II")
+VALUE_SIZE = 8
+MAGIC = b"MTSHM001"
+DEFAULT_FILE_SIZE = 1 << 20
+ARCHIVE = "archive.metrics"
+LOCK = ".lock"
+
+# Files opened by this process, which must never be folded.
+_open_paths = set()
+
+
+class MetricsFile:
+    """Series of one process, stored in a memory-mapped file.
+
+    Only the owning process writes the file, so updates take a thread lock
+    but no file lock. Opening it first folds the files of exited processes,
+    including one left behind under the same pid, into the archive.
+    """
+
+    def __init__(self, directory, size=DEFAULT_FILE_SIZE):
+        self.directory = directory
+        self.size = int(size)
+        self._lock = threading.Lock()
+        self._pid = None
+        self._map = None
+        self._used = HEADER.size
+        self._series = {}
+        self.values = None
+
+    def _ensure_open(self):
+        # Re-open after fork: the child must not write the parent's file.
+        if self._pid == os.getpid():
+            return
+
+        path = os.path.join(self.directory, f"{os.getpid()}.metrics")
+        fold_exited(self.directory)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            size = os.fstat(fd).st_size
+            if size < HEADER.size or os.pread(fd, len(MAGIC), 0) != MAGIC:
+                size = self.size
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+                os.pwrite(fd, HEADER.pack(MAGIC, HEADER.size), 0)
+            self._map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+        self._used = HEADER.unpack_from(self._map, 0)[1]
+        self._series = {key: (offset // VALUE_SIZE, count) for key, offset, count in _records(self._map, self._used)}
+        self.values = memoryview(self._map).cast("d")
+        self._pid = os.getpid()
+        _open_paths.add(path)
+
+    def series(self, key, count=1):
+        """Index of the first of the key's ``count`` values, or None when
+        the file is full."""
+        with self._lock:
+            self._ensure_open()
+            found = self._series.get(key)
+            if found is not None:
+                return found[0] if found[1] == count else None
+
+            encoded = key.encode()
+            padded = -(-len(encoded) // VALUE_SIZE) * VALUE_SIZE
+            end = self._used + RECORD.size + padded + count * VALUE_SIZE
+            if end > len(self._map):
+                return None
+            RECORD.pack_into(self._map, self._used, len(encoded), count)
+            self._map[self._used + RECORD.size:self._used + RECORD.size + len(encoded)] = encoded
+            offset = self._used + RECORD.size + padded
+            # The values are still zero: the file only grows.
+            HEADER.pack_into(self._map, 0, MAGIC, end)
+            self._used = end
+            self._series[key] = (offset // VALUE_SIZE, count)
+            return offset // VALUE_SIZE
+
+    def add(self, increments):
+        """Add ``amount`` to the value at ``index`` for each pair."""
+        with self._lock:
+            self._ensure_open()
+            values = self.values
+            for index, amount in increments:
+                values[index] += amount
+
+
+def collect(directory):
+    """Sum the series of every process file in ``directory``.
+
+    Returns ``{key: [values]}``. The archive of exited processes is
+    included, so counters keep their totals when a worker is replaced.
+    """
+    with _DirectoryLock(directory, fcntl.LOCK_SH):
+        return _sum(glob.glob(os.path.join(directory, "*.metrics")))
+
+
+def fold_exited(directory):
+    """Add the files of exited processes to the archive and delete them.
+
+    Runs under an exclusive lock that :func:`collect` shares, so a scrape
+    never counts a folded file twice or misses it.
+    """
+    with _DirectoryLock(directory, fcntl.LOCK_EX):
+        exited = [
+            path for path in glob.glob(os.path.join(directory, "*.metrics"))
+            if path not in _open_paths and not _alive(_pid_of(path))
+        ]
+        if not exited:
+            return
+        archive = os.path.join(directory, ARCHIVE)
+        data = _encode(_sum([archive, *exited]))
+        temporary = archive + ".tmp"
+        with open(temporary, "wb") as file:
+            file.write(data)
+        os.replace(temporary, archive)
+        for path in exited:
+            os.unlink(path)
+
+
+class _DirectoryLock:
+    def __init__(self, directory, mode):
+        self.directory = directory
+        self.mode = mode
+        self.fd = None
+
+    def __enter__(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.fd = os.open(os.path.join(self.directory, LOCK), os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self.fd, self.mode)
+        return self
+
+    def __exit__(self, *exc_info):
+        os.close(self.fd)
+
+
+def _pid_of(path):
+    """Pid of a process file; None for the archive or a foreign file."""
+    name = os.path.basename(path)[:-len(".metrics")]
+    return int(name) if name.isdigit() else None
+
+
+def _alive(pid):
+    if pid is None:
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _sum(paths):
+    totals = {}
+    for path in paths:
+        try:
+            with open(path, "rb") as file:
+                header = file.read(HEADER.size)
+                if len(header) < HEADER.size:
+                    continue
+                magic, used = HEADER.unpack(header)
+                if magic != MAGIC:
+                    continue
+                # Only the records in use; the rest of the file is empty.
+                data = header + file.read(used - HEADER.size)
+        except FileNotFoundError:
+            continue
+        for key, offset, count in _records(data, len(data)):
+            values = struct.unpack_from(f"<{count}d", data, offset)
+            total = totals.get(key)
+            if total is None:
+                totals[key] = list(values)
+            elif len(total) == count:
+                totals[key] = [a + b for a, b in zip(total, values)]
+    return totals
+
+
+def _encode(totals):
+    """A file holding ``{key: [values]}``, sized to its records."""
+    data = bytearray(HEADER.size)
+    for key, values in totals.items():
+        encoded = key.encode()
+        padded = -(-len(encoded) // VALUE_SIZE) * VALUE_SIZE
+        data += RECORD.pack(len(encoded), len(values)) + encoded.ljust(padded, b"\0")
+        data += struct.pack(f"<{len(values)}d", *values)
+    HEADER.pack_into(data, 0, MAGIC, len(data))
+    return bytes(data)
+
+
+def _records(buffer, used):
+    """Yield ``(key, value offset, value count)`` for each record."""
+    position = HEADER.size
+    while position + RECORD.size <= used:
+        length, count = RECORD.unpack_from(buffer, position)
+        key = bytes(buffer[position + RECORD.size:position + RECORD.size + length]).decode()
+        offset = position + RECORD.size + -(-length // VALUE_SIZE) * VALUE_SIZE
+        if offset + count * VALUE_SIZE > used:
+            return
+        yield key, offset, count
+        position = offset + count * VALUE_SIZE
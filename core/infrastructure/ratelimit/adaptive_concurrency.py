@@ -0,0 +1,64 @@
+import threading
+import time
+
+
+class AdaptiveConcurrencyLimit:
+    """Concurrency limit of one worker that adapts to latency (AIMD).
+
+    :meth:`try_acquire` admits a call while fewer than ``limit`` calls are
+    in flight and refuses it immediately otherwise, so excess load is shed
+    instead of queueing for a database connection. :meth:`release` feeds
+    the outcome back:
+
+    * a call slower than ``latency_target``, or one that failed from
+      overload (``dropped``), multiplies the limit by ``backoff``; at most
+      once per round trip: only calls admitted after the previous decrease
+      count, as earlier ones ran under the old limit;
+    * a fast call grows the limit by ``1 / limit`` when at least half of it
+      was in use, i.e. about +1 per round trip of a busy worker.
+
+    The limit stays within ``[minimum, maximum]``.
+    """
+
+    def __init__(self, initial=20, minimum=1, maximum=200, latency_target=0.25, backoff=0.9):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._decreased_at = 0.0
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        """Start time to pass to :meth:`release`, or None when at the limit."""
+        with self._lock:
+            if self.in_flight >= int(self.limit):
+                self.rejected += 1
+                return None
+            self.in_flight += 1
+            self.admitted += 1
+        return time.monotonic()
+
+    def release(self, started, dropped=False):
+        now = time.monotonic()
+        with self._lock:
+            in_flight = self.in_flight
+            self.in_flight -= 1
+            if dropped or now - started > self.latency_target:
+                if started > self._decreased_at:
+                    self.limit = max(self.minimum, self.limit * self.backoff)
+                    self._decreased_at = now
+            elif in_flight * 2 >= self.limit:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'admitted': self.admitted,
+                'rejected': self.rejected,
+            }
@@ -0,0 +1,53 @@
+import math
+import time
+
+from limits.strategies import STRATEGIES, RateLimiter
+from limits.util import WindowStats
+
+
+class GCRARateLimiter(RateLimiter):
+    """Generic Cell Rate Algorithm (a token bucket stored as one timestamp).
+
+    For a limit of ``amount`` per ``period`` the only state kept per key is
+    the theoretical arrival time (TAT): the moment the bucket would be full
+    again. Each hit pushes it forward by ``cost * period / amount`` and is
+    allowed while the TAT stays within one period of now. Once the TAT is in
+    the past the record carries no information, so idle keys can be dropped
+    at any time without changing a decision.
+
+    Requires a storage exposing ``acquire_gcra`` and ``get_gcra``.
+    """
+
+    def __init__(self, storage):
+        if not hasattr(storage, "acquire_gcra") or not hasattr(storage, "get_gcra"):
+            raise NotImplementedError(
+                f"GCRA rate limiting is not implemented for storage of type {storage.__class__}"
+            )
+        super().__init__(storage)
+
+    def hit(self, item, *identifiers, cost=1):
+        return self.storage.acquire_gcra(
+            item.key_for(*identifiers), item.get_expiry(), item.amount, cost
+        )
+
+    def test(self, item, *identifiers, cost=1):
+        period = item.get_expiry()
+        interval = period / item.amount
+        now = time.time()
+        tat = max(self.storage.get_gcra(item.key_for(*identifiers)), now)
+        return tat + cost * interval - now <= period
+
+    def get_window_stats(self, item, *identifiers):
+        period = item.get_expiry()
+        interval = period / item.amount
+        now = time.time()
+        tat = max(self.storage.get_gcra(item.key_for(*identifiers)), now)
+
+        remaining = min(item.amount, max(0, math.floor((period - (tat - now)) / interval)))
+        # When exhausted, report when the next unit frees up rather than when
+        # the whole bucket refills, so Retry-After stays accurate.
+        reset = tat - period + interval if remaining == 0 else tat
+        return WindowStats(reset, remaining)
+
+
+STRATEGIES.setdefault("gcra", GCRARateLimiter)
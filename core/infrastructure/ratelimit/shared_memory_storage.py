@@ -0,0 +1,235 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+import urllib.parse
+
+from limits.storage import Storage
+
+# File layout: a small header followed by fixed-size slots. Each slot holds a
+# 64-bit key hash, a value and an absolute expiry timestamp, so the table has
+# a constant memory footprint no matter how many keys pass through it.
+HEADER = struct.Struct("<8sQ")
+SLOT = struct.Struct("<Qdd")
+MAGIC = b"RLSHM001"
+DEFAULT_SLOTS = 65536
+PROBE_LIMIT = 16
+
+
+class SlotTable:
+    """Open-addressing hash table stored in a memory-mapped file.
+
+    Every process that maps the same file sees the same slots. Mutations are
+    serialised with an exclusive ``flock`` (between processes) plus a thread
+    lock (between threads of one process, which share the file description).
+    Expired slots are reused in place; when a probe window is full of live
+    entries the one closest to expiry is evicted.
+    """
+
+    def __init__(self, path, slots=DEFAULT_SLOTS):
+        self.path = path
+        self.requested_slots = int(slots)
+        self._thread_lock = threading.Lock()
+        self._pid = None
+        self._fd = None
+        self._map = None
+        self.slots = 0
+
+    def _ensure_open(self):
+        # Re-open after fork: a forked child shares the parent's file
+        # description, and flock does not exclude holders of the same one.
+        if self._pid == os.getpid():
+            return
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            size = os.fstat(fd).st_size
+            if size >= HEADER.size:
+                magic, slots = HEADER.unpack(os.pread(fd, HEADER.size, 0))
+            else:
+                magic, slots = None, 0
+
+            if magic != MAGIC or size < HEADER.size + slots * SLOT.size:
+                # First process to arrive sizes the table; later ones adopt it.
+                slots = self.requested_slots
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, HEADER.size + slots * SLOT.size)
+                os.pwrite(fd, HEADER.pack(MAGIC, slots), 0)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+        self._fd = fd
+        self.slots = slots
+        self._map = mmap.mmap(fd, HEADER.size + slots * SLOT.size)
+        self._pid = os.getpid()
+
+    def locked(self, shared=False):
+        return _TableLock(self, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+
+    @staticmethod
+    def hash_key(key):
+        digest = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+        return digest or 1  # 0 marks a never-used slot
+
+    def _offset(self, index):
+        return HEADER.size + index * SLOT.size
+
+    def read(self, index):
+        return SLOT.unpack_from(self._map, self._offset(index))
+
+    def write(self, index, key_hash, value, expires_at):
+        SLOT.pack_into(self._map, self._offset(index), key_hash, value, expires_at)
+
+    def find(self, key_hash, now, create=False):
+        """Return ``(index, value, expires_at)`` for the key.
+
+        ``value`` is ``None`` when the key has no live entry. With ``create``
+        the returned index is a slot the caller may write the key into;
+        without it the index is ``None`` when the key is absent.
+        """
+        start = key_hash % self.slots
+        reusable = None
+        oldest = None
+        oldest_expiry = None
+
+        for probe in range(min(PROBE_LIMIT, self.slots)):
+            index = (start + probe) % self.slots
+            slot_hash, value, expires_at = self.read(index)
+
+            if slot_hash == key_hash:
+                if expires_at > now:
+                    return index, value, expires_at
+                return index, None, None
+
+            if slot_hash == 0 or expires_at <= now:
+                if reusable is None:
+                    reusable = index
+                if slot_hash == 0:
+                    break  # end of the probe chain
+            elif oldest_expiry is None or expires_at < oldest_expiry:
+                oldest, oldest_expiry = index, expires_at
+
+        if not create:
+            return None, None, None
+        return (reusable if reusable is not None else oldest), None, None
+
+    def clear(self):
+        self._map[HEADER.size:] = bytes(self.slots * SLOT.size)
+
+    def live_entries(self, now):
+        return sum(1 for index in range(self.slots) if self.read(index)[2] > now)
+
+
+class _TableLock:
+    def __init__(self, table, mode):
+        self.table = table
+        self.mode = mode
+
+    def __enter__(self):
+        self.table._thread_lock.acquire()
+        try:
+            self.table._ensure_open()
+            fcntl.flock(self.table._fd, self.mode)
+        except BaseException:
+            self.table._thread_lock.release()
+            raise
+        return self.table
+
+    def __exit__(self, *exc_info):
+        try:
+            fcntl.flock(self.table._fd, fcntl.LOCK_UN)
+        finally:
+            self.table._thread_lock.release()
+
+
+class SharedMemoryStorage(Storage):
+    """Rate limit storage shared by every worker process on a host.
+
+    Counters live in a memory-mapped file (``/dev/shm`` or any tmpfs path is
+    ideal), so ``gunicorn -w N`` enforces one limit instead of N independent
+    ones, without running Redis. Supports the fixed-window and ``gcra``
+    strategies; with ``gcra`` every key costs one fixed-size slot per limit.
+
+    URI format: ``shm:///path/to/file`` with an optional ``slots`` storage
+    option sizing the table.
+    """
+
+    STORAGE_SCHEME = ["shm"]
+
+    def __init__(self, uri=None, wrap_exceptions=False, slots=DEFAULT_SLOTS, **options):
+        path = urllib.parse.urlparse(uri).path if uri else ""
+        if not path:
+            raise ValueError("shm:// storage requires a file path, e.g. shm:///dev/shm/ratelimit")
+        self.table = SlotTable(path, slots)
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return (OSError, ValueError)
+
+    def incr(self, key, expiry, amount=1):
+        key_hash = self.table.hash_key(key)
+        now = time.time()
+        with self.table.locked() as table:
+            index, value, expires_at = table.find(key_hash, now, create=True)
+            if value is None:
+                value, expires_at = 0, now + expiry
+            value += amount
+            table.write(index, key_hash, value, expires_at)
+        return int(value)
+
+    def get(self, key):
+        key_hash = self.table.hash_key(key)
+        with self.table.locked(shared=True) as table:
+            _, value, _ = table.find(key_hash, time.time())
+        return int(value or 0)
+
+    def get_expiry(self, key):
+        key_hash = self.table.hash_key(key)
+        now = time.time()
+        with self.table.locked(shared=True) as table:
+            _, _, expires_at = table.find(key_hash, now)
+        return expires_at or now
+
+    def acquire_gcra(self, key, period, limit, cost=1):
+        interval = period / limit
+        key_hash = self.table.hash_key(key)
+        now = time.time()
+        with self.table.locked() as table:
+            index, tat, _ = table.find(key_hash, now, create=True)
+            new_tat = max(tat or now, now) + cost * interval
+            if new_tat - now > period:
+                return False
+            # The record expires exactly when the bucket is full again.
+            table.write(index, key_hash, new_tat, new_tat)
+        return True
+
+    def get_gcra(self, key):
+        key_hash = self.table.hash_key(key)
+        now = time.time()
+        with self.table.locked(shared=True) as table:
+            _, tat, _ = table.find(key_hash, now)
+        return tat or now
+
+    def check(self):
+        with self.table.locked(shared=True):
+            return True
+
+    def reset(self):
+        with self.table.locked() as table:
+            cleared = table.live_entries(time.time())
+            table.clear()
+        return cleared
+
+    def clear(self, key):
+        key_hash = self.table.hash_key(key)
+        with self.table.locked() as table:
+            index, value, _ = table.find(key_hash, time.time())
+            if value is not None:
+                # Keep the hash so the probe chain stays intact; expiry 0
+                # makes the slot reusable.
+                table.write(index, key_hash, 0, 0)
@@ -0,0 +1,145 @@
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left
+from operator import itemgetter
+from threading import RLock
+
+TOKEN_PATTERN = re.compile(r"\w+")
+MAX_TOKEN_LENGTH = 64
+MAX_FREQUENCY = 0xFFFF
+
+
+def tokenize(text):
+    if not text:
+        return []
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if len(token) <= MAX_TOKEN_LENGTH]
+
+
+class _Shard:
+    """Postings of one owner: term -> sorted doc ids plus term frequencies."""
+
+    __slots__ = ("doc_ids", "frequencies", "lengths", "terms", "total_length")
+
+    def __init__(self):
+        self.doc_ids = {}
+        self.frequencies = {}
+        self.lengths = {}
+        self.terms = {}
+        self.total_length = 0
+
+
+class InvertedIndex:
+    """Thread-safe in-memory inverted index with BM25 ranking.
+
+    Documents are partitioned by owner, so a query only ever reads the
+    postings of the user who runs it. Each posting list is a pair of
+    ``array`` objects (sorted ``uint32`` doc ids and ``uint16`` term
+    frequencies) rather than Python lists or sets, which keeps a posting at
+    six bytes. Adding a document with an id that is already indexed replaces
+    it.
+    """
+
+    def __init__(self, k1=1.2, b=0.75, title_weight=2):
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+        self._shards = {}
+        self._owners = {}
+        self._lock = RLock()
+
+    def add(self, doc_id, owner_id, title, description=None):
+        counts = {}
+        for token in tokenize(title):
+            counts[token] = counts.get(token, 0) + self.title_weight
+        for token in tokenize(description):
+            counts[token] = counts.get(token, 0) + 1
+
+        with self._lock:
+            self._remove(doc_id)
+            shard = self._shards.get(owner_id)
+            if shard is None:
+                shard = self._shards[owner_id] = _Shard()
+
+            for term, frequency in counts.items():
+                doc_ids = shard.doc_ids.get(term)
+                if doc_ids is None:
+                    doc_ids = shard.doc_ids[term] = array("I")
+                    shard.frequencies[term] = array("H")
+                position = bisect_left(doc_ids, doc_id)
+                doc_ids.insert(position, doc_id)
+                shard.frequencies[term].insert(position, min(frequency, MAX_FREQUENCY))
+
+            length = sum(counts.values())
+            shard.lengths[doc_id] = length
+            shard.terms[doc_id] = tuple(counts)
+            shard.total_length += length
+            self._owners[doc_id] = owner_id
+
+    def remove(self, doc_id, owner_id=None):
+        """Remove a document; with ``owner_id``, only if that owner has it."""
+        with self._lock:
+            if owner_id is None or self._owners.get(doc_id) == owner_id:
+                self._remove(doc_id)
+
+    def _remove(self, doc_id):
+        owner_id = self._owners.pop(doc_id, None)
+        if owner_id is None:
+            return
+        shard = self._shards[owner_id]
+        for term in shard.terms.pop(doc_id):
+            doc_ids = shard.doc_ids[term]
+            position = bisect_left(doc_ids, doc_id)
+            del doc_ids[position]
+            del shard.frequencies[term][position]
+            if not doc_ids:
+                del shard.doc_ids[term]
+                del shard.frequencies[term]
+        shard.total_length -= shard.lengths.pop(doc_id)
+        if not shard.lengths:
+            del self._shards[owner_id]
+
+    def search(self, owner_id, query, limit=20):
+        """Return up to ``limit`` ``(doc_id, score)`` pairs, best first.
+
+        Documents matching any query term are candidates; BM25 rewards those
+        matching more (and rarer) terms.
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            shard = self._shards.get(owner_id)
+            if shard is None or not terms:
+                return []
+
+            document_count = len(shard.lengths)
+            average_length = shard.total_length / document_count or 1
+            k1, b = self.k1, self.b
+            lengths = shard.lengths
+            scores = {}
+            for term in terms:
+                doc_ids = shard.doc_ids.get(term)
+                if doc_ids is None:
+                    continue
+                frequency_of = shard.frequencies[term]
+                idf = math.log(1 + (document_count - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+                for doc_id, frequency in zip(doc_ids, frequency_of):
+                    norm = k1 * (1 - b + b * lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (k1 + 1) / (frequency + norm)
+
+        return heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+
+    def __len__(self):
+        return len(self._owners)
+
+    def stats(self):
+        with self._lock:
+            postings = sum(len(ids) for shard in self._shards.values() for ids in shard.doc_ids.values())
+            terms = sum(len(shard.doc_ids) for shard in self._shards.values())
+        return {
+            "documents": len(self._owners),
+            "owners": len(self._shards),
+            "terms": terms,
+            "postings": postings,
+            "posting_bytes": postings * (array("I").itemsize + array("H").itemsize),
+        }
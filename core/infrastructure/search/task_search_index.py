@@ -0,0 +1,197 @@
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from threading import Lock, Thread
+
+from flask import current_app, has_app_context
+
+from .inverted_index import InvertedIndex
+from ...exceptions.database_error import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+
+class TaskSearchIndex:
+    """Per-worker full-text index over task titles and descriptions.
+
+    The index is built from the database in a background thread when the
+    worker starts; until that finishes :meth:`search` returns ``None`` and
+    callers fall back to the database. Creates, updates and deletes made
+    through this worker are applied immediately (and replayed onto an index
+    that is being built). The repository also logs the id of every task it
+    writes, and before a search the index applies the changes logged since
+    its last sync, at most every ``sync_interval`` seconds, so writes made
+    through other workers show up without rebuilding. Logged changes are
+    pruned after ``change_retention`` seconds; a worker that has not synced
+    for half that long builds its index again. Results must still be re-read
+    from the database, which drops tasks deleted since the last sync.
+    """
+
+    RETRY_INTERVAL = 30
+    # Changes committed out of id order by concurrent transactions are
+    # picked up by re-reading this many ids behind the watermark on every
+    # sync, as in TokenBlocklist.
+    SYNC_OVERLAP = 256
+    PRUNE_INTERVAL = 3600
+
+    def __init__(self, repository, sync_interval=1, change_retention=86400, batch_size=5000, clock=time.monotonic):
+        self.repository = repository
+        self.sync_interval = sync_interval
+        self.change_retention = change_retention
+        self.batch_size = batch_size
+        self._clock = clock
+        self._lock = Lock()
+        self._sync_lock = Lock()
+        self._reset()
+
+    def _reset(self):
+        self.index = None
+        self._pending = None
+        self._building = False
+        self._next_build = 0
+        # Id of the newest change applied, when the index last caught up
+        # with the log, and the applied ids within the overlap.
+        self._last_id = 0
+        self._synced_at = None
+        self._applied = set()
+        self._next_sync = 0
+        self._next_prune = 0
+        self._pid = os.getpid()
+
+    def start(self, app):
+        """Build the index in the background unless it is built or being built."""
+        if self._pid != os.getpid():
+            # Forked from the process that built it: the builder thread did
+            # not survive the fork, so start over in this worker.
+            with self._lock:
+                self._reset()
+        if self.index is None:
+            self._start_build(app)
+
+    def index_task(self, task_id, user_id, title, description=None):
+        self._apply(("add", task_id, user_id, title, description))
+
+    def remove_task(self, user_id, task_id):
+        self._apply(("remove", task_id, user_id))
+
+    def search(self, user_id, query, limit=20):
+        if (self.index is None or self._pid != os.getpid()) and has_app_context():
+            self.start(current_app._get_current_object())
+        elif self.index is not None:
+            self._sync_if_due()
+        index = self.index
+        if index is None:
+            return None
+        return index.search(user_id, query, limit)
+
+    def stats(self):
+        index = self.index
+        return {
+            "ready": index is not None,
+            "last_change_id": self._last_id,
+            **(index.stats() if index is not None else {}),
+        }
+
+    def _apply(self, operation):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(operation)
+            index = self.index
+        if index is not None:
+            self._run(index, operation)
+
+    @staticmethod
+    def _run(index, operation):
+        if operation[0] == "add":
+            index.add(*operation[1:])
+        else:
+            index.remove(*operation[1:])
+
+    def _start_build(self, app):
+        with self._lock:
+            if self._building or self._clock() < self._next_build:
+                return
+            self._building = True
+            self._pending = []
+        Thread(target=self._build, args=(app,), name="task-search-build", daemon=True).start()
+
+    def _build(self, app):
+        index = InvertedIndex()
+        started = self._clock()
+        try:
+            with app.app_context():
+                # The watermark is read before the scan: changes committed
+                # while it runs are applied by the next sync.
+                last_id = self.repository.latest_change_id()
+                for task_id, user_id, title, description in self.repository.iter_task_texts(self.batch_size):
+                    index.add(task_id, user_id, title, description)
+        except Exception:
+            logger.warning("Task search index build failed", exc_info=True)
+            index = None
+
+        with self._sync_lock, self._lock:
+            if index is not None:
+                for operation in self._pending:
+                    self._run(index, operation)
+                self.index = index
+                self._last_id = last_id
+                self._synced_at = started
+                self._applied = set()
+                self._next_sync = 0
+            else:
+                self._next_build = self._clock() + self.RETRY_INTERVAL
+            self._pending = None
+            self._building = False
+
+    def _sync_if_due(self):
+        if self._clock() < self._next_sync:
+            return
+        # One thread catches up; the others search the index as it is.
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            now = self._clock()
+            if now < self._next_sync:
+                return
+            self._next_sync = now + self.sync_interval
+            if now - self._synced_at >= self.change_retention / 2:
+                # Changes this worker has not read may have been pruned; keep
+                # serving the current index until the new one is built. Half
+                # the retention leaves room for clocks that differ between
+                # hosts.
+                if has_app_context():
+                    self._start_build(current_app._get_current_object())
+                return
+            self._sync()
+            self._synced_at = now
+            if now >= self._next_prune:
+                self._next_prune = now + self.PRUNE_INTERVAL
+                cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=self.change_retention)
+                self.repository.delete_changes_before(cutoff)
+        except DatabaseError:
+            logger.warning("Task search index sync failed", exc_info=True)
+        finally:
+            self._sync_lock.release()
+
+    def _sync(self):
+        index = self.index
+        after = max(0, self._last_id - self.SYNC_OVERLAP)
+        while True:
+            rows = self.repository.list_changes_since(after, self.batch_size)
+            for change_id, task_id, user_id, title, description in rows:
+                if change_id in self._applied:
+                    continue
+                # The row carries the task as it is now, so replaying an
+                # older change again is harmless.
+                if user_id is None:
+                    index.remove(task_id)
+                else:
+                    index.add(task_id, user_id, title, description)
+                self._applied.add(change_id)
+                self._last_id = max(self._last_id, change_id)
+            if len(rows) < self.batch_size:
+                break
+            after = rows[-1][0]
+        floor = self._last_id - self.SYNC_OVERLAP
+        self._applied = {change_id for change_id in self._applied if change_id > floor}
@@ -0,0 +1,49 @@
+import hashlib
+import time
+
+from flask_jwt_extended import JWTManager
+
+from ..cache.ttl_cache import TTLCache
+
+
+class CachingJWTManager(JWTManager):
+    """JWTManager that remembers the claims of tokens it has already verified.
+
+    Clients send the same bearer token on every request, so the signature
+    check and claim validation are repeated for identical input. Verified
+    claims are cached under a SHA-256 digest of the token until the token's
+    ``exp`` (or ``JWT_CLAIMS_CACHE_MAX_TTL`` if sooner). Only the decode step
+    is cached: blocklist and user loaders still run on every request. Tokens
+    signed with a rotated secret keep working from cache until they expire.
+    """
+
+    def __init__(self, app=None, add_context_processor=False):
+        self.claims_cache = None
+        super().__init__(app, add_context_processor)
+
+    def init_app(self, app, add_context_processor=False):
+        super().init_app(app, add_context_processor)
+        if app.config.get('JWT_CLAIMS_CACHE_ENABLED'):
+            self.claims_cache = TTLCache(
+                app.config['JWT_CLAIMS_CACHE_MAX_ENTRIES'],
+                app.config['JWT_CLAIMS_CACHE_MAX_TTL'],
+            )
+        else:
+            self.claims_cache = None
+
+    def _decode_jwt_from_config(self, encoded_token, csrf_value=None, allow_expired=False):
+        cache = self.claims_cache
+        if cache is None or csrf_value is not None or allow_expired:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        key = hashlib.sha256(encoded_token.encode()).digest()
+        claims = cache.get(key)
+        if claims is None:
+            claims = super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+            expires_at = claims.get('exp')
+            ttl = cache.ttl if expires_at is None else min(cache.ttl, expires_at - time.time())
+            if ttl > 0:
+                cache.set(key, claims, ttl)
+
+        # Hand out a copy so callers cannot alter the cached claims.
+        return dict(claims)
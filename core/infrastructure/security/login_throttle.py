@@ -0,0 +1,82 @@
+import math
+import time
+
+from ..ratelimit.shared_memory_storage import SlotTable, HEADER, SLOT
+
+
+class LoginThrottle:
+    """Per-username / per-IP login failure tracker with exponential backoff.
+
+    Each key owns one slot of a fixed-size shared table (see
+    :class:`SlotTable`), holding a failure score that halves every
+    ``half_life`` seconds. Once the score reaches ``threshold`` the key is
+    locked for ``base_delay * 2 ** (score - threshold)`` seconds (capped at
+    ``max_delay``) after its last failure. The check is a hash lookup and is
+    meant to run before any database or password hashing work.
+
+    Memory is fixed at ``slots`` entries shared by all workers on the host;
+    when the table is full the least recently failing keys are evicted.
+    """
+
+    # A score left alone this many half-lives has decayed below 1/1000 and
+    # is forgotten.
+    HORIZON_HALF_LIVES = 10
+
+    def __init__(self, path, slots=65536, threshold=5, half_life=300, base_delay=1, max_delay=900):
+        self.table = SlotTable(path, slots)
+        self.threshold = threshold
+        self.half_life = half_life
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.horizon = half_life * self.HORIZON_HALF_LIVES
+
+    def retry_after(self, *keys):
+        """Seconds the caller must wait before trying again (0 if allowed)."""
+        now = time.time()
+        wait = 0
+        with self.table.locked(shared=True) as table:
+            for key in keys:
+                if key is None:
+                    continue
+                _, score, expires_at = table.find(self.table.hash_key(key), now)
+                if score is None:
+                    continue
+                last_failure = expires_at - self.horizon
+                wait = max(wait, last_failure + self._delay(score) - now)
+        return math.ceil(wait) if wait > 0 else 0
+
+    def record_failure(self, *keys):
+        now = time.time()
+        with self.table.locked() as table:
+            for key in keys:
+                if key is None:
+                    continue
+                key_hash = self.table.hash_key(key)
+                index, score, expires_at = table.find(key_hash, now, create=True)
+                if score is None:
+                    score = 0
+                else:
+                    last_failure = expires_at - self.horizon
+                    score *= 0.5 ** ((now - last_failure) / self.half_life)
+                table.write(index, key_hash, score + 1, now + self.horizon)
+
+    def record_success(self, key):
+        now = time.time()
+        key_hash = self.table.hash_key(key)
+        with self.table.locked() as table:
+            index, score, _ = table.find(key_hash, now)
+            if score is not None:
+                table.write(index, key_hash, 0, 0)
+
+    def stats(self):
+        with self.table.locked(shared=True) as table:
+            return {
+                "tracked_keys": table.live_entries(time.time()),
+                "capacity": table.slots,
+                "memory_bytes": HEADER.size + table.slots * SLOT.size,
+            }
+
+    def _delay(self, score):
+        if score < self.threshold:
+            return 0
+        return min(self.max_delay, self.base_delay * 2 ** (score - self.threshold))
@@ -0,0 +1,146 @@
+import fcntl
+import multiprocessing
+import os
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from ...exceptions.service_unavailable_error import ServiceUnavailableError
+
+
+class HostSemaphore:
+    """Counting semaphore shared by every process on the host.
+
+    Slot ``n`` is an exclusive ``flock`` on ``<directory>/<n>.lock``, held
+    through its own file descriptor, so threads of one process compete like
+    separate processes, and the slots of a process that dies are released
+    by the kernel.
+    """
+
+    def __init__(self, directory, size):
+        self.directory = directory
+        self.size = size
+
+    def try_acquire(self):
+        """A held slot to pass to :meth:`release`, or None when all are taken."""
+        os.makedirs(self.directory, exist_ok=True)
+        # Start anywhere so that callers do not all contend for slot 0.
+        start = random.randrange(self.size)
+        for offset in range(self.size):
+            path = os.path.join(self.directory, f"{(start + offset) % self.size}.lock")
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            return fd
+        return None
+
+    @staticmethod
+    def release(slot):
+        os.close(slot)
+
+
+class _ProcessSemaphore:
+    """HostSemaphore interface over a semaphore of this process only."""
+
+    def __init__(self, size):
+        self._semaphore = threading.BoundedSemaphore(size)
+
+    def try_acquire(self):
+        return True if self._semaphore.acquire(blocking=False) else None
+
+    def release(self, slot):
+        self._semaphore.release()
+
+
+class PasswordHasher:
+    """Runs password hashing off the request thread in a process pool.
+
+    Hashing is CPU-bound by design, so it is sent to a pool of up to
+    ``workers`` processes, started as needed. At most ``workers +
+    queue_size`` hashes may be pending at once, counted across every
+    process on the host when ``slots_dir`` is given (see
+    :class:`HostSemaphore`) and in this process otherwise; beyond that
+    calls fail immediately with :class:`ServiceUnavailableError` instead of
+    queueing, which keeps login spikes from piling up behind each other.
+    With ``workers=0`` hashing runs inline (useful for tests and serverless
+    deployments).
+    """
+
+    def __init__(self, method="scrypt", workers=0, queue_size=0, timeout=10, slots_dir=None):
+        self.method = method
+        self.workers = workers
+        self.timeout = timeout
+        if not workers:
+            self._slots = None
+        elif slots_dir:
+            self._slots = HostSemaphore(slots_dir, workers + queue_size)
+        else:
+            self._slots = _ProcessSemaphore(workers + queue_size)
+        self._executor = None
+        self._executor_pid = None
+        self._executor_lock = threading.Lock()
+        self._prefix = None
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True when the hash was produced with other cost parameters."""
+        return password_hash.split("$", 1)[0] != self._method_prefix()
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _method_prefix(self):
+        # werkzeug expands defaults (e.g. "scrypt" -> "scrypt:32768:8:1"), so
+        # derive the canonical prefix from a real hash once.
+        if self._prefix is None:
+            self._prefix = generate_password_hash("", self.method).split("$", 1)[0]
+        return self._prefix
+
+    def _run(self, func, *args):
+        if not self.workers:
+            return func(*args)
+
+        slot = self._slots.try_acquire()
+        if slot is None:
+            raise ServiceUnavailableError("Too many concurrent authentication requests, retry shortly")
+
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._slots.release(slot)
+            raise
+        future.add_done_callback(lambda _: self._slots.release(slot))
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise ServiceUnavailableError("Authentication is taking too long, retry shortly")
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool on the next call.
+            self.shutdown()
+            raise ServiceUnavailableError("Authentication is temporarily unavailable, retry shortly")
+
+    def _get_executor(self):
+        with self._executor_lock:
+            # A forked server worker must not reuse its parent's pool.
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                self._executor_pid = os.getpid()
+            return self._executor
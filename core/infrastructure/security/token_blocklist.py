@@ -0,0 +1,100 @@
+import logging
+import time
+from threading import Lock
+
+from ..cache.bloom_filter import BloomFilter
+from ...exceptions.database_error import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBlocklist:
+    """Revoked JWT ids, persisted in the database and mirrored in a Bloom filter.
+
+    :meth:`is_revoked` runs on every authenticated request. A jti that is not
+    in the in-process filter has certainly not been revoked and is accepted
+    without touching the database; only filter hits (revoked tokens and the
+    ``error_rate`` share of false positives) fall back to a database lookup.
+
+    The filter is built from the table on first use in each worker and then
+    kept current with the worker's own revocations plus an incremental read
+    of rows added by other workers every ``sync_interval`` seconds. When it
+    fills up, or while the table cannot be read, it is rebuilt (with expired
+    rows pruned) and every check goes to the database in the meantime.
+    """
+
+    # Rows committed out of id order by concurrent transactions are picked
+    # up by re-reading this many ids behind the watermark on every sync.
+    SYNC_OVERLAP = 256
+
+    def __init__(self, repository, capacity=100000, error_rate=0.001, sync_interval=5, clock=time.monotonic):
+        self.repository = repository
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self._clock = clock
+        self._filter = None
+        self._last_id = 0
+        self._next_sync = 0
+        self._lock = Lock()
+        self.database_checks = 0
+
+    def revoke(self, jti, expires_at):
+        self.repository.add_token(jti, expires_at)
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+
+    def is_revoked(self, jti):
+        self._sync_if_due()
+        bloom = self._filter
+        if bloom is not None and jti not in bloom:
+            return False
+        self.database_checks += 1
+        return self.repository.is_revoked(jti)
+
+    def rebuild(self):
+        self.repository.delete_expired()
+        rows = self.repository.list_revoked_since(0)
+        bloom = BloomFilter(max(self.capacity, 2 * len(rows)), self.error_rate)
+        for _, jti in rows:
+            bloom.add(jti)
+        self._filter = bloom
+        self._last_id = rows[-1][0] if rows else 0
+
+    def _sync_if_due(self):
+        if self._clock() < self._next_sync:
+            return
+        # One thread refreshes; the others keep using the current filter.
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            now = self._clock()
+            if now < self._next_sync:
+                return
+            self._next_sync = now + self.sync_interval
+            if self._filter is None or self._filter.is_full:
+                self.rebuild()
+            else:
+                self._sync()
+        except DatabaseError:
+            logger.warning("Token blocklist refresh failed; checking revocations in the database", exc_info=True)
+        finally:
+            self._lock.release()
+
+    def _sync(self):
+        rows = self.repository.list_revoked_since(max(0, self._last_id - self.SYNC_OVERLAP))
+        for row_id, jti in rows:
+            if jti not in self._filter:
+                self._filter.add(jti)
+            self._last_id = max(self._last_id, row_id)
+
+    def stats(self):
+        bloom = self._filter
+        return {
+            "ready": bloom is not None,
+            "size": len(bloom) if bloom is not None else 0,
+            "capacity": bloom.capacity if bloom is not None else self.capacity,
+            "memory_bytes": bloom.memory_bytes if bloom is not None else 0,
+            "database_checks": self.database_checks,
+        }
\ No newline at end of file
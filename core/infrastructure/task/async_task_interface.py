@@ -0,0 +1,42 @@
+from abc import ABC, abstractmethod
+
+class AsyncTaskRepositoryInterface(ABC):
+    @abstractmethod
+    async def create_task(self, task):
+        pass
+
+    @abstractmethod
+    async def create_tasks(self, tasks, chunk_size=500):
+        pass
+
+    @abstractmethod
+    async def get_one_task(self, user_id, task_id):
+        pass
+
+    @abstractmethod
+    async def list_task(self, user_id):
+        pass
+
+    @abstractmethod
+    async def list_task_page(self, user_id, limit, after=None, filters=None, order_by=("id",), descending=False):
+        pass
+
+    @abstractmethod
+    async def get_tasks_by_ids(self, user_id, task_ids):
+        pass
+
+    @abstractmethod
+    async def patch_task(self, user_id, task_id, changes):
+        pass
+
+    @abstractmethod
+    async def update_tasks(self, user_id, values, task_ids=None, is_completed=None):
+        pass
+
+    @abstractmethod
+    async def delete_task_by_id(self, user_id, task_id):
+        pass
+
+    @abstractmethod
+    async def delete_tasks(self, user_id, task_ids=None, is_completed=None):
+        pass
\ No newline at end of file
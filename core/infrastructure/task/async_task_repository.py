@@ -0,0 +1,166 @@
+from collections import Counter
+from itertools import islice
+
+from sqlalchemy import select, insert, update, delete, tuple_
+
+from ...domain.task import Task
+from ...domain.task_change import TaskChange
+from ...infrastructure.task.async_task_interface import AsyncTaskRepositoryInterface
+from ...infrastructure.task.task_repository import TaskRepository
+
+class AsyncTaskRepository(AsyncTaskRepositoryInterface):
+    # asyncio version of TaskRepository for the ASGI app: same statements,
+    # same owner scoping and counter updates, but every call awaits the
+    # database instead of blocking a worker. Each call runs in its own
+    # session; returned tasks are detached and fully loaded.
+
+    _list_filters = staticmethod(TaskRepository._list_filters)
+    _selection = staticmethod(TaskRepository._selection)
+    _rows = staticmethod(TaskRepository._rows)
+    _bulk_insert = staticmethod(TaskRepository._bulk_insert)
+    _change_rows = staticmethod(TaskRepository._change_rows)
+
+    def __init__(self, database, stats_repository=None, log_changes=False):
+        self.database = database
+        self.stats_repository = stats_repository
+        self.log_changes = log_changes
+
+    async def create_task(self, task):
+        async with self.database.session() as session, session.begin():
+            session.add(task)
+            await session.flush()
+            await self._record(session, task.user_id, total=1, completed=int(bool(task.is_completed)), created=1)
+            await self._log_changes(session, [task.id])
+
+    async def create_tasks(self, tasks, chunk_size=500):
+        created_ids = []
+        totals = Counter()
+        completed = Counter()
+        tasks = iter(tasks)
+        async with self.database.session() as session, session.begin():
+            while True:
+                chunk = list(islice(tasks, chunk_size))
+                if not chunk:
+                    break
+                # One multi-row INSERT per chunk, as in TaskRepository.create_tasks.
+                rows = self._rows(chunk)
+                statement, parameters, read_ids = self._bulk_insert(session.bind.dialect, rows)
+                chunk_ids = await session.run_sync(
+                    lambda sync_session: read_ids(sync_session.execute(statement, parameters), sync_session.execute)
+                )
+                await self._log_changes(session, chunk_ids)
+                created_ids.extend(chunk_ids)
+                for row in rows:
+                    totals[row['user_id']] += 1
+                    completed[row['user_id']] += bool(row['is_completed'])
+            for user_id, total in totals.items():
+                await self._record(session, user_id, total=total, completed=completed[user_id], created=total)
+        return created_ids
+
+    async def get_one_task(self, user_id, task_id):
+        return await self._scalar(select(Task).where(Task.id == task_id, Task.user_id == user_id).limit(1), replica=True)
+
+    async def list_task(self, user_id):
+        return await self._scalars(select(Task).where(Task.user_id == user_id).order_by(Task.id), replica=True)
+
+    async def list_task_page(self, user_id, limit, after=None, filters=None, order_by=("id",), descending=False):
+        # Keyset pagination, as in TaskRepository.list_task_page.
+        columns = [getattr(Task, name) for name in order_by]
+        statement = select(Task).where(
+            Task.user_id == user_id, *self._list_filters(filters or {}, self.database.engine.dialect)
+        )
+        if after is not None:
+            key = tuple_(*columns)
+            statement = statement.where(key < tuple(after) if descending else key > tuple(after))
+        ordering = [column.desc() if descending else column for column in columns]
+        return await self._scalars(statement.order_by(*ordering).limit(limit), replica=True)
+
+    async def get_tasks_by_ids(self, user_id, task_ids):
+        if not task_ids:
+            return []
+        return await self._scalars(select(Task).where(Task.user_id == user_id, Task.id.in_(task_ids)))
+
+    async def patch_task(self, user_id, task_id, changes):
+        if not changes:
+            return await self.get_one_task(user_id, task_id)
+
+        statement = update(Task).where(Task.id == task_id, Task.user_id == user_id).values(**changes)
+        options = {"synchronize_session": False}
+
+        async with self.database.session() as session, session.begin():
+            if self.stats_repository and changes.get('is_completed') is not None:
+                flipped = await self._update_completed(session, changes['is_completed'], Task.id == task_id, Task.user_id == user_id)
+                await self._record(session, user_id, completed=flipped if changes['is_completed'] else -flipped)
+
+            if session.bind.dialect.update_returning:
+                task = (await session.execute(statement.returning(Task), execution_options=options)).scalars().first()
+            elif (await session.execute(statement, execution_options=options)).rowcount:
+                task = await session.get(Task, task_id, populate_existing=True)
+            else:
+                task = None
+
+            if task is not None and ('title' in changes or 'description' in changes):
+                await self._log_changes(session, [task_id])
+        return task
+
+    async def update_tasks(self, user_id, values, task_ids=None, is_completed=None):
+        criteria = self._selection(user_id, task_ids, is_completed)
+        async with self.database.session() as session, session.begin():
+            if set(values) == {'is_completed'}:
+                affected = await self._update_completed(session, values['is_completed'], *criteria)
+                await self._record(session, user_id, completed=affected if values['is_completed'] else -affected)
+                return affected
+
+            if self.log_changes and {'title', 'description', 'user_id'} & set(values):
+                changed = (await session.execute(select(Task.id).where(*criteria).with_for_update())).scalars().all()
+                await self._log_changes(session, changed)
+            statement = update(Task).where(*criteria).values(**values).execution_options(synchronize_session=False)
+            return (await session.execute(statement)).rowcount
+
+    async def delete_task_by_id(self, user_id, task_id):
+        async with self.database.session() as session, session.begin():
+            return bool(await self._delete(session, user_id, Task.id == task_id, Task.user_id == user_id))
+
+    async def delete_tasks(self, user_id, task_ids=None, is_completed=None):
+        async with self.database.session() as session, session.begin():
+            return await self._delete(session, user_id, *self._selection(user_id, task_ids, is_completed))
+
+    async def _scalar(self, statement, replica=False):
+        # replica=True lets a read replica serve the statement (see ReplicaPool).
+        async with self.database.session() as session:
+            return (await session.execute(statement.execution_options(replica=replica))).scalars().first()
+
+    async def _scalars(self, statement, replica=False):
+        async with self.database.session() as session:
+            return list((await session.execute(statement.execution_options(replica=replica))).scalars())
+
+    async def _update_completed(self, session, value, *criteria):
+        differs = Task.is_completed.is_not(True) if value else Task.is_completed.is_(True)
+        statement = (
+            update(Task)
+            .where(*criteria, differs)
+            .values(is_completed=value)
+            .execution_options(synchronize_session=False)
+        )
+        return (await session.execute(statement)).rowcount
+
+    async def _delete(self, session, user_id, *criteria):
+        # Reads the deleted rows back, as TaskRepository._delete does.
+        statement = delete(Task).where(*criteria).execution_options(synchronize_session=False)
+        if session.bind.dialect.delete_returning:
+            rows = (await session.execute(statement.returning(Task.id, Task.is_completed))).all()
+        else:
+            rows = (await session.execute(select(Task.id, Task.is_completed).where(*criteria).with_for_update())).all()
+            await session.execute(statement)
+        deleted_ids = [task_id for task_id, _ in rows]
+        await self._record(session, user_id, total=-len(rows), completed=-sum(1 for _, completed in rows if completed))
+        await self._log_changes(session, deleted_ids)
+        return deleted_ids
+
+    async def _record(self, session, user_id, **deltas):
+        if self.stats_repository and user_id is not None:
+            await self.stats_repository.record(session, user_id, **deltas)
+
+    async def _log_changes(self, session, task_ids):
+        if self.log_changes and task_ids:
+            await session.execute(insert(TaskChange), self._change_rows(task_ids))
@@ -0,0 +1,29 @@
+from sqlalchemy import insert, update
+
+from .async_task_stats_repository_interface import AsyncTaskStatsRepositoryInterface
+from .task_stats_repository import stat_increments, upsert_increment
+
+
+class AsyncTaskStatsRepository(AsyncTaskStatsRepositoryInterface):
+    """asyncio counterpart of :class:`TaskStatsRepository` for the ASGI app.
+
+    :meth:`record` takes the session of the transaction that changes the
+    tasks, so counters and rows commit (or roll back) together, and issues
+    the same atomic upserts.
+    """
+
+    async def record(self, session, user_id, total=0, completed=0, created=0, day=None):
+        dialect = session.bind.dialect.name
+        for table, keys, deltas in stat_increments(user_id, total, completed, created, day):
+            statement = upsert_increment(dialect, table, keys, deltas)
+            if statement is None:
+                matched = (await session.execute(
+                    update(table)
+                    .where(*(table.c[key] == value for key, value in keys.items()))
+                    .values({column: table.c[column] + delta for column, delta in deltas.items()})
+                )).rowcount
+                if matched:
+                    continue
+                statement = insert(table).values(**keys, **deltas)
+
+            await session.execute(statement)
@@ -0,0 +1,7 @@
+from abc import ABC, abstractmethod
+from datetime import date
+
+class AsyncTaskStatsRepositoryInterface(ABC):
+    @abstractmethod
+    async def record(self, session, user_id: int, total: int = 0, completed: int = 0, created: int = 0, day: date = None):
+        pass
\ No newline at end of file
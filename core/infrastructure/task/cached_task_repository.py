@@ -0,0 +1,122 @@
+from ...domain.task import Task
+from ...infrastructure.task.task_interface import TaskRepositoryInterface
+
+class CachedTaskRepository(TaskRepositoryInterface):
+    """Read-through cache in front of another task repository.
+
+    Single task reads are served from a bounded LRU/TTL cache of detached
+    snapshots. Writes made through this repository invalidate the affected
+    entries; writes made by other processes become visible once the TTL
+    expires, so keep the TTL short when running several workers. Snapshots
+    record the owner and are only served to that user.
+    """
+
+    def __init__(self, repository: TaskRepositoryInterface, cache):
+        self.repository = repository
+        self.cache = cache
+
+    def create_task(self, task):
+        result = self.repository.create_task(task)
+        self.cache.delete(task.id)
+        return result
+
+    def create_tasks(self, tasks, chunk_size=500):
+        return self.repository.create_tasks(tasks, chunk_size)
+
+    def get_one_task(self, user_id, task_id):
+        snapshot = self.cache.get(task_id)
+        if snapshot is not None:
+            # Ids are global, so a cached task owned by someone else means
+            # this user has no task with that id.
+            return self._restore(snapshot) if snapshot[4] == user_id else None
+
+        task = self.repository.get_one_task(user_id, task_id)
+        if task is not None:
+            self.cache.set(task_id, self._snapshot(task))
+        return task
+
+    def list_task(self, user_id):
+        return self.repository.list_task(user_id)
+
+    def list_task_page(self, user_id, limit, after=None, filters=None, order_by=("id",), descending=False):
+        return self.repository.list_task_page(user_id, limit, after, filters, order_by, descending)
+
+    def iter_tasks(self, user_id, batch_size=1000):
+        return self.repository.iter_tasks(user_id, batch_size)
+
+    def get_tasks_by_ids(self, user_id, task_ids):
+        return self.repository.get_tasks_by_ids(user_id, task_ids)
+
+    def search_tasks(self, user_id, terms, limit):
+        return self.repository.search_tasks(user_id, terms, limit)
+
+    def iter_task_texts(self, batch_size=1000):
+        return self.repository.iter_task_texts(batch_size)
+
+    def update_task(self, user_id, task_id, title=None, description=None, is_completed=None):
+        try:
+            return self.repository.update_task(user_id, task_id, title, description, is_completed)
+        finally:
+            self.cache.delete(task_id)
+
+    def patch_task(self, user_id, task_id, changes):
+        try:
+            return self.repository.patch_task(user_id, task_id, changes)
+        finally:
+            self.cache.delete(task_id)
+
+    def update_tasks(self, user_id, values, task_ids=None, is_completed=None):
+        try:
+            return self.repository.update_tasks(user_id, values, task_ids, is_completed)
+        finally:
+            self._invalidate_many(task_ids)
+
+    def delete_task(self, task):
+        task_id = task.id
+        try:
+            return self.repository.delete_task(task)
+        finally:
+            self.cache.delete(task_id)
+
+    def delete_task_by_id(self, user_id, task_id):
+        try:
+            return self.repository.delete_task_by_id(user_id, task_id)
+        finally:
+            self.cache.delete(task_id)
+
+    def delete_tasks(self, user_id, task_ids=None, is_completed=None):
+        try:
+            return self.repository.delete_tasks(user_id, task_ids, is_completed)
+        finally:
+            self._invalidate_many(task_ids)
+
+    def list_changes_since(self, last_id=0, limit=1000):
+        return self.repository.list_changes_since(last_id, limit)
+
+    def latest_change_id(self):
+        return self.repository.latest_change_id()
+
+    def delete_changes_before(self, cutoff):
+        return self.repository.delete_changes_before(cutoff)
+
+    def stats(self):
+        return self.cache.stats()
+
+    def _invalidate_many(self, task_ids):
+        # Filter-based statements can touch any row, so drop everything.
+        if task_ids is None:
+            self.cache.clear()
+            return
+        for task_id in task_ids:
+            self.cache.delete(task_id)
+
+    @staticmethod
+    def _snapshot(task):
+        return (task.id, task.title, task.description, task.is_completed, task.user_id)
+
+    @staticmethod
+    def _restore(snapshot):
+        task_id, title, description, is_completed, user_id = snapshot
+        task = Task(title, description, is_completed, user_id)
+        task.id = task_id
+        return task
@@ -6,17 +6,69 @@ class TaskRepositoryInterface(ABC):
         pass
 
     @abstractmethod
-    def get_one_task(self, task_id):
+    def create_tasks(self, tasks, chunk_size=500):
         pass
 
     @abstractmethod
-    def list_task(self):
+    def get_one_task(self, user_id, task_id):
         pass
 
     @abstractmethod
-    def update_task(self, task_id, title=None, description=None, is_completed=None):
+    def list_task(self, user_id):
+        pass
+
+    @abstractmethod
+    def list_task_page(self, user_id, limit, after=None, filters=None, order_by=("id",), descending=False):
+        pass
+
+    @abstractmethod
+    def iter_tasks(self, user_id, batch_size=1000):
+        pass
+
+    @abstractmethod
+    def get_tasks_by_ids(self, user_id, task_ids):
+        pass
+
+    @abstractmethod
+    def search_tasks(self, user_id, terms, limit):
+        pass
+
+    @abstractmethod
+    def iter_task_texts(self, batch_size=1000):
+        pass
+
+    @abstractmethod
+    def update_task(self, user_id, task_id, title=None, description=None, is_completed=None):
+        pass
+
+    @abstractmethod
+    def patch_task(self, user_id, task_id, changes):
+        pass
+
+    @abstractmethod
+    def update_tasks(self, user_id, values, task_ids=None, is_completed=None):
         pass
 
     @abstractmethod
     def delete_task(self, task):
-        pass 
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def delete_task_by_id(self, user_id, task_id):
+        pass
+
+    @abstractmethod
+    def delete_tasks(self, user_id, task_ids=None, is_completed=None):
+        pass 
+
+    @abstractmethod
+    def list_changes_since(self, last_id=0, limit=1000):
+        pass
+
+    @abstractmethod
+    def latest_change_id(self):
+        pass
+
+    @abstractmethod
+    def delete_changes_before(self, cutoff):
+        pass
\ No newline at end of file
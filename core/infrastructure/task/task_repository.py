@@ -1,27 +1,359 @@
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import islice
+
+from sqlalchemy import select, insert, update, delete, tuple_, or_, text, func
+from sqlalchemy.exc import SQLAlchemyError
+
 from ...config.extension import db
 from ...domain.task import Task
+from ...domain.task_change import TaskChange
+from ...exceptions.database_error import DatabaseError
 from ...infrastructure.task.task_interface import TaskRepositoryInterface
 
 class TaskRepository(TaskRepositoryInterface):  
+    # Every read and write is scoped to the owning user, so a task id that
+    # belongs to somebody else behaves exactly like one that does not exist.
+    # Writes also apply their effect on the owner's counters (see
+    # TaskStatsRepository) inside the same transaction. With log_changes,
+    # they also record the ids of the tasks whose text or existence changed
+    # in task_changes, which the search index of every worker replays.
+
+    def __init__(self, stats_repository=None, log_changes=False):
+        self.stats_repository = stats_repository
+        self.log_changes = log_changes
+
     def create_task(self, task):
         with db.session.begin():
             db.session.add(task)
+            self._record(task.user_id, total=1, completed=int(bool(task.is_completed)), created=1)
+            if self.log_changes:
+                db.session.flush()
+                self._log_changes([task.id])
+
+    def create_tasks(self, tasks, chunk_size=500):
+        # One transaction for the whole batch and one multi-row INSERT per
+        # chunk. The ORM unit of work would send a statement per task to
+        # read each new id back (see _bulk_insert).
+        created_ids = []
+        totals = Counter()
+        completed = Counter()
+        tasks = iter(tasks)
+        with db.session.begin():
+            while True:
+                chunk = list(islice(tasks, chunk_size))
+                if not chunk:
+                    break
+                rows = self._rows(chunk)
+                statement, parameters, read_ids = self._bulk_insert(self._dialect(), rows)
+                chunk_ids = read_ids(db.session.execute(statement, parameters), db.session.execute)
+                self._log_changes(chunk_ids)
+                created_ids.extend(chunk_ids)
+                for row in rows:
+                    totals[row['user_id']] += 1
+                    completed[row['user_id']] += bool(row['is_completed'])
+            for user_id, total in totals.items():
+                self._record(user_id, total=total, completed=completed[user_id], created=total)
+        return created_ids
     
-    def get_one_task(self, task_id):
-        return db.session.query(Task).filter_by(id=task_id).first()
+    # Plain reads may be served by a read replica (see ReplicaPool); reads
+    # made as part of a write are not marked and stay on the primary.
 
-    def list_task(self):
-        return db.session.query(Task).all()
+    def get_one_task(self, user_id, task_id):
+        return db.session.query(Task).execution_options(replica=True).filter_by(id=task_id, user_id=user_id).first()
+
+    def list_task(self, user_id):
+        return db.session.query(Task).execution_options(replica=True).filter_by(user_id=user_id).order_by(Task.id).all()
+
+    def list_task_page(self, user_id, limit, after=None, filters=None, order_by=("id",), descending=False):
+        # Keyset pagination: seeks past the sort key of the previous page's
+        # last row instead of using OFFSET, so every page costs the same no
+        # matter how deep the client is. order_by must end with "id" to make
+        # the key unique.
+        columns = [getattr(Task, name) for name in order_by]
+        query = (
+            db.session.query(Task)
+            .execution_options(replica=True)
+            .filter(Task.user_id == user_id, *self._list_filters(filters or {}, self._dialect()))
+        )
+        if after is not None:
+            key = tuple_(*columns)
+            query = query.filter(key < tuple(after) if descending else key > tuple(after))
+        ordering = [column.desc() if descending else column for column in columns]
+        return query.order_by(*ordering).limit(limit).all()
+
+    def iter_tasks(self, user_id, batch_size=1000):
+        # stream_results asks the driver for a server-side cursor and yield_per
+        # buffers only batch_size rows, so memory stays flat for any table size.
+        statement = (
+            select(Task)
+            .where(Task.user_id == user_id)
+            .order_by(Task.id)
+            .execution_options(stream_results=True, yield_per=batch_size)
+        )
+        for task in db.session.execute(statement).scalars():
+            yield task
     
-    def update_task(self, task_id, title=None, description=None, is_completed=None):
+    def get_tasks_by_ids(self, user_id, task_ids):
+        if not task_ids:
+            return []
+        return db.session.query(Task).filter(Task.user_id == user_id, Task.id.in_(task_ids)).all()
+
+    def search_tasks(self, user_id, terms, limit):
+        # Unindexed substring scan; only used while the search index is not
+        # available.
+        criteria = [
+            column.icontains(term, autoescape=True)
+            for term in terms
+            for column in (Task.title, Task.description)
+        ]
+        return (
+            db.session.query(Task)
+            .filter(Task.user_id == user_id, or_(*criteria))
+            .order_by(Task.id.desc())
+            .limit(limit)
+            .all()
+        )
+
+    def iter_task_texts(self, batch_size=1000):
+        # Plain rows rather than ORM objects: this feeds the search index
+        # rebuild and reads every task of every user.
+        statement = (
+            select(Task.id, Task.user_id, Task.title, Task.description)
+            .where(Task.user_id.is_not(None))
+            .execution_options(stream_results=True, yield_per=batch_size)
+        )
+        for row in db.session.execute(statement):
+            yield tuple(row)
+
+    def update_task(self, user_id, task_id, title=None, description=None, is_completed=None):
+        changes = {
+            'title': title,
+            'description': description,
+            'is_completed': is_completed
+        }
+        return self.patch_task(user_id, task_id, {key: value for key, value in changes.items() if value is not None})
+
+    def patch_task(self, user_id, task_id, changes):
+        if not changes:
+            return self.get_one_task(user_id, task_id)
+
+        statement = update(Task).where(Task.id == task_id, Task.user_id == user_id).values(**changes)
+        options = {"synchronize_session": False}
+
         with db.session.begin():
-            db.session.query(Task).filter_by(id=task_id).update({
-                'title': title,
-                'description': description,
-                'is_completed': is_completed
-            })
-            return db.session.query(Task).filter_by(id=task_id).first()
+            if self.stats_repository and changes.get('is_completed') is not None:
+                # Flip the status first, only where it differs: the row count
+                # is exactly the change to the completed counter.
+                flipped = self._update_completed(changes['is_completed'], Task.id == task_id, Task.user_id == user_id)
+                self._record(user_id, completed=flipped if changes['is_completed'] else -flipped)
+
+            if self._dialect().update_returning:
+                # UPDATE ... RETURNING applies the change and reads the row back
+                # in a single round trip; no row means the user has no such task.
+                task = db.session.execute(statement.returning(Task), execution_options=options).scalars().first()
+            elif db.session.execute(statement, execution_options=options).rowcount:
+                task = db.session.get(Task, task_id, populate_existing=True)
+            else:
+                task = None
+
+            if task is not None and ('title' in changes or 'description' in changes):
+                self._log_changes([task_id])
+
+            if task is not None:
+                # Detach before commit so the loaded values are not expired and
+                # reloaded by the caller.
+                db.session.expunge(task)
+        return task
+
+    def update_tasks(self, user_id, values, task_ids=None, is_completed=None):
+        # Rows that already have the requested status are skipped, so the
+        # affected count is the number of tasks that actually changed.
+        criteria = self._selection(user_id, task_ids, is_completed)
+        with db.session.begin():
+            if set(values) == {'is_completed'}:
+                affected = self._update_completed(values['is_completed'], *criteria)
+                self._record(user_id, completed=affected if values['is_completed'] else -affected)
+                return affected
+
+            if self.log_changes and {'title', 'description', 'user_id'} & set(values):
+                self._log_changes(db.session.execute(select(Task.id).where(*criteria).with_for_update()).scalars().all())
+            statement = update(Task).where(*criteria).values(**values).execution_options(synchronize_session=False)
+            return db.session.execute(statement).rowcount
 
     def delete_task(self, task):
         with db.session.begin():
             db.session.delete(task)
+            self._record(task.user_id, total=-1, completed=-int(bool(task.is_completed)))
+            self._log_changes([task.id])
+
+    def delete_task_by_id(self, user_id, task_id):
+        with db.session.begin():
+            return bool(self._delete(user_id, Task.id == task_id, Task.user_id == user_id))
+
+    def delete_tasks(self, user_id, task_ids=None, is_completed=None):
+        # Returns the ids of the deleted tasks.
+        with db.session.begin():
+            return self._delete(user_id, *self._selection(user_id, task_ids, is_completed))
+
+    # The change log is read and pruned on its own connection, like the token
+    # blocklist: the search index syncs in the middle of a request.
+
+    def list_changes_since(self, last_id=0, limit=1000):
+        """``(change id, task id, user id, title, description)`` of the
+        changes after ``last_id``, oldest first, with the current text of the
+        task; user id, title and description are None for deleted tasks."""
+        statement = (
+            select(TaskChange.id, TaskChange.task_id, Task.user_id, Task.title, Task.description)
+            .join_from(TaskChange, Task, Task.id == TaskChange.task_id, isouter=True)
+            .where(TaskChange.id > last_id)
+            .order_by(TaskChange.id)
+            .limit(limit)
+        )
+        try:
+            with db.engine.connect() as connection:
+                return [tuple(row) for row in connection.execute(statement)]
+        except SQLAlchemyError as e:
+            raise DatabaseError("Error loading task changes") from e
+
+    def latest_change_id(self):
+        try:
+            with db.engine.connect() as connection:
+                return connection.execute(select(func.max(TaskChange.id))).scalar() or 0
+        except SQLAlchemyError as e:
+            raise DatabaseError("Error loading task changes") from e
+
+    def delete_changes_before(self, cutoff):
+        try:
+            with db.engine.begin() as connection:
+                return connection.execute(delete(TaskChange).where(TaskChange.created_at < cutoff)).rowcount
+        except SQLAlchemyError as e:
+            raise DatabaseError("Error pruning task changes") from e
+
+    def _update_completed(self, value, *criteria):
+        # NULL counts as open, like in the counters.
+        differs = Task.is_completed.is_not(True) if value else Task.is_completed.is_(True)
+        statement = (
+            update(Task)
+            .where(*criteria, differs)
+            .values(is_completed=value)
+            .execution_options(synchronize_session=False)
+        )
+        return db.session.execute(statement).rowcount
+
+    def _delete(self, user_id, *criteria):
+        # The deleted rows are read back so that callers learn their ids and
+        # the counters are adjusted by their status: in one round trip with
+        # DELETE ... RETURNING, otherwise locked by SELECT ... FOR UPDATE
+        # first so that the DELETE removes exactly those rows.
+        statement = delete(Task).where(*criteria).execution_options(synchronize_session=False)
+        if self._dialect().delete_returning:
+            rows = db.session.execute(statement.returning(Task.id, Task.is_completed)).all()
+        else:
+            rows = db.session.execute(select(Task.id, Task.is_completed).where(*criteria).with_for_update()).all()
+            db.session.execute(statement)
+        deleted_ids = [task_id for task_id, _ in rows]
+        self._record(user_id, total=-len(rows), completed=-sum(1 for _, completed in rows if completed))
+        self._log_changes(deleted_ids)
+        return deleted_ids
+
+    def _record(self, user_id, **deltas):
+        if self.stats_repository and user_id is not None:
+            self.stats_repository.record(user_id, **deltas)
+
+    def _log_changes(self, task_ids):
+        if self.log_changes and task_ids:
+            db.session.execute(insert(TaskChange), self._change_rows(task_ids))
+
+    @staticmethod
+    def _change_rows(task_ids):
+        # Naive UTC, like the other DateTime columns.
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return [{'task_id': task_id, 'created_at': now} for task_id in task_ids]
+
+    @staticmethod
+    def _dialect():
+        return db.session.get_bind(mapper=Task.__mapper__).dialect
+
+    @staticmethod
+    def _rows(tasks):
+        return [
+            {'title': task.title, 'description': task.description, 'is_completed': task.is_completed, 'user_id': task.user_id}
+            for task in tasks
+        ]
+
+    @staticmethod
+    def _bulk_insert(dialect, rows):
+        """``(statement, parameters, read_ids)`` inserting ``rows`` in one
+        statement.
+
+        ``read_ids(result, execute)`` returns the new ids in row order from
+        the statement's result, running any follow-up query with
+        ``execute`` on the same connection.
+        """
+        if dialect.name in ('mysql', 'mariadb'):
+            # PyMySQL has no RETURNING; InnoDB gives the rows of a multi-row
+            # INSERT consecutive ids, the first one being LAST_INSERT_ID().
+            def read_ids(result, execute):
+                first, step = execute(text('SELECT LAST_INSERT_ID(), @@auto_increment_increment')).one()
+                return list(range(first, first + step * len(rows), step))
+
+            return insert(Task).values(rows), None, read_ids
+        if dialect.name == 'sqlite':
+            # SQLite cannot batch an ordered RETURNING. Its single writer
+            # gives the rows consecutive ids, the last one being lastrowid.
+            def read_ids(result, execute):
+                last = result.lastrowid
+                return list(range(last - len(rows) + 1, last + 1))
+
+            return insert(Task).values(rows), None, read_ids
+        # Dialects with ordered insertmanyvalues batches (PostgreSQL, ...).
+        statement = insert(Task).returning(Task.id, sort_by_parameter_order=True)
+        return statement, rows, lambda result, execute: list(result.scalars())
+
+    @staticmethod
+    def _list_filters(filters, dialect=None):
+        criteria = []
+        if filters.get('is_completed') is not None:
+            criteria.append(Task.is_completed == filters['is_completed'])
+        if filters.get('title'):
+            criteria.extend(TaskRepository._title_prefix(filters['title'], dialect))
+        if filters.get('min_id') is not None:
+            criteria.append(Task.id >= filters['min_id'])
+        if filters.get('max_id') is not None:
+            criteria.append(Task.id <= filters['max_id'])
+        return criteria
+
+    @staticmethod
+    def _title_prefix(prefix, dialect=None):
+        if dialect is None or dialect.name != 'sqlite':
+            # LIKE with a literal 'prefix%' pattern: MySQL and PostgreSQL
+            # turn it into a range on the title index in the column's own
+            # collation, where the next code point is not the next string.
+            escaped = prefix.replace('/', '//').replace('%', '/%').replace('_', '/_')
+            return [Task.title.like(escaped + '%', escape='/')]
+
+        # SQLite's LIKE ignores ASCII case and cannot use the index, but its
+        # BINARY collation compares in code point order, so a half-open
+        # range is exact there.
+        last = ord(prefix[-1])
+        if last == sys.maxunicode:
+            # No upper bound: seek from the prefix and check the rest.
+            return [Task.title >= prefix, func.substr(Task.title, 1, len(prefix)) == prefix]
+        # Surrogates cannot be stored; U+E000 directly follows U+D7FF.
+        upper = 0xE000 if 0xD800 <= last + 1 <= 0xDFFF else last + 1
+        return [Task.title >= prefix, Task.title < prefix[:-1] + chr(upper)]
+
+    @staticmethod
+    def _selection(user_id, task_ids=None, is_completed=None):
+        criteria = []
+        if task_ids is not None:
+            criteria.append(Task.id.in_(task_ids))
+        if is_completed is not None:
+            criteria.append(Task.is_completed == is_completed)
+        if not criteria:
+            # Never let a set-based statement silently hit the whole table.
+            raise ValueError("A bulk task statement needs at least one criterion")
+        criteria.append(Task.user_id == user_id)
+        return criteria
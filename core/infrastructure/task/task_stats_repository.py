@@ -0,0 +1,90 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from ...config.extension import db
+from ...domain.task_stats import TaskStats
+from ...domain.task_daily_stats import TaskDailyStats
+from .task_stats_repository_interface import TaskStatsRepositoryInterface
+
+_UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+class TaskStatsRepository(TaskStatsRepositoryInterface):
+    """Per-user task counters kept next to the tasks they describe.
+
+    :meth:`record` applies deltas and must run inside the transaction that
+    changes the tasks, so counters and rows commit (or roll back) together.
+    Each delta is a single atomic upsert, so concurrent writers never lose
+    increments. Reading the dashboard numbers is then a primary key lookup
+    plus a short range scan instead of ``COUNT(*)`` over the tasks table.
+    """
+
+    def record(self, user_id, total=0, completed=0, created=0, day=None):
+        for table, keys, deltas in stat_increments(user_id, total, completed, created, day):
+            self._increment(table, keys, deltas)
+
+    def get_stats(self, user_id, since):
+        totals = db.session.execute(
+            select(TaskStats.total, TaskStats.completed).where(TaskStats.user_id == user_id)
+        ).first()
+        created_per_day = db.session.execute(
+            select(TaskDailyStats.day, TaskDailyStats.created)
+            .where(TaskDailyStats.user_id == user_id, TaskDailyStats.day >= since)
+            .order_by(TaskDailyStats.day)
+        ).all()
+
+        total, completed = totals if totals else (0, 0)
+        return {
+            "total": total,
+            "completed": completed,
+            "created_per_day": {day: created for day, created in created_per_day},
+        }
+
+    @staticmethod
+    def _increment(table, keys, deltas):
+        dialect = db.session.get_bind(mapper=TaskStats.__mapper__).dialect.name
+        statement = upsert_increment(dialect, table, keys, deltas)
+        if statement is None:
+            matched = db.session.execute(
+                update(table)
+                .where(*(table.c[key] == value for key, value in keys.items()))
+                .values({column: table.c[column] + delta for column, delta in deltas.items()})
+            ).rowcount
+            if matched:
+                return
+            statement = insert(table).values(**keys, **deltas)
+
+        db.session.execute(statement)
+
+
+def stat_increments(user_id, total=0, completed=0, created=0, day=None):
+    """The ``(table, keys, deltas)`` counter changes for one :meth:`record`."""
+    if total or completed:
+        yield TaskStats.__table__, {"user_id": user_id}, {"total": total, "completed": completed}
+    if created:
+        day = day or datetime.now(timezone.utc).date()
+        yield TaskDailyStats.__table__, {"user_id": user_id, "day": day}, {"created": created}
+
+
+def upsert_increment(dialect, table, keys, deltas):
+    """Single-statement atomic increment, or None when the dialect has no
+    upsert and the caller must UPDATE first and INSERT when nothing matched."""
+    values = {**keys, **deltas}
+
+    if dialect in _UPSERT_INSERTS:
+        statement = _UPSERT_INSERTS[dialect](table).values(**values)
+        return statement.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={column: table.c[column] + statement.excluded[column] for column in deltas},
+        )
+    if dialect in ("mysql", "mariadb"):
+        statement = mysql.insert(table).values(**values)
+        return statement.on_duplicate_key_update(
+            {column: table.c[column] + statement.inserted[column] for column in deltas}
+        )
+    return None
\ No newline at end of file
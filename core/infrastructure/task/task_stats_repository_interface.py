@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+from datetime import date
+
+class TaskStatsRepositoryInterface(ABC):
+    @abstractmethod
+    def record(self, user_id: int, total: int = 0, completed: int = 0, created: int = 0, day: date = None):
+        pass
+
+    @abstractmethod
+    def get_stats(self, user_id: int, since: date):
+        pass
\ No newline at end of file
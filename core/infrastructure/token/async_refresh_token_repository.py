@@ -0,0 +1,22 @@
+from sqlalchemy.exc import SQLAlchemyError
+
+from ...domain.refresh_token import RefreshToken
+from .async_refresh_token_repository_interface import AsyncRefreshTokenRepositoryInterface
+
+from ...exceptions.database_error import DatabaseError
+
+
+class AsyncRefreshTokenRepository(AsyncRefreshTokenRepositoryInterface):
+    # Used by the ASGI login; rotation and revocation stay on the sync
+    # RefreshTokenRepository (/auth/refresh and /auth/logout).
+
+    def __init__(self, database):
+        self.database = database
+
+    async def create_token(self, jti, family_id, user_id, expires_at):
+        try:
+            async with self.database.session() as session, session.begin():
+                session.add(RefreshToken(jti, family_id, user_id, expires_at))
+
+        except SQLAlchemyError as e:
+            raise DatabaseError("Error storing refresh token") from e
\ No newline at end of file
@@ -0,0 +1,7 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+class AsyncRefreshTokenRepositoryInterface(ABC):
+    @abstractmethod
+    async def create_token(self, jti: str, family_id: str, user_id: int, expires_at: datetime):
+        pass
\ No newline at end of file
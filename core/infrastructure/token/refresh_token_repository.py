@@ -0,0 +1,77 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from ...domain.refresh_token import RefreshToken
+from ...config.extension import db
+from .refresh_token_repository_interface import RefreshTokenRepositoryInterface
+
+from ...exceptions.database_error import DatabaseError
+
+
+def _utcnow():
+    # Stored as naive UTC to match the DateTime columns.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class RefreshTokenRepository(RefreshTokenRepositoryInterface):
+
+    def create_token(self, jti, family_id, user_id, expires_at):
+        try:
+            db.session.add(RefreshToken(jti, family_id, user_id, expires_at))
+            db.session.commit()
+
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise DatabaseError("Error storing refresh token") from e
+
+
+    def rotate_token(self, jti, new_jti, expires_at):
+        # Marking the presented token as used is a single conditional UPDATE,
+        # so of two concurrent refreshes with the same token only one can win.
+        # The successor is inserted in the same transaction.
+        try:
+            now = _utcnow()
+            result = db.session.execute(
+                update(RefreshToken)
+                .where(
+                    RefreshToken.jti == jti,
+                    RefreshToken.used_at.is_(None),
+                    RefreshToken.revoked.is_(False),
+                    RefreshToken.expires_at > now,
+                )
+                .values(used_at=now),
+                execution_options={"synchronize_session": False},
+            )
+
+            if result.rowcount != 1:
+                db.session.rollback()
+                return False
+
+            family_id, user_id = db.session.execute(
+                select(RefreshToken.family_id, RefreshToken.user_id).where(RefreshToken.jti == jti)
+            ).one()
+            db.session.add(RefreshToken(new_jti, family_id, user_id, expires_at))
+            db.session.commit()
+            return True
+
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise DatabaseError("Error rotating refresh token") from e
+
+
+    def revoke_family(self, family_id):
+        try:
+            result = db.session.execute(
+                update(RefreshToken)
+                .where(RefreshToken.family_id == family_id, RefreshToken.revoked.is_(False))
+                .values(revoked=True),
+                execution_options={"synchronize_session": False},
+            )
+            db.session.commit()
+            return result.rowcount
+
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise DatabaseError("Error revoking refresh tokens") from e
\ No newline at end of file
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+class RefreshTokenRepositoryInterface(ABC):
+    @abstractmethod
+    def create_token(self, jti: str, family_id: str, user_id: int, expires_at: datetime):
+        pass
+
+    @abstractmethod
+    def rotate_token(self, jti: str, new_jti: str, expires_at: datetime):
+        pass
+
+    @abstractmethod
+    def revoke_family(self, family_id: str):
+        pass
\ No newline at end of file
@@ -0,0 +1,71 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from ...domain.revoked_token import RevokedToken
+from ...config.extension import db
+from .token_blocklist_repository_interface import TokenBlocklistRepositoryInterface
+
+from ...exceptions.database_error import DatabaseError
+
+
+def _utcnow():
+    # Stored as naive UTC to match the DateTime columns.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class TokenBlocklistRepository(TokenBlocklistRepositoryInterface):
+    # Lookups run on their own connection rather than db.session: they happen
+    # while the JWT is verified, before the view opens its own transaction.
+
+    def add_token(self, jti, expires_at):
+        try:
+            db.session.add(RevokedToken(jti, expires_at))
+            db.session.commit()
+
+        except IntegrityError:
+            # Already revoked.
+            db.session.rollback()
+
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise DatabaseError("Error revoking token") from e
+
+
+    def is_revoked(self, jti):
+        try:
+            with db.engine.connect() as connection:
+                row = connection.execute(
+                    select(RevokedToken.id).where(RevokedToken.jti == jti)
+                ).first()
+            return row is not None
+
+        except SQLAlchemyError as e:
+            raise DatabaseError("Error checking token blocklist") from e
+
+
+    def list_revoked_since(self, last_id=0):
+        try:
+            with db.engine.connect() as connection:
+                rows = connection.execute(
+                    select(RevokedToken.id, RevokedToken.jti)
+                    .where(RevokedToken.id > last_id, RevokedToken.expires_at > _utcnow())
+                    .order_by(RevokedToken.id)
+                ).all()
+            return [tuple(row) for row in rows]
+
+        except SQLAlchemyError as e:
+            raise DatabaseError("Error loading token blocklist") from e
+
+
+    def delete_expired(self):
+        try:
+            with db.engine.begin() as connection:
+                result = connection.execute(
+                    delete(RevokedToken).where(RevokedToken.expires_at <= _utcnow())
+                )
+            return result.rowcount
+
+        except SQLAlchemyError as e:
+            raise DatabaseError("Error pruning token blocklist") from e
\ No newline at end of file
@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+class TokenBlocklistRepositoryInterface(ABC):
+    @abstractmethod
+    def add_token(self, jti: str, expires_at: datetime):
+        pass
+
+    @abstractmethod
+    def is_revoked(self, jti: str):
+        pass
+
+    @abstractmethod
+    def list_revoked_since(self, last_id: int = 0):
+        pass
+
+    @abstractmethod
+    def delete_expired(self):
+        pass
\ No newline at end of file
@@ -0,0 +1,75 @@
+from sqlalchemy import select, update
+
+from ...domain.user import User
+from .async_user_repository_interface import AsyncUserRepositoryInterface
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from ...exceptions.database_error import DatabaseError
+from ...exceptions.duplicate_error import DuplicateError
+from ...exceptions.not_found_error import NotFoundError
+
+
+class AsyncUserRepository(AsyncUserRepositoryInterface):
+    # asyncio version of UserRepository for the ASGI app; raises the same
+    # application errors.
+
+    def __init__(self, database):
+        self.database = database
+
+    async def get_user_by_id(self, user_id):
+        try:
+            user = await self._first(select(User).where(User.id == user_id))
+
+            if not user:
+                raise NotFoundError("User not found")
+
+            return user
+
+        except SQLAlchemyError as e:
+            raise DatabaseError("Error retrieving user") from e
+
+
+    async def login_user(self, username):
+        try:
+            user = await self._first(select(User).where(User.username == username))
+
+            if not user:
+                raise NotFoundError("User not found")
+
+            return user
+
+        except SQLAlchemyError as e:
+            raise DatabaseError("Login database error") from e
+
+
+    async def register_user(self, username, password_hash, email):
+        try:
+            user = User(username=username, password_hash=password_hash, email=email)
+
+            async with self.database.session() as session, session.begin():
+                session.add(user)
+
+            return user
+
+        except IntegrityError as e:
+            raise DuplicateError("Username or email already exists") from e
+
+        except SQLAlchemyError as e:
+            raise DatabaseError("Database error during registration") from e
+
+
+    async def update_password_hash(self, user_id, password_hash):
+        try:
+            async with self.database.session() as session, session.begin():
+                await session.execute(update(User).where(User.id == user_id).values(password_hash=password_hash))
+
+        except SQLAlchemyError as e:
+            raise DatabaseError("Error updating password hash") from e
+
+
+    async def _first(self, statement):
+        # The session (and its transaction) is closed on exit; rolling back
+        # after an error is implicit. Only plain reads use it, so a read
+        # replica may serve them (see ReplicaPool).
+        async with self.database.session() as session:
+            return (await session.execute(statement.execution_options(replica=True).limit(1))).scalars().first()
\ No newline at end of file
@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+
+class AsyncUserRepositoryInterface(ABC):
+    @abstractmethod
+    async def get_user_by_id(self, user_id: int):
+        pass
+    
+    @abstractmethod
+    async def login_user(self, username: str):
+        pass
+
+    @abstractmethod
+    async def register_user(self, username: str, password: str, email: str):
+        pass
+
+    @abstractmethod
+    async def update_password_hash(self, user_id: int, password_hash: str):
+        pass
\ No newline at end of file
@@ -12,7 +12,7 @@ class UserRepository(UserRepositoryInterface):
 
     def get_user_by_id(self, user_id):
         try:
-            user = db.session.query(User).filter_by(id=user_id).first()
+            user = db.session.query(User).execution_options(replica=True).filter_by(id=user_id).first()
 
             if not user:
                 raise NotFoundError("User not found")
@@ -26,7 +26,7 @@ class UserRepository(UserRepositoryInterface):
 
     def login_user(self, username):
         try:
-            user = db.session.query(User).filter_by(username=username).first()
+            user = db.session.query(User).execution_options(replica=True).filter_by(username=username).first()
 
             if not user:
                 raise NotFoundError("User not found")
@@ -57,4 +57,14 @@ class UserRepository(UserRepositoryInterface):
 
         except Exception as e:
             db.session.rollback()
-            raise DatabaseError("Unexpected error during registration") from e
\ No newline at end of file
+            raise DatabaseError("Unexpected error during registration") from e
+
+
+    def update_password_hash(self, user_id, password_hash):
+        try:
+            db.session.query(User).filter_by(id=user_id).update({"password_hash": password_hash})
+            db.session.commit()
+
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise DatabaseError("Error updating password hash") from e
\ No newline at end of file
@@ -11,4 +11,8 @@ class UserRepositoryInterface(ABC):
 
     @abstractmethod
     def register_user(self, username: str, password: str, email: str):
+        pass
+
+    @abstractmethod
+    def update_password_hash(self, user_id: int, password_hash: str):
         pass
\ No newline at end of file
@@ -0,0 +1,134 @@
+import os
+
+from flask import current_app
+from flask_restx import Namespace, Resource, fields
+from flask_jwt_extended import jwt_required, get_jwt_identity
+
+from ..config.extension import namespace_limit, pool_metrics, admission
+from ..infrastructure.task.cached_task_repository import CachedTaskRepository
+
+admin_ns = Namespace(
+    'Admin',
+    description='Operational data for administrators (ADMIN_USERNAMES)',
+    decorators=[namespace_limit('admin')]
+)
+
+# Response models
+wait_bucket_model = admin_ns.model('WaitBucket', {
+    'le': fields.String(description='Upper bound in ms, "+Inf" for the last bucket', example='5'),
+    'count': fields.Integer(description='Checkouts that waited at most this long (cumulative)', example=118)
+})
+
+checkout_wait_model = admin_ns.model('CheckoutWait', {
+    'count': fields.Integer(description='Timed checkouts', example=120),
+    'sum': fields.Float(description='Total wait in ms', example=84.2),
+    'max': fields.Float(description='Longest wait in ms', example=31.5),
+    'buckets': fields.List(fields.Nested(wait_bucket_model), description='Wait histogram')
+})
+
+pool_stats_model = admin_ns.model('PoolStats', {
+    'engine': fields.String(description='Engine: primary, replica_<n>, async, async_replica_<n>', example='primary'),
+    'pool': fields.String(description='Pool class', example='TimedQueuePool'),
+    'size': fields.Integer(description='Configured pool size', example=5),
+    'max_overflow': fields.Integer(description='Configured connections allowed beyond the pool size', example=2),
+    'checked_out': fields.Integer(description='Connections in use now', example=1),
+    'overflow': fields.Integer(description='Overflow connections open now', example=0),
+    'peak_checked_out': fields.Integer(description='Most connections in use at once', example=6),
+    'peak_overflow': fields.Integer(description='Most overflow connections open at once', example=1),
+    'checkouts': fields.Integer(description='Connections handed out', example=120),
+    'connects': fields.Integer(description='Database connections opened', example=6),
+    'invalidations': fields.Integer(description='Connections discarded after an error', example=0),
+    'timeouts': fields.Integer(description='Checkouts that gave up after DATABASE_POOL_TIMEOUT', example=0),
+    'wait_ms': fields.Nested(checkout_wait_model, description='Time to get a connection from the pool')
+})
+
+pools_response_model = admin_ns.model('PoolsResponse', {
+    'pid': fields.Integer(description='Worker process the numbers belong to', example=4242),
+    'engines': fields.List(fields.Nested(pool_stats_model))
+})
+
+admission_limit_model = admin_ns.model('AdmissionLimit', {
+    'scope': fields.String(description='Namespace', example='tasks'),
+    'limit': fields.Integer(description='Current concurrency limit', example=18),
+    'in_flight': fields.Integer(description='Requests running now', example=3),
+    'admitted': fields.Integer(description='Requests admitted', example=5120),
+    'rejected': fields.Integer(description='Requests answered with 503', example=12)
+})
+
+admission_response_model = admin_ns.model('AdmissionResponse', {
+    'pid': fields.Integer(description='Worker process the numbers belong to', example=4242),
+    'scopes': fields.List(fields.Nested(admission_limit_model), description='Empty when admission control is disabled')
+})
+
+cache_response_model = admin_ns.model('CacheResponse', {
+    'pid': fields.Integer(description='Worker process the numbers belong to', example=4242),
+    'enabled': fields.Boolean(description='Whether TASK_CACHE_ENABLED is on', example=True),
+    'hits': fields.Integer(description='Task reads served from the cache', example=9120),
+    'misses': fields.Integer(description='Task reads that went to the database', example=880),
+    'evictions': fields.Integer(description='Entries dropped to stay within max_entries', example=0),
+    'size': fields.Integer(description='Entries cached now', example=870),
+    'max_entries': fields.Integer(description='TASK_CACHE_MAX_ENTRIES', example=10000)
+})
+
+def _require_admin():
+    if get_jwt_identity() not in current_app.config['ADMIN_USERNAMES']:
+        admin_ns.abort(403, message="Administrator access required")
+
+@admin_ns.route('/pools')
+@admin_ns.doc(security='Bearer Auth')
+class Pools(Resource):
+    @jwt_required()
+    @admin_ns.doc(
+        description='Get database connection pool statistics of the worker process serving the request. '
+                    'Every worker has its own pools; counters start when the worker starts.',
+        responses={
+            200: ('Success', pools_response_model),
+            401: 'Unauthorized - Invalid or missing token',
+            403: 'Forbidden - Not an administrator',
+        }
+    )
+    @admin_ns.marshal_with(pools_response_model)
+    def get(self):
+        """Get connection pool statistics"""
+        _require_admin()
+        return pool_metrics.snapshot(current_app)
+
+@admin_ns.route('/admission')
+@admin_ns.doc(security='Bearer Auth')
+class Admission(Resource):
+    @jwt_required()
+    @admin_ns.doc(
+        description='Get the adaptive concurrency limits of the worker process serving the request',
+        responses={
+            200: ('Success', admission_response_model),
+            401: 'Unauthorized - Invalid or missing token',
+            403: 'Forbidden - Not an administrator',
+        }
+    )
+    @admin_ns.marshal_with(admission_response_model)
+    def get(self):
+        """Get admission control limits"""
+        _require_admin()
+        return admission.snapshot(current_app)
+
+@admin_ns.route('/cache')
+@admin_ns.doc(security='Bearer Auth')
+class Cache(Resource):
+    @jwt_required()
+    @admin_ns.doc(
+        description='Get the task read cache counters of the worker process serving the request. '
+                    'Every worker has its own cache; counters start when the worker starts.',
+        responses={
+            200: ('Success', cache_response_model),
+            401: 'Unauthorized - Invalid or missing token',
+            403: 'Forbidden - Not an administrator',
+        }
+    )
+    @admin_ns.marshal_with(cache_response_model)
+    def get(self):
+        """Get task cache statistics"""
+        _require_admin()
+        repository = current_app.task_service.task_repository
+        if not isinstance(repository, CachedTaskRepository):
+            return {'pid': os.getpid(), 'enabled': False}
+        return {'pid': os.getpid(), 'enabled': True, **repository.stats()}
\ No newline at end of file
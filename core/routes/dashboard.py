@@ -1,14 +1,34 @@
+from flask import current_app
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 
-dashboard_ns = Namespace('Dashboard', description='Dashboard and system information')
+from ..config.extension import namespace_limit
+
+dashboard_ns = Namespace(
+    'Dashboard',
+    description='Dashboard and system information',
+    decorators=[namespace_limit('dashboard')]
+)
 
 # Response models
+daily_count_model = dashboard_ns.model('DailyCount', {
+    'date': fields.String(description='UTC date', example='2026-10-17'),
+    'count': fields.Integer(description='Tasks created that day', example=4)
+})
+
+task_stats_model = dashboard_ns.model('TaskStats', {
+    'total': fields.Integer(description='Number of tasks', example=12),
+    'completed': fields.Integer(description='Number of completed tasks', example=5),
+    'open': fields.Integer(description='Number of open tasks', example=7),
+    'created_per_day': fields.List(fields.Nested(daily_count_model), description='Tasks created per day, oldest first')
+})
+
 dashboard_response_model = dashboard_ns.model('DashboardResponse', {
     'message': fields.String(description='Welcome message', example='Welcome to the Task Management System!'),
     'user': fields.String(description='Current authenticated user', example='john_doe'),
     'version': fields.String(description='API version', example='1.0.0'),
-    'endpoints': fields.Raw(description='Available API endpoints')
+    'endpoints': fields.Raw(description='Available API endpoints'),
+    'stats': fields.Nested(task_stats_model, description='Task counts of the current user')
 })
 
 @dashboard_ns.route('')
@@ -16,7 +36,7 @@ dashboard_response_model = dashboard_ns.model('DashboardResponse', {
 class Dashboard(Resource):
     @jwt_required()
     @dashboard_ns.doc(
-        description='Get dashboard information and API overview',
+        description='Get dashboard information, API overview and task statistics of the current user',
         responses={
             200: ('Success', dashboard_response_model),
             401: 'Unauthorized - Invalid or missing token',
@@ -27,6 +47,13 @@ class Dashboard(Resource):
     def get(self):
         """Get dashboard information"""
         current_user = get_jwt_identity()
+        user_id = get_jwt().get('uid')
+        if user_id is None:
+            dashboard_ns.abort(401, message="Token does not identify a user. Please login again.")
+
+        # Counters are maintained on every task write, so this is a primary
+        # key lookup plus a few rows, not a COUNT over the tasks table.
+        stats = current_app.task_service.get_task_stats(user_id, current_app.config['DASHBOARD_STATS_DAYS'])
         return {
             "message": "Welcome to the Task Management System!",
             "user": current_user,
@@ -36,5 +63,6 @@ class Dashboard(Resource):
                 "tasks": "/api/v1/tasks",
                 "dashboard": "/api/v1/dashboard",
                 "documentation": "/api/v1/docs"
-            }
+            },
+            "stats": stats
         }
\ No newline at end of file
@@ -0,0 +1,114 @@
+from flask import request, current_app
+from flask_jwt_extended import verify_jwt_in_request
+from flask_limiter.util import get_remote_address
+
+from ..config.serialization import model_renderer
+from ..exceptions.validation_error import ValidationError
+from .task import (
+    task_ns, task_model, task_list_model, task_create_model, task_update_model,
+    TaskList, TaskDetail, TaskCreate, TaskUpdate, TaskDelete,
+    _current_user_id, _list_page_args, _new_task_fields,
+)
+from .auth import (
+    auth_ns, login_model, register_model, token_response_model, success_message_model,
+    AuthLogin, AuthRegister,
+    _login_credentials, _registration, _login_response, _register_response,
+)
+
+# asyncio versions of the busiest resource methods, served by the ASGI app
+# (asgi.py) with the async services. Each one replaces the body of the
+# resource method it is registered for in NATIVE_ROUTES and runs the same
+# checks in the same order: namespace rate limit, payload validation, JWT,
+# then the resource logic. Routing, request hooks, error handlers and the
+# response representation stay the Flask app's.
+
+def _namespace_guard(namespace):
+    # Namespace decorators (the shared rate limit) wrap the Flask view, which
+    # native handlers bypass; apply them to a no-op that each handler calls.
+    def guard():
+        pass
+    guard.__name__ = guard.__qualname__ = f"native_{namespace.name}_guard"
+    for decorator in namespace.decorators:
+        guard = decorator(guard)
+    return guard
+
+def _validate(model):
+    # Same check as @namespace.expect(model, validate=True).
+    model.validate(request.get_json())
+
+_task_guard = _namespace_guard(task_ns)
+_auth_guard = _namespace_guard(auth_ns)
+_render_task = model_renderer(task_ns, task_model)
+_render_task_list = model_renderer(task_ns, task_list_model)
+_render_tokens = model_renderer(auth_ns, token_response_model)
+_render_message = model_renderer(auth_ns, success_message_model)
+
+async def list_tasks():
+    _task_guard()
+    verify_jwt_in_request()
+    limit, after, filters, sort = _list_page_args()
+
+    try:
+        tasks, next_cursor = await current_app.async_task_service.list_task_page(_current_user_id(), limit, after, filters, sort)
+    except ValidationError as e:
+        task_ns.abort(400, message=e.message)
+
+    return _render_task_list({"tasks": tasks, "next_cursor": next_cursor})
+
+async def get_task(task_id):
+    _task_guard()
+    verify_jwt_in_request()
+    task = await current_app.async_task_service.get_one_task(_current_user_id(), task_id)
+    if not task:
+        task_ns.abort(404, message=f"Task {task_id} not found")
+    return _render_task(task)
+
+async def create_task():
+    _task_guard()
+    _validate(task_create_model)
+    verify_jwt_in_request()
+    title, description = _new_task_fields()
+    task = await current_app.async_task_service.create_task(_current_user_id(), title, description)
+    return _render_task(task), 201
+
+async def update_task(task_id):
+    _task_guard()
+    _validate(task_update_model)
+    verify_jwt_in_request()
+    task = await current_app.async_task_service.patch_task(_current_user_id(), task_id, request.get_json())
+    if not task:
+        task_ns.abort(404, message=f"Task {task_id} not found")
+    return _render_task(task), 200
+
+async def delete_task(task_id):
+    _task_guard()
+    verify_jwt_in_request()
+    if not await current_app.async_task_service.delete_task_by_id(_current_user_id(), task_id):
+        task_ns.abort(404, message=f"Task {task_id} not found")
+    return '', 204
+
+async def login():
+    _auth_guard()
+    _validate(login_model)
+    username, password = _login_credentials()
+    result = await current_app.async_user_service.login_user(username, password, get_remote_address())
+    data, status = _login_response(result)
+    return _render_tokens(data), status
+
+async def register():
+    _auth_guard()
+    _validate(register_model)
+    username, password, email = _registration()
+    result = await current_app.async_user_service.register_user(username, password, email)
+    data, status = _register_response(result)
+    return _render_message(data), status
+
+NATIVE_ROUTES = {
+    (TaskList, 'GET'): list_tasks,
+    (TaskDetail, 'GET'): get_task,
+    (TaskCreate, 'POST'): create_task,
+    (TaskUpdate, 'PUT'): update_task,
+    (TaskDelete, 'DELETE'): delete_task,
+    (AuthLogin, 'POST'): login,
+    (AuthRegister, 'POST'): register,
+}
@@ -1,8 +1,20 @@
-from flask import request, current_app
-from flask_restx import Resource, Namespace, fields
-from flask_jwt_extended import jwt_required
+import json
 
-task_ns = Namespace('Tasks', description='Task management operations - Create, Read, Update, Delete tasks')
+from flask import request, current_app, Response, stream_with_context
+from flask_restx import Resource, Namespace, fields, inputs
+from flask_jwt_extended import jwt_required, get_jwt
+
+from ..config.extension import namespace_limit
+from ..config.rate_limit import rate_cost
+from ..config.serialization import marshal_compiled
+from ..exceptions.validation_error import ValidationError
+from ..application.task.task_service import LIST_SORTS
+
+task_ns = Namespace(
+    'Tasks',
+    description='Task management operations - Create, Read, Update, Delete tasks',
+    decorators=[namespace_limit('tasks')]
+)
 
 # Response models
 task_model = task_ns.model('Task', {
@@ -17,6 +29,39 @@ task_create_model = task_ns.model('TaskCreate', {
     'description': fields.String(description='The task description', example='Write comprehensive API documentation with examples')
 })
 
+task_bulk_create_model = task_ns.model('TaskBulkCreate', {
+    'tasks': fields.List(fields.Nested(task_create_model), required=True, description='Tasks to create; each one is validated independently')
+})
+
+task_bulk_error_model = task_ns.model('TaskBulkError', {
+    'index': fields.Integer(description='Position of the rejected task in the request', example=3),
+    'message': fields.String(description='Why the task was rejected', example='Title is required and cannot be empty')
+})
+
+task_bulk_create_result_model = task_ns.model('TaskBulkCreateResult', {
+    'created': fields.List(fields.Integer, description='Identifiers of the created tasks, in request order', example=[1, 2, 3]),
+    'errors': fields.List(fields.Nested(task_bulk_error_model), description='Tasks that were rejected')
+})
+
+task_bulk_filter_model = task_ns.model('TaskBulkFilter', {
+    'is_completed': fields.Boolean(description='Select tasks by completion status', example=True)
+})
+
+task_bulk_update_model = task_ns.model('TaskBulkUpdate', {
+    'ids': fields.List(fields.Integer, description='Identifiers of the tasks to update', example=[1, 2, 3]),
+    'filter': fields.Nested(task_bulk_filter_model, description='Select tasks by attribute instead of (or in addition to) ids'),
+    'is_completed': fields.Boolean(required=True, description='Completion status to set', example=True)
+})
+
+task_bulk_delete_model = task_ns.model('TaskBulkDelete', {
+    'ids': fields.List(fields.Integer, description='Identifiers of the tasks to delete', example=[1, 2, 3]),
+    'filter': fields.Nested(task_bulk_filter_model, description='Select tasks by attribute instead of (or in addition to) ids')
+})
+
+task_bulk_result_model = task_ns.model('TaskBulkResult', {
+    'affected': fields.Integer(description='Number of tasks affected', example=3)
+})
+
 task_update_model = task_ns.model('TaskUpdate', {
     'title': fields.String(description='The task title', min_length=1, max_length=200, example='Updated task title'),
     'description': fields.String(description='The task description', example='Updated task description'),
@@ -24,9 +69,32 @@ task_update_model = task_ns.model('TaskUpdate', {
 })
 
 task_list_model = task_ns.model('TaskList', {
-    'tasks': fields.List(fields.Nested(task_model), description='List of tasks')
+    'tasks': fields.List(fields.Nested(task_model), description='List of tasks'),
+    'next_cursor': fields.String(description='Opaque cursor for the next page, null on the last page', example='NTA')
+})
+
+# Query parameters
+task_list_parser = task_ns.parser()
+task_list_parser.add_argument('limit', type=int, location='args', help='Maximum number of tasks to return')
+task_list_parser.add_argument('after', type=str, location='args', help='Cursor returned as next_cursor by the previous page')
+task_list_parser.add_argument('is_completed', type=inputs.boolean, location='args', help='Only return completed (true) or open (false) tasks')
+task_list_parser.add_argument('title', type=str, location='args', help='Only return tasks whose title starts with this prefix')
+task_list_parser.add_argument('min_id', type=int, location='args', help='Only return tasks with an id greater than or equal to this')
+task_list_parser.add_argument('max_id', type=int, location='args', help='Only return tasks with an id less than or equal to this')
+task_list_parser.add_argument(
+    'sort', type=str, location='args', default='id',
+    choices=[key for name in LIST_SORTS for key in (name, '-' + name)],
+    help='Sort key; prefix with - for descending order'
+)
+
+task_search_result_model = task_ns.model('TaskSearchResult', {
+    'tasks': fields.List(fields.Nested(task_model), description='Matching tasks, best match first')
 })
 
+task_search_parser = task_ns.parser()
+task_search_parser.add_argument('q', type=str, location='args', required=True, help='Words to search for in task titles and descriptions')
+task_search_parser.add_argument('limit', type=int, location='args', help='Maximum number of tasks to return')
+
 error_model = task_ns.model('Error', {
     'message': fields.String(description='Error message', example='Task not found')
 })
@@ -37,24 +105,127 @@ auth_error_model = task_ns.model('AuthError', {
     'hint': fields.String(description='Helpful hint', example='Make sure to include \'Bearer \' before your token')
 })
 
+def _current_user_id():
+    # Tasks are owned by the user id carried in the token's "uid" claim.
+    user_id = get_jwt().get('uid')
+    if user_id is None:
+        task_ns.abort(401, message="Token does not identify a user. Please login again.")
+    return user_id
+
+def _list_page_args():
+    # (limit, after, filters, sort) of a task list request.
+    args = task_list_parser.parse_args()
+    limit = args.get('limit')
+    if limit is None:
+        limit = current_app.config['TASK_PAGE_SIZE_DEFAULT']
+    if limit < 1:
+        task_ns.abort(400, message="Limit must be a positive integer")
+    limit = min(limit, current_app.config['TASK_PAGE_SIZE_MAX'])
+    filters = {
+        name: args.get(name)
+        for name in ('is_completed', 'title', 'min_id', 'max_id')
+        if args.get(name) is not None
+    }
+    return limit, args.get('after'), filters, args.get('sort')
+
+def _new_task_fields():
+    data = request.get_json()
+    title = data.get('title', '')
+    description = data.get('description', '')
+    
+    if not title or not title.strip():
+        task_ns.abort(400, message="Title is required and cannot be empty")
+    return title, description
+
+def _check_bulk_ids(task_ids):
+    max_ids = current_app.config['TASK_BULK_MAX_IDS']
+    if task_ids is not None and len(task_ids) > max_ids:
+        task_ns.abort(400, message=f"A bulk request can select at most {max_ids} ids")
+
 @task_ns.route('/')
 @task_ns.doc(security='Bearer Auth')
 class TaskList(Resource):
+    @rate_cost(5)
     @jwt_required()
     @task_ns.doc(
-        description='Retrieve all tasks for the authenticated user',
+        description='Retrieve tasks for the authenticated user, one page at a time, optionally filtered and sorted. Pass the returned `next_cursor` as `after` (with the same filters and sort) to fetch the next page.',
         responses={
             200: ('Success', task_list_model),
+            400: ('Bad Request - Invalid limit, filter, sort or cursor', error_model),
             401: ('Unauthorized - Invalid or missing token. Use format: Bearer <token>', auth_error_model),
             500: 'Internal Server Error'
         }
     )
-    @task_ns.marshal_with(task_list_model)
+    @task_ns.expect(task_list_parser)
+    @marshal_compiled(task_ns, task_list_model)
     def get(self):
-        """List all tasks"""
-        tasks = current_app.task_service.list_task()
+        """List tasks"""
+        limit, after, filters, sort = _list_page_args()
+
+        try:
+            tasks, next_cursor = current_app.task_service.list_task_page(_current_user_id(), limit, after, filters, sort)
+        except ValidationError as e:
+            task_ns.abort(400, message=e.message)
+
+        return {"tasks": tasks, "next_cursor": next_cursor}
+
+@task_ns.route('/search')
+@task_ns.doc(security='Bearer Auth')
+class TaskSearch(Resource):
+    @rate_cost(5)
+    @jwt_required()
+    @task_ns.doc(
+        description='Full-text search over the titles and descriptions of your tasks. Tasks matching more (and rarer) query words rank first; title matches weigh more.',
+        responses={
+            200: ('Success', task_search_result_model),
+            400: ('Bad Request - Missing query or invalid limit', error_model),
+            401: ('Unauthorized - Invalid or missing token. Use format: Bearer <token>', auth_error_model),
+            500: 'Internal Server Error'
+        }
+    )
+    @task_ns.expect(task_search_parser)
+    @task_ns.marshal_with(task_search_result_model)
+    def get(self):
+        """Search tasks"""
+        args = task_search_parser.parse_args()
+        limit = args.get('limit')
+        if limit is None:
+            limit = current_app.config['TASK_SEARCH_LIMIT_DEFAULT']
+        if limit < 1:
+            task_ns.abort(400, message="Limit must be a positive integer")
+        limit = min(limit, current_app.config['TASK_SEARCH_LIMIT_MAX'])
+
+        try:
+            tasks = current_app.task_service.search_tasks(_current_user_id(), args['q'], limit)
+        except ValidationError as e:
+            task_ns.abort(400, message=e.message)
+
         return {"tasks": [task.to_dict() for task in tasks]}
 
+@task_ns.route('/export')
+@task_ns.doc(security='Bearer Auth')
+class TaskExport(Resource):
+    @rate_cost(50)
+    @jwt_required()
+    @task_ns.doc(
+        description='Stream every task of the authenticated user as newline-delimited JSON (one task object per line)',
+        produces=['application/x-ndjson'],
+        responses={
+            200: ('Success - application/x-ndjson stream of tasks', task_model),
+            401: 'Unauthorized - Invalid or missing token',
+            500: 'Internal Server Error'
+        }
+    )
+    def get(self):
+        """Export all tasks as NDJSON"""
+        tasks = current_app.task_service.export_tasks(_current_user_id(), current_app.config['TASK_EXPORT_BATCH_SIZE'])
+
+        def generate():
+            for task in tasks:
+                yield json.dumps(task, separators=(',', ':')) + '\n'
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @task_ns.route('/<int:task_id>')
 @task_ns.doc(security='Bearer Auth', params={'task_id': 'The task identifier'})
 class TaskDetail(Resource):
@@ -68,13 +239,13 @@ class TaskDetail(Resource):
             500: 'Internal Server Error'
         }
     )
-    @task_ns.marshal_with(task_model)
+    @marshal_compiled(task_ns, task_model)
     def get(self, task_id):
         """Get task by ID"""
-        task = current_app.task_service.get_one_task(task_id)
+        task = current_app.task_service.get_one_task(_current_user_id(), task_id)
         if not task:
             task_ns.abort(404, message=f"Task {task_id} not found")
-        return task.to_dict()
+        return task
 
 @task_ns.route('/create')
 @task_ns.doc(security='Bearer Auth')
@@ -90,18 +261,104 @@ class TaskCreate(Resource):
         }
     )
     @task_ns.expect(task_create_model, validate=True)
-    @task_ns.marshal_with(task_model, code=201)
+    @marshal_compiled(task_ns, task_model, code=201)
     def post(self):
         """Create a new task"""
+        title, description = _new_task_fields()
+        task = current_app.task_service.create_task(_current_user_id(), title, description)
+        return task, 201
+
+@task_ns.route('/bulk')
+@task_ns.doc(security='Bearer Auth')
+class TaskBulkCreate(Resource):
+    @rate_cost(20)
+    @jwt_required()
+    @task_ns.doc(
+        description='Create many tasks in one request. Valid tasks are inserted in a single transaction; invalid ones are reported in `errors` without aborting the batch.',
+        responses={
+            201: ('Created', task_bulk_create_result_model),
+            400: ('Bad Request', error_model),
+            401: 'Unauthorized - Invalid or missing token',
+            500: 'Internal Server Error'
+        }
+    )
+    # Items are validated one by one in the service so that a single bad
+    # task is reported instead of rejecting the whole payload.
+    @task_ns.expect(task_bulk_create_model, validate=False)
+    @task_ns.marshal_with(task_bulk_create_result_model, code=201)
+    def post(self):
+        """Create tasks in bulk"""
+        data = request.get_json(silent=True)
+        # Not validated against the model, so the body may be any JSON value.
+        items = data.get('tasks') if isinstance(data, dict) else None
+
+        if not isinstance(items, list) or not items:
+            task_ns.abort(400, message="tasks must be a non-empty list")
+
+        max_items = current_app.config['TASK_BULK_MAX_ITEMS']
+        if len(items) > max_items:
+            task_ns.abort(400, message=f"A bulk request can create at most {max_items} tasks")
+
+        result = current_app.task_service.create_tasks(_current_user_id(), items)
+        return result, 201
+
+@task_ns.route('/bulk/update')
+@task_ns.doc(security='Bearer Auth')
+class TaskBulkUpdate(Resource):
+    @rate_cost(10)
+    @jwt_required()
+    @task_ns.doc(
+        description='Set the completion status of every selected task with a single statement',
+        responses={
+            200: ('Success', task_bulk_result_model),
+            400: ('Bad Request', error_model),
+            401: 'Unauthorized - Invalid or missing token',
+            500: 'Internal Server Error'
+        }
+    )
+    @task_ns.expect(task_bulk_update_model, validate=True)
+    @task_ns.marshal_with(task_bulk_result_model)
+    def put(self):
+        """Update tasks in bulk"""
         data = request.get_json()
-        title = data.get('title', '')
-        description = data.get('description', '')
-        
-        if not title or not title.strip():
-            task_ns.abort(400, message="Title is required and cannot be empty")
-        
-        task = current_app.task_service.create_task(title, description)
-        return task.to_dict(), 201
+        task_ids = data.get('ids')
+        _check_bulk_ids(task_ids)
+
+        try:
+            affected = current_app.task_service.update_tasks(_current_user_id(), data.get('is_completed'), task_ids, data.get('filter'))
+        except ValidationError as e:
+            task_ns.abort(400, message=e.message)
+
+        return {"affected": affected}, 200
+
+@task_ns.route('/bulk/delete')
+@task_ns.doc(security='Bearer Auth')
+class TaskBulkDelete(Resource):
+    @rate_cost(10)
+    @jwt_required()
+    @task_ns.doc(
+        description='Delete every selected task with a single statement',
+        responses={
+            200: ('Success', task_bulk_result_model),
+            400: ('Bad Request', error_model),
+            401: 'Unauthorized - Invalid or missing token',
+            500: 'Internal Server Error'
+        }
+    )
+    @task_ns.expect(task_bulk_delete_model, validate=True)
+    @task_ns.marshal_with(task_bulk_result_model)
+    def delete(self):
+        """Delete tasks in bulk"""
+        data = request.get_json()
+        task_ids = data.get('ids')
+        _check_bulk_ids(task_ids)
+
+        try:
+            affected = current_app.task_service.delete_tasks(_current_user_id(), task_ids, data.get('filter'))
+        except ValidationError as e:
+            task_ns.abort(400, message=e.message)
+
+        return {"affected": affected}, 200
 
 @task_ns.route('/<int:task_id>/update')
 @task_ns.doc(security='Bearer Auth', params={'task_id': 'The task identifier'})
@@ -118,23 +375,18 @@ class TaskUpdate(Resource):
         }
     )
     @task_ns.expect(task_update_model, validate=True)
-    @task_ns.marshal_with(task_model)
+    @marshal_compiled(task_ns, task_model)
     def put(self, task_id):
         """Update a task"""
-        task = current_app.task_service.get_one_task(task_id)
+        data = request.get_json()
+
+        # Only the fields present in the body are written; the update and the
+        # existence check happen in one statement.
+        task = current_app.task_service.patch_task(_current_user_id(), task_id, data)
         if not task:
             task_ns.abort(404, message=f"Task {task_id} not found")
         
-        data = request.get_json()
-        title = data.get('title')
-        description = data.get('description')
-        is_completed = data.get('is_completed')
-        
-        update = current_app.task_service.update_task(task_id, title, description, is_completed)
-        if not update:
-            task_ns.abort(400, message="Update failed")
-        
-        return update.to_dict(), 200
+        return task, 200
 
 @task_ns.route('/<int:task_id>/delete')
 @task_ns.doc(security='Bearer Auth', params={'task_id': 'The task identifier'})
@@ -151,9 +403,7 @@ class TaskDelete(Resource):
     )
     def delete(self, task_id):
         """Delete a task"""
-        task = current_app.task_service.get_one_task(task_id)
-        if not task:
+        if not current_app.task_service.delete_task_by_id(_current_user_id(), task_id):
             task_ns.abort(404, message=f"Task {task_id} not found")
         
-        current_app.task_service.delete_task(task)
         return '', 204
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""Add task owner
+
+Revision ID: 2d7a4e6f8b13
+Revises: 9c3e5a7b1f20
+Create Date: 2026-10-17 12:05:31.274610
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d7a4e6f8b13'
+down_revision = '9c3e5a7b1f20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing tasks have no owner; they stay in the table but are not
+    # returned to any user until user_id is assigned.
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('user_id', sa.Integer(), nullable=True))
+        batch_op.create_index('ix_tasks_user_id_id', ['user_id', 'id'], unique=False)
+        batch_op.create_foreign_key('fk_tasks_user_id_users', 'users', ['user_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_tasks_user_id_users', type_='foreignkey')
+        batch_op.drop_index('ix_tasks_user_id_id')
+        batch_op.drop_column('user_id')
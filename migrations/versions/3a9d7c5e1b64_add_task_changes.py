@@ -0,0 +1,31 @@
+"""Add task changes
+
+Revision ID: 3a9d7c5e1b64
+Revises: 8f4c2b6d0e91
+Create Date: 2026-10-17 18:40:27.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3a9d7c5e1b64'
+down_revision = '8f4c2b6d0e91'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_changes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_task_changes_created_at'), 'task_changes', ['created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_task_changes_created_at'), table_name='task_changes')
+    op.drop_table('task_changes')
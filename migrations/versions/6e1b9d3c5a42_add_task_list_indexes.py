@@ -0,0 +1,27 @@
+"""Add task list indexes
+
+Revision ID: 6e1b9d3c5a42
+Revises: 2d7a4e6f8b13
+Create Date: 2026-10-17 13:20:47.905126
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '6e1b9d3c5a42'
+down_revision = '2d7a4e6f8b13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.create_index('ix_tasks_user_id_is_completed_id', ['user_id', 'is_completed', 'id'], unique=False)
+        batch_op.create_index('ix_tasks_user_id_title_id', ['user_id', 'title', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('ix_tasks_user_id_title_id')
+        batch_op.drop_index('ix_tasks_user_id_is_completed_id')
@@ -0,0 +1,45 @@
+"""Add task stats
+
+Revision ID: 8f4c2b6d0e91
+Revises: 6e1b9d3c5a42
+Create Date: 2026-10-17 15:02:11.640338
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f4c2b6d0e91'
+down_revision = '6e1b9d3c5a42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_stats',
+    sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table('task_daily_stats',
+    sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('created', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+    # Seed the counters from the existing tasks. Creation dates were never
+    # recorded, so created-per-day starts empty.
+    op.execute(
+        "INSERT INTO task_stats (user_id, total, completed) "
+        "SELECT user_id, COUNT(*), SUM(CASE WHEN is_completed THEN 1 ELSE 0 END) "
+        "FROM tasks WHERE user_id IS NOT NULL GROUP BY user_id"
+    )
+
+
+def downgrade():
+    op.drop_table('task_daily_stats')
+    op.drop_table('task_stats')
@@ -0,0 +1,32 @@
+"""Add token blocklist
+
+Revision ID: 9c3e5a7b1f20
+Revises: 4b2f8c1d9e7a
+Create Date: 2026-10-17 11:40:02.563117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c3e5a7b1f20'
+down_revision = '4b2f8c1d9e7a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('token_blocklist',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('jti', sa.String(length=36), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('jti')
+    )
+    op.create_index(op.f('ix_token_blocklist_expires_at'), 'token_blocklist', ['expires_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_token_blocklist_expires_at'), table_name='token_blocklist')
+    op.drop_table('token_blocklist')